@@ -0,0 +1,2 @@
+# Course App
+# Shared helpers for the Streamlit pages in pages/
@@ -0,0 +1,32 @@
+# Image assets
+# The screenshots in images/ are loaded, resized and re-encoded as WebP once
+# per server process and kept with st.cache_resource, so every session and
+# rerun is served from memory instead of re-reading the PNGs.
+
+import io
+import os
+
+import streamlit as st
+from PIL import Image
+
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "images")
+# Wide enough for the page's main column on a laptop screen
+MAX_WIDTH = 1400
+WEBP_QUALITY = 85
+
+
+@st.cache_resource(show_spinner=False)
+def load_image(name, max_width=MAX_WIDTH, quality=WEBP_QUALITY):
+    """WebP bytes of `images/<name>`, scaled down to at most `max_width` pixels wide."""
+    with Image.open(os.path.join(IMAGE_DIR, name)) as image:
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        if image.width > max_width:
+            image = image.resize((max_width, round(image.height * max_width / image.width)), Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format="WEBP", quality=quality, method=6)
+    return buffer.getvalue()
+
+
+def show_image(name, caption=None):
+    """Draw a cached screenshot from images/ at its natural width (never wider than the column)."""
+    st.image(load_image(name), caption=caption)
@@ -0,0 +1,70 @@
+# Demo gallery
+# Read-only access to the artifacts `python -m synthetic_lab.gallery` writes to
+# gallery/. Every loader is kept with st.cache_data, so the tables are read
+# once per server process and the chapters show real results without
+# training anything for the visitor.
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+GALLERY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gallery")
+
+
+@st.cache_data(show_spinner=False)
+def load_manifest():
+    """The gallery's manifest.json, or None if the gallery hasn't been built."""
+    path = os.path.join(GALLERY_DIR, "manifest.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+@st.cache_data(show_spinner=False)
+def load_scores(dataset):
+    """Scores and timings of every model on `dataset`, one row per model."""
+    with open(os.path.join(GALLERY_DIR, dataset, "scores.json")) as f:
+        scores = json.load(f)
+    table = pd.DataFrame.from_dict(scores["models"], orient="index").rename_axis("Model").reset_index()
+    return scores, table
+
+
+@st.cache_data(show_spinner=False)
+def load_metrics(dataset):
+    """Every metric row of `dataset` (the layout of `synthetic_lab.ranking.METRIC_COLUMNS`)."""
+    return pd.read_parquet(os.path.join(GALLERY_DIR, dataset, "metrics.parquet"))
+
+
+@st.cache_data(show_spinner=False)
+def load_table(dataset, model=None):
+    """The real table of `dataset`, or the synthetic one `model` sampled."""
+    name = "real.parquet" if model is None else os.path.join("synthetic", f"{model}.parquet")
+    return pd.read_parquet(os.path.join(GALLERY_DIR, dataset, name))
+
+
+def column_shapes(metrics):
+    """Per-column Column Shapes scores, one row per column and one column per model."""
+    shapes = metrics[(metrics["source"] == "quality") & (metrics["property"] == "Column Shapes")]
+    return shapes.pivot_table(index="column", columns="model", values="score", observed=True)
+
+
+def distribution(dataset, column, models, bins=12):
+    """
+    Share of rows per bin (numeric columns) or category of `column` in the real
+    table and each model's synthetic table, one column per source.
+    """
+    real = load_table(dataset)[column]
+    sources = {"Real": real, **{model: load_table(dataset, model)[column] for model in models}}
+    if pd.api.types.is_numeric_dtype(real):
+        # Bins over the real range, labelled by their midpoints so charts keep them in order
+        edges = np.linspace(real.min(), real.max(), bins + 1)
+        midpoints = ((edges[:-1] + edges[1:]) / 2).round(3)
+        sources = {name: pd.cut(values.clip(real.min(), real.max()), edges, labels=midpoints,
+                                include_lowest=True).astype("float64")
+                   for name, values in sources.items()}
+    shares = pd.DataFrame({name: values.value_counts(normalize=True) for name, values in sources.items()})
+    return shares.fillna(0).sort_index()
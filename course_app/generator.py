@@ -0,0 +1,216 @@
+# In-app generator
+# Jobs submitted from the Generator page run on one worker pool shared by all
+# sessions (kept with st.cache_resource). Each worker imports SDV and torch
+# once when it starts and then runs job after job, so a visitor never waits
+# for a cold start of their own. The page only submits and polls: progress is
+# read from the job's JobStore, never by waiting on the job.
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import types
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow.parquet as pq
+import streamlit as st
+
+from synthetic_lab.jobstore import DB_NAME, JobStore
+
+JOB_ROOT = os.environ.get("SYNTHETIC_LAB_APP_DIR", os.path.join(tempfile.gettempdir(), "synthetic_lab_app"))
+WORKERS = int(os.environ.get("SYNTHETIC_LAB_APP_WORKERS", max(1, (os.cpu_count() or 1) // 2)))
+# Jobs waiting for a worker (across all sessions) before new ones are turned away
+MAX_QUEUED = 4 * WORKERS
+
+# Per-session limits
+MAX_ACTIVE_JOBS = 1
+MAX_ROWS = 20_000
+MAX_COLUMNS = 50
+MAX_UPLOAD_MB = 20
+MAX_EPOCHS = 10
+
+APP_MODELS = ("GaussianCopula", "CTGAN", "TVAE", "CopulaGAN")
+MODEL_STAGES = ("fit", "sample", "evaluate", "privacy", "plot")
+
+
+# ============================
+# WORKER POOL
+# ============================
+def _start_worker(torch_threads):
+    """Pool initializer: cap the threads and pay for the heavy imports once per worker."""
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(torch_threads)
+
+    import torch
+    torch.set_num_threads(torch_threads)
+
+    import sdv.single_table  # noqa: F401
+    import synthetic_lab.pipeline  # noqa: F401
+
+
+@contextmanager
+def _plain_main():
+    # Streamlit runs each page as the __main__ module, which new worker
+    # processes would import (and so run the page) on start-up. Only needed
+    # while workers are spawned, which `GeneratorPool._start` does up front.
+    page = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = page
+
+
+def _ready():
+    return os.getpid()
+
+
+class GeneratorPool:
+    """The shared worker pool plus a count of the jobs it hasn't finished."""
+
+    def __init__(self, workers=WORKERS):
+        self.workers = workers
+        self.futures = set()
+        # Every session's page thread submits and polls through the same pool
+        self._lock = threading.Lock()
+        self._start()
+
+    def _start(self):
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_start_worker,
+            initargs=(max(1, (os.cpu_count() or 1) // self.workers),),
+        )
+        # Start every worker now, so the first visitor doesn't pay for the imports. The
+        # executor spawns a worker per submit while none is idle, and none can be before
+        # its imports finish, so these submits start all of them; later submits only
+        # queue work and never spawn, so __main__ is swapped once per pool
+        with _plain_main():
+            for _ in range(self.workers):
+                self.executor.submit(_ready)
+
+    def backlog(self):
+        with self._lock:
+            self.futures = {future for future in self.futures if not future.done()}
+            return len(self.futures)
+
+    def submit(self, *args, **kwargs):
+        with self._lock:
+            try:
+                future = self.executor.submit(generate, *args, **kwargs)
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory) and took the pool with it
+                self._start()
+                future = self.executor.submit(generate, *args, **kwargs)
+            self.futures.add(future)
+        return future
+
+
+@st.cache_resource(show_spinner="Starting the generator workers...")
+def get_pool():
+    return GeneratorPool()
+
+
+# ============================
+# JOBS
+# ============================
+def generate(file_path, job_id, models, num_rows, epochs, target_col=None):
+    """
+    Worker side of a job: the headless pipeline with the models trained in
+    this (already warm) process. Returns the job summary.
+    """
+    from synthetic_lab.pipeline import run_job
+
+    return run_job(
+        file_path,
+        output_dir=JOB_ROOT,
+        job_id=job_id,
+        models=list(models),
+        target_col=target_col,
+        num_rows=num_rows,
+        max_epochs=epochs,
+        budget_seconds=10 * 60,
+        workbook=False,
+        inline=True,
+    )
+
+
+def save_upload(uploaded):
+    """Write an uploaded file under a new job id; returns (job_id, path)."""
+    job_id = str(uuid.uuid4())[:8]
+    upload_dir = os.path.join(JOB_ROOT, "uploads", job_id)
+    os.makedirs(upload_dir, exist_ok=True)
+    path = os.path.join(upload_dir, os.path.basename(uploaded.name))
+    with open(path, "wb") as f:
+        f.write(uploaded.getbuffer())
+    return job_id, path
+
+
+def peek(path):
+    """(row count, column names) of a CSV/Parquet/Excel file without loading all of it."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        parquet = pq.ParquetFile(path)
+        return parquet.metadata.num_rows, parquet.schema_arrow.names
+    if extension == ".csv":
+        columns = list(pd.read_csv(path, nrows=0).columns)
+        # Parse the first column rather than count line breaks: quoted values may span lines
+        return len(pd.read_csv(path, usecols=[0])), columns
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True)
+    sheet = workbook.worksheets[0]
+    columns = [cell.value for cell in next(sheet.iter_rows(max_row=1), ())]
+    rows = sheet.max_row
+    if rows is None:
+        # Read-only sheets only know their size from the file's dimension record,
+        # which some writers leave out: count the rows instead
+        rows = sum(1 for _ in sheet.iter_rows(values_only=True))
+    workbook.close()
+    return max(rows - 1, 0), columns
+
+
+def started(job_id):
+    """Whether a worker has picked the job up: `run_job` creates the job folder first thing."""
+    return os.path.isdir(os.path.join(JOB_ROOT, job_id))
+
+
+def progress(job_id, models, target_col=None):
+    """(share of model stages finished, {model: last finished stage}) read from the job's store."""
+    job_dir = os.path.join(JOB_ROOT, job_id)
+    if not os.path.exists(os.path.join(job_dir, DB_NAME)):
+        return 0.0, {}
+    stages = MODEL_STAGES + (("utility",) if target_col else ())
+    finished, latest = 0, {}
+    # Oldest first, so each model ends on its most recent stage
+    for model, stage, status, _ in JobStore(job_dir).stages():
+        if stage == "model":
+            latest[model] = "done" if status == "completed" else status
+        elif status == "completed":
+            finished += 1
+            latest[model] = stage
+    return min(1.0, finished / (len(stages) * len(models))), latest
+
+
+def clean_old_jobs(max_age_hours=24):
+    """Delete job folders, zips and uploads older than `max_age_hours`."""
+    if not os.path.isdir(JOB_ROOT):
+        return
+    cutoff = time.time() - max_age_hours * 3600
+    uploads = os.path.join(JOB_ROOT, "uploads")
+    paths = [os.path.join(JOB_ROOT, name) for name in os.listdir(JOB_ROOT) if name != "uploads"]
+    if os.path.isdir(uploads):
+        paths += [os.path.join(uploads, name) for name in os.listdir(uploads)]
+    for path in paths:
+        if os.path.getmtime(path) < cutoff:
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
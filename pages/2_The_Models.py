@@ -1,5 +1,11 @@
+import os
+
+import pandas as pd
 import streamlit as st
 
+from course_app.gallery import column_shapes, distribution, load_manifest, load_metrics, load_scores, load_table
+from synthetic_lab.benchmark import latest_results, load_results
+
 # Page Layout & Title
 st.set_page_config(page_title="Chapter 2: Models", layout="wide")
 st.title("Chapter 2: The Models ⚙️")
@@ -159,8 +165,39 @@ synthetic_data = synthesizer.sample(num_rows=1000)
 
 
 
+# Measured Speeds
+# The speed column comes from the newest benchmark run in benchmarks/results
+# (python -m synthetic_lab.benchmark), timed on the largest table benchmarked
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "results")
+SPEED_LABELS = {
+    "CTGAN": "⏳ Slow",
+    "TVAE": "⚖️ Medium",
+    "GaussianCopula": "⚡ Fast",
+    "CopulaGAN": "⚡ Fast",
+}
+
+
+# latest_results picks the newest file in the current format (by its recorded time, not its
+# name); its table is built once per server process and results file, not once per visitor
+@st.cache_data(show_spinner=False)
+def load_benchmark(newest):
+    return load_results(newest)
+
+
+newest = latest_results(BENCHMARK_DIR)
+benchmark, results = load_benchmark(newest) if newest else (None, None)
+if results is not None:
+    results["columns"] = results["numeric_columns"] + results["categorical_columns"]
+    largest = results.sort_values(["rows", "columns"]).iloc[-1]
+    reference = results[(results["rows"] == largest["rows"]) & (results["columns"] == largest["columns"])]
+    fit_seconds = reference.groupby("model")["fit_seconds"].median()
+    for model, seconds in fit_seconds.items():
+        relative = seconds / fit_seconds.min()
+        label = "⚡ Fast" if relative <= 2 else "⚖️ Medium" if relative <= 5 else "⏳ Slow"
+        SPEED_LABELS[model] = f"{label} ({seconds:,.0f}s)"
+
 # Synthesizer Comparison Table
-st.markdown("""
+st.markdown(f"""
 ---
 
 The Synthetic Data Vault (SDV) offers a range of synthesizers. Each mdoel is designed with own strengths, limitations, and ideal use cases.
@@ -169,12 +206,73 @@ The Synthetic Data Vault (SDV) offers a range of synthesizers. Each mdoel is des
 
 | Model              | Type of Data           | Strengths                                           | Limitations                    | Speed                   |
 |--------------------|------------------------|-----------------------------------------------------|--------------------------------|-------------------------|
-| **CTGAN**          | Numerical, Categorical | High quality on complex, imbalanced data            | Requires tuning                | ⏳ Slow                 |
-| **TVAE**           | Numerical, Categorical | Captures non-linear patterns well                   | Higher resource demand          | ⚖️ Medium              |
-| **GaussianCopula** | Mostly Numerical       | Fast, easy to use                                   | Struggles with complex/mixed data | ⚡ Fast             |
-| **CopulaGAN**      | Numerical, Categorical | Combines GANs with statistical copulas for balance  | Newer model, fewer benchmarks   | ⚡ Fast                 |
+| **CTGAN**          | Numerical, Categorical | High quality on complex, imbalanced data            | Requires tuning                | {SPEED_LABELS["CTGAN"]} |
+| **TVAE**           | Numerical, Categorical | Captures non-linear patterns well                   | Higher resource demand          | {SPEED_LABELS["TVAE"]} |
+| **GaussianCopula** | Mostly Numerical       | Fast, easy to use                                   | Struggles with complex/mixed data | {SPEED_LABELS["GaussianCopula"]} |
+| **CopulaGAN**      | Numerical, Categorical | Combines GANs with statistical copulas for balance  | Newer model, fewer benchmarks   | {SPEED_LABELS["CopulaGAN"]} |
+
+""")
+
+if results is not None:
+    environment, created = benchmark["environment"], benchmark["created"]
+    st.caption(
+        f"Speed = time to train on {int(largest['rows']):,} rows × {int(largest['columns'])} columns "
+        f"({benchmark['settings']['epochs']} epochs for the neural models), measured {created[:4]}-{created[4:6]}-{created[6:8]} "
+        f"with SDV {environment['packages']['sdv']} and torch {environment['packages']['torch']} on {environment['cpu_count']} CPU(s)."
+    )
+    with st.expander("📊 Measured speeds on every benchmark table"):
+        table = results.groupby(["model", "rows", "columns"], as_index=False)[
+            ["fit_seconds", "sample_seconds", "evaluate_seconds"]
+        ].median()
+        table.columns = ["Model", "Rows", "Columns", "Fit (s)", "Sample (s)", "Evaluate (s)"]
+        st.dataframe(table, hide_index=True)
+
+
+# Models in Action
+# Results from the demo gallery (python -m synthetic_lab.gallery): the four models
+# trained ahead of time on small public tables, so this section loads instantly
+manifest = load_manifest()
+if manifest is not None:
+    st.markdown("""
+---
+
+### See Them in Action 🔬
 
+Each model below was trained on the same small public dataset. Pick a dataset to compare their scores and how closely
+their synthetic rows follow the real ones.
 """)
+    dataset = st.selectbox("Sample dataset", list(manifest["datasets"]), format_func=str.capitalize)
+    scores, table = load_scores(dataset)
+    st.caption(f"{manifest['datasets'][dataset]} The neural models trained for {manifest['settings']['epochs']} epochs.")
+
+    table = table.rename(columns={
+        "diagnostic_score": "Accuracy (Diagnostic)",
+        "quality_score": "Quality",
+        "privacy_score": "Privacy (DCR)",
+        "utility_score": "Utility (ML efficacy)",
+        "fit_seconds": "Training (s)",
+    })
+    st.dataframe(
+        table[["Model", "Accuracy (Diagnostic)", "Quality", "Privacy (DCR)", "Utility (ML efficacy)", "Training (s)"]],
+        hide_index=True,
+        column_config={"Training (s)": st.column_config.NumberColumn(format="%.1f")},
+    )
+
+    shapes_col, compare_col = st.columns(2)
+    with shapes_col:
+        st.markdown("**How well each column was learned** (Column Shapes score)")
+        st.bar_chart(column_shapes(load_metrics(dataset)), stack=False, height=320)
+    with compare_col:
+        column = st.selectbox("Real vs. synthetic values of", list(load_table(dataset).columns))
+        shares = distribution(dataset, column, list(scores["models"]))
+        if pd.api.types.is_numeric_dtype(shares.index):
+            st.line_chart(shares, height=280)
+        else:
+            st.bar_chart(shares, stack=False, height=280)
+
+    with st.expander("Peek at the synthetic rows"):
+        model = st.radio("Model", list(scores["models"]), horizontal=True)
+        st.dataframe(load_table(dataset, model).head(20), hide_index=True)
 
 
 # Final Navigation Tip
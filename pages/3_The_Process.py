@@ -1,5 +1,9 @@
 import streamlit as st
 
+from course_app.assets import show_image
+from course_app.gallery import load_manifest, load_metrics
+from synthetic_lab.ranking import CRITERIA, ModelRanking, describe_recommendation
+
 st.set_page_config(page_title="Chapter 3: The Process", layout="wide")
 st.title("Chapter 3: The Process 🧭")
 
@@ -10,14 +14,16 @@ If you want to use our Lab but don’t want to touch code, you’re in the right
 Each tab below walks you through a key stage, with clear instructions and images for every step.
 """)
 
+# Only the open tab runs, so its screenshots are the only ones sent to the browser
 tab1, tab2, tab3, tab4 = st.tabs([
     "📂 Preparing",
     "🧠 Training",
     "⚙️ Generating",
     "📊 Evaluating"
-])
+], key="process_tab", on_change="rerun")
+
 
-with tab1:
+def preparing():
     st.header("📁 Section 1: Preparing")
 
     # Step 1
@@ -29,7 +35,7 @@ These handle all data processing and synthetic generation.
 *Why this matters:*  
 Without these, nothing else works!
 """)
-    st.image("path_to_image1.png", caption="Installing required tools")
+    show_image("Step1.png", caption="Installing required tools")
 
     # Step 2
     st.subheader("2. Import Libraries")
@@ -40,7 +46,7 @@ You don’t need to do anything! just watch for a “Success” message.
 *Why this matters:*  
 All buttons and features in the notebook rely on these libraries.
 """)
-    st.image("path_to_image2.png", caption="Libraries loaded and ready")
+    show_image("Step2.png", caption="Libraries loaded and ready")
 
     # Step 3
     st.subheader("3. Upload File")
@@ -52,7 +58,7 @@ Upload your dataset in `.csv` or `.xlsx` format using the Lab’s interface.
 *Why this matters:*  
 This is the real data that the Lab will use to learn patterns and relationships.
 """)
-    st.image("path_to_image3.png", caption="Upload your data file")
+    show_image("Step3c.png", caption="Upload your data file")
 
     # Optional: Manage Sensitive Columns
     st.subheader("Optional: Manage Sensitive Columns")
@@ -64,7 +70,7 @@ Before moving on, you’ll have the chance to **remove** or **scramble** private
 *Why this matters:*  
 Taking out sensitive info protects privacy—even before creating synthetic data.
 """)
-    st.image("path_to_image4.png", caption="Remove or scramble sensitive columns")
+    show_image("Step3d.png", caption="Remove or scramble sensitive columns")
 
     # Step 4
     st.subheader("4. Create Metadata")
@@ -75,12 +81,12 @@ You’ll see a visual summary to check for accuracy before moving ahead.
 *Why this matters:*  
 Accurate metadata means more realistic and reliable synthetic data.
 """)
-    st.image("path_to_image5.png", caption="Metadata summary preview")
+    show_image("Step4c.png", caption="Metadata summary preview")
 
     st.info("**Tip:** Only upload data you have permission to use. Remove or scramble anything private before moving on!")
 
 
-with tab2:
+def training():
     st.header("🧠 Section 2: Training")
 
     # Step 5
@@ -95,12 +101,12 @@ Each engine tries a different method, so you get a bunch of results to compare.
 *Why this matters:*  
 No single engine works best for all data. Training multiple models gives you options for the best synthetic output.
 """)
-    st.image("path_to_image6.png", caption="Training progress for multiple models")
+    show_image("Step 5.png", caption="Training progress for multiple models")
 
     st.warning("Training runs quickly for demos (10 epochs), but for final results, ask for a longer training time.")
 
 
-with tab3:
+def generating():
     st.header("⚙️ Section 3: Generating")
 
     # Step 6
@@ -112,7 +118,7 @@ Each engine creates its own synthetic table. This mimics your original data, but
 *Why this matters:*  
 This gives you new, privacy-safe datasets for analysis, sharing, or AI training.
 """)
-    st.image("path_to_image7.png", caption="Choose number of synthetic rows")
+    show_image("Step6a.png", caption="Choose number of synthetic rows")
 
     # Step 7
     st.subheader("7. Download Synthetic Datasets (Excel File)")
@@ -122,12 +128,32 @@ Download a single Excel file containing a tab for each synthetic dataset (one pe
 *Why this matters:*  
 You can open, share, or analyze these new datasets—each created by a different model.
 """)
-    st.image("path_to_image8.png", caption="Download your synthetic datasets")
+    show_image("Step7b.png", caption="Download your synthetic datasets")
 
     st.success("Each synthetic table is labeled by the model that created it. Compare them to find the best fit!")
 
 
-with tab4:
+def composite_example():
+    # Live version of the recommendation, on scores from the demo gallery
+    manifest = load_manifest()
+    if manifest is None:
+        return
+    with st.expander("Try it: weigh the criteria yourself"):
+        dataset = st.selectbox("Sample dataset", list(manifest["datasets"]), format_func=str.capitalize,
+                               key="process_dataset")
+        st.caption(manifest["datasets"][dataset])
+        columns = st.columns(len(CRITERIA))
+        weights = {criterion: column.slider(label, 0.0, 3.0, 1.0, 0.5, key=f"weight_{criterion}")
+                   for column, (criterion, label) in zip(columns, CRITERIA.items())}
+        if not any(weights.values()):
+            st.warning("Give at least one criterion some weight.")
+            return
+        ranking = ModelRanking(load_metrics(dataset)).rank(weights)
+        st.success(describe_recommendation(ranking))
+        st.dataframe(ranking, hide_index=True)
+
+
+def evaluating():
     st.header("📊 Section 4: Evaluating")
 
     # Step 8
@@ -141,7 +167,7 @@ The Lab checks each synthetic dataset for:
 *Why this matters:*  
 Not all synthetic data is created equal! These tests show which version is safest and most realistic.
 """)
-    st.image("path_to_image9.png", caption="Evaluation results for all models")
+    show_image("Step8.png", caption="Evaluation results for all models")
 
     # Step 9a: Dashboard Visualizations and Explanations
     st.subheader("9a. Generating Evaluation Dashboard")
@@ -152,7 +178,7 @@ Here’s what each one means and why it’s important:
 
     # 1️⃣ Accuracy Chart
     st.markdown("**1️⃣ Accuracy (Diagnostic Score) Bar Chart**")
-    st.image("path_to_accuracy_chart.png", caption="Accuracy comparison across models")
+    show_image("Step9a.png", caption="Accuracy comparison across models")
     st.info("""
 Shows how well each synthetic dataset preserves the structure and rules of your real data (like value ranges, missing values, unique IDs).  
 **Why it matters:**  
@@ -162,7 +188,7 @@ Low accuracy? That model might be missing important patterns.
 
     # 2️⃣ Utility Chart
     st.markdown("**2️⃣ Utility (Quality Score) Bar Chart**")
-    st.image("path_to_quality_chart.png", caption="Utility comparison across models")
+    show_image("Step9b.png", caption="Utility comparison across models")
     st.info("""
 Shows how well the synthetic data mimics the statistical distributions and relationships of the original data.  
 **Why it matters:**  
@@ -172,7 +198,6 @@ Low utility? The data may “look right” but can lead to misleading insights.
 
     # 3️⃣ Privacy Chart
     st.markdown("**3️⃣ Privacy (DCR Score) Bar Chart**")
-    st.image("path_to_privacy_chart.png", caption="Privacy risk scores for each model")
     st.info("""
 Shows the privacy risk for each synthetic dataset (lower is better).  
 **Why it matters:**  
@@ -181,7 +206,7 @@ A low privacy risk score means the synthetic data offers strong protection again
 
     # 4️⃣ Column Comparison Plot
     st.markdown("**4️⃣ Column Comparison Plot**")
-    st.image("path_to_column_comparison.png", caption="Distribution comparison for a selected column")
+    show_image("Step9c.png", caption="Distribution comparison for a selected column")
     st.info("""
 Lets you pick a column and compare its values in the real vs. synthetic datasets.  
 **Why it matters:**  
@@ -190,7 +215,7 @@ Helps you see if each model captures detailed patterns for individual features:
 
     # 5️⃣ Per-Column Similarity Chart
     st.markdown("**5️⃣ Per-Column Similarity Bar Chart**")
-    st.image("path_to_column_similarity.png", caption="Per-column quality scores for a selected model")
+    show_image("Step9d.png", caption="Per-column quality scores for a selected model")
     st.info("""
 Shows how well each individual column was reproduced in a selected synthetic dataset.  
 **Why it matters:**  
@@ -199,12 +224,13 @@ Helps diagnose which features were well-learned and which need improvement. This
 
     # 6️⃣ Composite Recommendation
     st.markdown("**6️⃣ Composite Recommendation & Overall Score**")
-    st.image("path_to_composite_score.png", caption="Best overall model highlighted")
+    show_image("Step9e.png", caption="Best overall model highlighted")
     st.info("""
 Summarizes the scores and recommends the best synthetic dataset overall, balancing accuracy, utility, and privacy.  
 **Why it matters:**  
 Gives you a clear, one-glance answer: Which synthetic data is safest and most useful for your needs.
 """)
+    composite_example()
 
     st.success("This dashboard makes it easy to understand and justify your synthetic data choices... even if you’re not a data scientist!")
 
@@ -217,8 +243,13 @@ Download a Word report for documentation, compliance, or sharing with your team.
 *Why this matters:*  
 You have a record of your process, comparisons, and proof of privacy protection.
 """)
-    st.image("path_to_image11.png", caption="Download the evaluation report")
+    show_image("Step10.png", caption="Download the evaluation report")
+
 
+for tab, section in ((tab1, preparing), (tab2, training), (tab3, generating), (tab4, evaluating)):
+    with tab:
+        if tab.open:
+            section()
 
 # Final Navigation Tip
 st.markdown("""
@@ -36,6 +36,8 @@ Please remember:
 
 **You can do this.** 💪 Just follow the step-by-step instructions in the notebook.
 
+Just want a quick try with a small table? The [**Generator**](/The_Generator) page runs the same pipeline right here in the app, with nothing to install.
+
 """)
 
 # Button to simulate launching the lab
@@ -0,0 +1,136 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from course_app.generator import (
+    APP_MODELS, JOB_ROOT, MAX_ACTIVE_JOBS, MAX_COLUMNS, MAX_EPOCHS, MAX_QUEUED, MAX_ROWS, MAX_UPLOAD_MB,
+    clean_old_jobs, get_pool, peek, progress, save_upload, started,
+)
+
+# Page setup
+st.set_page_config(page_title="The Generator", layout="wide")
+st.title("The Generator 🏭")
+
+st.markdown(f"""
+Try the Lab without leaving the course: upload a small table and the app trains the synthesizers for you.
+
+The generator runs on shared workers that already have SDV loaded, so there is nothing to install and no waiting for
+a notebook to start. To keep it fair for everyone in the class, each visitor can run **{MAX_ACTIVE_JOBS} job at a time**
+on up to **{MAX_ROWS:,} rows** and **{MAX_COLUMNS} columns**, with **{MAX_EPOCHS} training epochs**.
+For bigger datasets or longer training, use the [Colab notebook](/The_Lab).
+
+---
+""")
+
+pool = get_pool()
+jobs = st.session_state.setdefault("generator_jobs", {})
+active = [job_id for job_id, job in jobs.items() if not job["future"].done()]
+
+
+# ============================
+# NEW JOB
+# ============================
+st.subheader("1. Upload a dataset")
+uploaded = st.file_uploader("A .csv, .xlsx or .parquet file", type=["csv", "xlsx", "parquet"],
+                            max_upload_size=MAX_UPLOAD_MB)
+
+if uploaded is not None:
+    # Keep the same saved copy across reruns of this upload
+    if st.session_state.get("generator_upload", {}).get("file_id") != uploaded.file_id:
+        job_id, path = save_upload(uploaded)
+        rows, columns = peek(path)
+        st.session_state["generator_upload"] = {"file_id": uploaded.file_id, "job_id": job_id, "path": path,
+                                                "rows": rows, "columns": columns}
+    upload = st.session_state["generator_upload"]
+    st.caption(f"{upload['rows']:,} rows × {len(upload['columns'])} columns")
+
+    if upload["rows"] > MAX_ROWS or len(upload["columns"]) > MAX_COLUMNS:
+        st.error(f"The in-app generator takes up to {MAX_ROWS:,} rows and {MAX_COLUMNS} columns. "
+                 "Use a sample of your data here, or the Colab notebook for the full file.")
+    else:
+        st.subheader("2. Choose models and settings")
+        models = st.multiselect("Synthesizers", APP_MODELS, default=["GaussianCopula", "CTGAN"])
+        num_rows = st.number_input("Synthetic rows per model", min_value=100, max_value=MAX_ROWS,
+                                   value=min(max(upload["rows"], 100), MAX_ROWS), step=100)
+        epochs = st.slider("Training epochs (CTGAN, TVAE, CopulaGAN)", 1, MAX_EPOCHS, MAX_EPOCHS)
+        target = st.selectbox("Column to predict (optional, adds a utility score)", ["(none)"] + list(upload["columns"]))
+        target_col = None if target == "(none)" else target
+
+        busy = len(active) >= MAX_ACTIVE_JOBS
+        if busy:
+            st.info("Your job is still running. You can start another one when it finishes.")
+        if st.button("🚀 Generate", type="primary", disabled=busy or not models):
+            if pool.backlog() >= MAX_QUEUED:
+                st.warning("The generator is busy with other visitors' jobs right now. Please try again in a few minutes.")
+            elif upload["job_id"] in jobs:
+                st.info("This upload already has a job. Upload the file again to run it with other settings.")
+            else:
+                clean_old_jobs()
+                future = pool.submit(upload["path"], upload["job_id"], models, int(num_rows), epochs, target_col)
+                jobs[upload["job_id"]] = {"future": future, "models": models, "target_col": target_col,
+                                          "file": uploaded.name}
+                st.rerun()
+
+
+# ============================
+# JOB STATUS
+# ============================
+def show_results(job_id, job):
+    future = job["future"]
+    if future.exception() is not None:
+        st.error(f"The job failed: {future.exception()!r}")
+        return
+    summary = future.result()
+    if summary["failed"]:
+        st.warning(f"Failed models: {', '.join(summary['failed'])}")
+
+    ranking_path = os.path.join(JOB_ROOT, job_id, "ranking.csv")
+    if os.path.exists(ranking_path):
+        ranking = pd.read_csv(ranking_path)
+        if len(ranking):
+            st.success(f"Recommended model: **{ranking['Model'].iloc[0]}**")
+            st.dataframe(ranking, hide_index=True)
+
+    recommended = summary.get("recommended")
+    plot = os.path.join(JOB_ROOT, job_id, f"{recommended}_comparison.png")
+    if recommended and os.path.exists(plot):
+        st.image(plot, caption=f"{recommended}: real vs synthetic distributions")
+
+    with open(summary["zip"], "rb") as f:
+        st.download_button("📦 Download results (synthetic data, scores, report)", f,
+                           file_name=f"{job_id}_results.zip", mime="application/zip", key=f"download_{job_id}")
+
+
+def show_progress(job_id, job):
+    # Not future.running(): that is already true while the job waits in the executor's queue
+    if not started(job_id):
+        st.info("⏳ Waiting for a free worker...")
+        return
+    share, latest = progress(job_id, job["models"], job["target_col"])
+    st.progress(share, text="Loading data and detecting metadata..." if not latest else f"{share:.0%} of the model stages done")
+    for model in job["models"]:
+        st.caption(f"{model}: {latest.get(model, 'waiting')}")
+
+
+@st.fragment(run_every=2)
+def poll_jobs():
+    # Reruns on its own every 2 seconds while a job is running; the rest of the page stays put
+    for job_id in active:
+        job = jobs[job_id]
+        if job["future"].done():
+            st.rerun()
+        with st.container(border=True):
+            st.markdown(f"**{job['file']}** (job `{job_id}`)")
+            show_progress(job_id, job)
+
+
+if jobs:
+    st.subheader("3. Your jobs")
+    if active:
+        poll_jobs()
+    for job_id, job in reversed(list(jobs.items())):
+        if job["future"].done():
+            with st.container(border=True):
+                st.markdown(f"**{job['file']}** (job `{job_id}`)")
+                show_results(job_id, job)
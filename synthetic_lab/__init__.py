@@ -0,0 +1,2 @@
+# Synthetic Lab
+# Importable pipeline behind the Colab notebook in colab_scripts/
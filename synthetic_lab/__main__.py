@@ -0,0 +1,111 @@
+# Command-line entry point
+#   python -m synthetic_lab data/                      every .csv/.xlsx/.parquet in data/
+#   python -m synthetic_lab a.csv b.parquet --jobs 2   two jobs at a time
+#   python -m synthetic_lab --manifest batch.csv       per-file settings from a manifest
+#   python -m synthetic_lab a.csv --job-id 1a2b3c4d    resume an interrupted job
+#   python -m synthetic_lab a.csv --condition y=1:500  500 synthetic rows with y = 1
+
+import argparse
+import os
+import sys
+
+from synthetic_lab.cache import ModelCache
+from synthetic_lab.pipeline import DEFAULT_MODELS, MODELS, find_inputs, read_manifest, run_batch
+from synthetic_lab.ranking import parse_weights
+from synthetic_lab.sampling import parse_conditions, parse_constraints
+from synthetic_lab.storage import LocalDirectoryBackend
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m synthetic_lab", description="Generate and evaluate synthetic data without Colab.")
+    parser.add_argument("inputs", nargs="*", help="data files or directories (searched recursively)")
+    parser.add_argument("--manifest", help="CSV or JSON manifest with a path column and optional per-file settings")
+    parser.add_argument("--job-id", help="run (or resume) the single input under this job id")
+    parser.add_argument("--output-dir", default=".", help="where the job folders and zips are written (default: .)")
+    parser.add_argument("--jobs", type=int, default=1, help="datasets processed at the same time (default: 1)")
+    parser.add_argument("--models", default=",".join(DEFAULT_MODELS), help=f"comma-separated, from {', '.join(MODELS)}")
+    for action, help_text in (("remove", "drop"), ("scramble", "shuffle"), ("hash", "replace with a keyed hash"),
+                              ("tokenize", "replace with format-preserving tokens")):
+        parser.add_argument(f"--{action}", default="", metavar="COLUMNS", help=f"comma-separated sensitive columns to {help_text}")
+    parser.add_argument("--hash-key", default=os.environ.get("SYNTHETIC_LAB_HASH_KEY"),
+                        help="secret for --hash/--tokenize (default: $SYNTHETIC_LAB_HASH_KEY, else random per job and reused with --job-id)")
+    parser.add_argument("--target-col", help="column to predict in the utility scores (and stratify the subsample evaluation on)")
+    parser.add_argument("--num-rows", type=int, help="synthetic rows per model (default: as many as the input)")
+    parser.add_argument("--output-format", choices=("csv", "parquet"), default="csv")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="rows sampled per batch")
+    parser.add_argument("--condition", action="append", default=[], metavar="COLUMN=VALUE:ROWS",
+                        help="sample exactly ROWS rows with this value (repeatable; replaces --num-rows)")
+    parser.add_argument("--constraint", action="append", default=[], metavar="COLUMN=LOW..HIGH|VALUE,...",
+                        help="keep only synthetic rows within this range or these values (repeatable)")
+    parser.add_argument("--evaluation", choices=("full", "subsample"), default="full")
+    parser.add_argument("--no-privacy", action="store_true", help="skip the DCR privacy scores")
+    parser.add_argument("--no-utility", action="store_true", help="skip the train-on-synthetic utility scores")
+    parser.add_argument("--selection-cpu-hours", type=float, help="run model selection with this CPU budget first")
+    parser.add_argument("--max-epochs", type=int, default=300)
+    parser.add_argument("--patience", type=int, default=20)
+    parser.add_argument("--budget-minutes", type=float, default=30, help="wall-clock limit per neural model")
+    parser.add_argument("--weights", type=parse_weights, metavar="CRITERION=WEIGHT,...",
+                        help="weights of the composite ranking over diagnostic, quality, privacy and utility (default: equal)")
+    parser.add_argument("--workbook", action="store_true", help="also write the synthetic tables to one Excel workbook (slow on big tables)")
+    parser.add_argument("--no-report", action="store_true", help="don't write the Word evaluation report")
+    parser.add_argument("--no-cache", action="store_true", help="always retrain instead of loading cached fits")
+    parser.add_argument("--profile", action="store_true", help="also write a cProfile dump per stage")
+    parser.add_argument("--upload-dir", help="copy each results zip into this directory (resumable)")
+    args = parser.parse_args(argv)
+    if not args.inputs and not args.manifest:
+        parser.error("give at least one input file/directory or --manifest")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    entries = find_inputs(args.inputs)
+    if args.manifest:
+        entries += read_manifest(args.manifest)
+    if not entries:
+        print("[WARN] No supported data files found")
+        return 1
+    if args.job_id:
+        if len(entries) != 1:
+            print("[WARN] --job-id needs exactly one input")
+            return 2
+        entries = [{**(entries[0] if isinstance(entries[0], dict) else {"path": entries[0]}), "job_id": args.job_id}]
+
+    sensitive = {column: action for action in ("remove", "scramble", "hash", "tokenize")
+                 for column in getattr(args, action).split(",") if column}
+    sample_options = {"output_format": args.output_format, "batch_size": args.batch_size}
+    if args.condition:
+        sample_options["conditions"] = parse_conditions(args.condition)
+    if args.constraint:
+        sample_options["constraints"] = parse_constraints(args.constraint)
+
+    batch = run_batch(
+        entries,
+        output_dir=args.output_dir,
+        max_jobs=args.jobs,
+        models=args.models,
+        target_col=args.target_col,
+        num_rows=args.num_rows,
+        sample_options=sample_options,
+        evaluation_mode=args.evaluation,
+        privacy=not args.no_privacy,
+        utility=not args.no_utility,
+        workbook=args.workbook,
+        report=not args.no_report,
+        weights=args.weights,
+        selection_cpu_hours=args.selection_cpu_hours,
+        max_epochs=args.max_epochs,
+        patience=args.patience,
+        budget_seconds=args.budget_minutes * 60,
+        cache=None if args.no_cache else ModelCache(),
+        backend=LocalDirectoryBackend(args.upload_dir) if args.upload_dir else None,
+        profile=args.profile,
+        sensitive=sensitive,
+        hash_key=args.hash_key,
+    )
+    # Non-zero exit status lets cron / CI notice a failed dataset
+    return 1 if batch["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+# Streaming artifact archive
+# Job outputs are added to the results zip as soon as each model finishes,
+# instead of zipping the whole job directory at the end. Members are
+# compressed in parallel on a thread pool (zlib releases the GIL) into
+# temporary spool files, then appended to the archive one at a time.
+# Formats that are already compressed (PNG, Parquet, ...) are stored as-is.
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+CHUNK_SIZE = 1024 * 1024
+# Members are spooled in memory up to this size, then on disk
+SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+# Extension -> (compression, level). Anything else is deflated at level 6.
+COMPRESSION = {
+    ".png": (zipfile.ZIP_STORED, None),
+    ".jpg": (zipfile.ZIP_STORED, None),
+    ".jpeg": (zipfile.ZIP_STORED, None),
+    ".webp": (zipfile.ZIP_STORED, None),
+    ".parquet": (zipfile.ZIP_STORED, None),
+    ".zip": (zipfile.ZIP_STORED, None),
+    ".gz": (zipfile.ZIP_STORED, None),
+    ".xlsx": (zipfile.ZIP_STORED, None),
+    ".docx": (zipfile.ZIP_STORED, None),
+    ".pkl": (zipfile.ZIP_DEFLATED, 1),
+    ".sqlite": (zipfile.ZIP_DEFLATED, 1),
+}
+DEFAULT_COMPRESSION = (zipfile.ZIP_DEFLATED, 6)
+
+
+def compression_for(path):
+    return COMPRESSION.get(os.path.splitext(path)[1].lower(), DEFAULT_COMPRESSION)
+
+
+def _compress(path, compress_type, level):
+    """Compress one file into a spool file. Returns (spool, crc, file_size, compress_size)."""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15) if compress_type == zipfile.ZIP_DEFLATED else None
+    crc, file_size = 0, 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            spool.write(compressor.compress(chunk) if compressor else chunk)
+    if compressor:
+        spool.write(compressor.flush())
+    compress_size = spool.tell()
+    spool.seek(0)
+    return spool, crc, file_size, compress_size
+
+
+class ArtifactArchive:
+    """
+    Zip archive that members can be added to while the job is still running.
+
+    `add` returns immediately; compression runs on `max_workers` threads and
+    the compressed member is appended by whichever thread finishes it. Call
+    `close` to wait for pending members and write the zip directory.
+    """
+
+    def __init__(self, zip_path, max_workers=None):
+        self.zip_path = zip_path
+        self._zip = zipfile.ZipFile(zip_path, "w", allowZip64=True)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 1))
+        self._pending = []
+        self._added = set()
+
+    def add(self, path, arcname=None):
+        """Queue one file (once); `arcname` defaults to the path as given."""
+        source = os.path.realpath(path)
+        if source in self._added:
+            return
+        self._added.add(source)
+        arcname = os.path.normpath(arcname or path).replace(os.sep, "/").lstrip("/")
+        self._pending.append(self._pool.submit(self._add, path, arcname))
+
+    def add_directory(self, directory, prefix=None, exclude=()):
+        """Queue every file under `directory` that hasn't been added yet, skipping subdirectories named in `exclude`."""
+        prefix = prefix if prefix is not None else os.path.basename(os.path.normpath(directory))
+        for root, subdirs, files in os.walk(directory):
+            subdirs[:] = [name for name in subdirs if name not in exclude]
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                self.add(path, os.path.join(prefix, os.path.relpath(path, directory)))
+
+    def _add(self, path, arcname):
+        compress_type, level = compression_for(path)
+        spool, crc, file_size, compress_size = _compress(path, compress_type, level)
+        try:
+            zinfo = zipfile.ZipInfo(arcname, date_time=time.localtime(os.path.getmtime(path))[:6])
+            zinfo.external_attr = 0o644 << 16
+            zinfo.compress_type = compress_type
+            zinfo.flag_bits = 0
+            zinfo.CRC, zinfo.file_size, zinfo.compress_size = crc, file_size, compress_size
+            with self._lock:
+                self._append_compressed(zinfo, spool)
+        finally:
+            spool.close()
+
+    def _append_compressed(self, zinfo, data):
+        # zipfile has no public way to add data that is already compressed, so
+        # this mirrors ZipFile._open_to_write + _ZipWriteFile.close with the
+        # final sizes and CRC known up front
+        zf = self._zip
+        zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+        zf.fp.seek(zf.start_dir)
+        zinfo.header_offset = zf.fp.tell()
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        zf.fp.write(zinfo.FileHeader(zip64))
+        shutil.copyfileobj(data, zf.fp, CHUNK_SIZE)
+        zf.start_dir = zf.fp.tell()
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+
+    def wait(self):
+        """Block until every queued member is in the archive; re-raises the first failure."""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            self._pool.shutdown()
+            self._zip.close()
+        print(f"[INFO] Wrote {len(self._added)} files to {self.zip_path} ({os.path.getsize(self.zip_path) / 1024**2:,.1f} MB)")
+        return self.zip_path
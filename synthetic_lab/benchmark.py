@@ -0,0 +1,241 @@
+# Synthesizer benchmark
+# Generates input tables of controlled shape (rows, numeric columns,
+# categorical columns) from a fixed seed, then times fit, sample and
+# evaluation for every synthesizer the notebook uses. Results are written
+# with the library versions and hardware they were measured on, so runs
+# before and after an SDV/torch upgrade can be compared.
+#
+#   python -m synthetic_lab.benchmark
+#   python -m synthetic_lab.benchmark --shapes 1000x4x4,100000x8x8 --compare benchmarks/results/<older>.json
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from importlib.metadata import version
+
+import numpy as np
+import pandas as pd
+import torch
+from sdv.evaluation.single_table import evaluate_quality, run_diagnostic
+from sdv.metadata import SingleTableMetadata
+
+from synthetic_lab.evaluation import EvaluationEngine
+from synthetic_lab.pipeline import MODELS
+from synthetic_lab.profiling import StageProfiler
+from synthetic_lab.runner import evaluation_metadata
+from synthetic_lab.training import synthesizer_kwargs
+
+FORMAT_VERSION = 1
+RESULTS_DIR = os.path.join("benchmarks", "results")
+# (rows, numeric columns, categorical columns)
+DEFAULT_SHAPES = ((1_000, 4, 4), (10_000, 4, 4), (10_000, 16, 16))
+DEFAULT_EPOCHS = 10
+# The Models page covers all four synthesizers, not just the notebook's default three
+BENCHMARK_MODELS = tuple(MODELS)
+CATEGORY_COUNT = 8
+
+
+# ============================
+# INPUT TABLES
+# ============================
+def make_table(rows, numeric_columns, categorical_columns, categories=CATEGORY_COUNT, seed=0):
+    """
+    A table with a reproducible mix of column shapes: numeric columns cycle
+    through normal, skewed (lognormal) and integer-valued distributions with
+    some correlation between neighbours; categorical columns have
+    `categories` Zipf-weighted values.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    previous = rng.normal(size=rows)
+    for i in range(numeric_columns):
+        base = 0.6 * previous + 0.8 * rng.normal(size=rows)
+        kind = i % 3
+        if kind == 0:
+            columns[f"num_{i}"] = base * 10 + 50
+        elif kind == 1:
+            columns[f"num_{i}"] = np.round(np.exp(base), 2)
+        else:
+            columns[f"num_{i}"] = np.round(base * 5 + 20).astype("int64")
+        previous = base
+
+    weights = 1 / np.arange(1, categories + 1)
+    for i in range(categorical_columns):
+        values = np.array([f"c{i}_{k}" for k in range(categories)], dtype=object)
+        columns[f"cat_{i}"] = rng.choice(values, size=rows, p=weights / weights.sum())
+    return pd.DataFrame(columns)
+
+
+def table_metadata(df):
+    """Metadata declared from the column names, so detection doesn't vary between runs."""
+    metadata = SingleTableMetadata()
+    for col in df.columns:
+        metadata.add_column(col, sdtype="numerical" if col.startswith("num_") else "categorical")
+    return metadata
+
+
+# ============================
+# RUN
+# ============================
+def environment():
+    """Library versions and hardware the numbers were measured with."""
+    packages = ("sdv", "ctgan", "rdt", "sdmetrics", "torch", "pandas", "numpy", "scikit-learn")
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "torch_threads": torch.get_num_threads(),
+        "packages": {name: version(name) for name in packages},
+    }
+
+
+def run_benchmark(shapes=DEFAULT_SHAPES, models=BENCHMARK_MODELS, epochs=DEFAULT_EPOCHS, evaluation_mode="full",
+                  repeats=1, seed=0):
+    """
+    Time fit, sample and evaluation of every model on every shape, `repeats`
+    times each, one at a time in this process. Neural models train for a
+    fixed `epochs` so runs stay comparable (early stopping is off). Returns one
+    row per model, shape and repeat.
+    """
+    records = []
+    for rows, numeric_columns, categorical_columns in shapes:
+        df = make_table(rows, numeric_columns, categorical_columns, seed=seed)
+        metadata = table_metadata(df)
+        engine = EvaluationEngine(df, metadata, seed=seed) if evaluation_mode == "subsample" else None
+        shape = {"rows": rows, "numeric_columns": numeric_columns, "categorical_columns": categorical_columns}
+
+        for name in models:
+            SynthesizerClass = MODELS[name]
+            for repeat in range(repeats):
+                print(f"[INFO] {name} on {rows:,} x {numeric_columns}+{categorical_columns} (run {repeat + 1}/{repeats})")
+                torch.manual_seed(seed + repeat)
+                profiler = StageProfiler()
+                synthesizer = SynthesizerClass(metadata, **synthesizer_kwargs(SynthesizerClass, epochs, verbose=False))
+
+                with profiler.stage("fit"):
+                    synthesizer.fit(df)
+                with profiler.stage("sample"):
+                    synthetic = synthesizer.sample(num_rows=rows)
+                with profiler.stage("evaluate"):
+                    if engine is not None:
+                        engine.diagnostic(synthetic)
+                        engine.quality(synthetic)
+                    else:
+                        eval_metadata = evaluation_metadata(metadata)
+                        run_diagnostic(df, synthetic, eval_metadata, verbose=False)
+                        evaluate_quality(df, synthetic, eval_metadata, verbose=False)
+
+                stages = {record["stage"]: record for record in profiler.records}
+                record = {"model": name, **shape, "repeat": repeat,
+                          "epochs": epochs if "epochs" in synthesizer_kwargs(SynthesizerClass) else None}
+                for stage, timing in stages.items():
+                    record[f"{stage}_seconds"] = timing["wall_seconds"]
+                    record[f"{stage}_cpu_seconds"] = timing["cpu_seconds"]
+                    record[f"{stage}_rows_per_second"] = rows / max(timing["wall_seconds"], 1e-9)
+                record["peak_rss_mb"] = max(timing["peak_rss_mb"] or 0 for timing in stages.values()) or None
+                records.append(record)
+    return pd.DataFrame(records)
+
+
+def write_results(results, settings, output_dir=RESULTS_DIR):
+    """Write a versioned results file named after the SDV version and time; returns its path."""
+    os.makedirs(output_dir, exist_ok=True)
+    env = environment()
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(output_dir, f"benchmark-sdv{env['packages']['sdv']}-{stamp}.json")
+    document = {
+        "format_version": FORMAT_VERSION,
+        "created": stamp,
+        "environment": env,
+        "settings": settings,
+        "results": json.loads(results.to_json(orient="records")),
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+    return path
+
+
+def load_results(path):
+    with open(path) as f:
+        document = json.load(f)
+    if document.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"{path} has benchmark format {document.get('format_version')}, expected {FORMAT_VERSION}")
+    return document, pd.DataFrame(document["results"])
+
+
+def latest_results(output_dir=RESULTS_DIR):
+    """Path of the newest results file in `output_dir` in the current format, or None."""
+    if not os.path.isdir(output_dir):
+        return None
+    created = {}
+    for name in os.listdir(output_dir):
+        if name.endswith(".json"):
+            path = os.path.join(output_dir, name)
+            try:
+                created[path] = load_results(path)[0]["created"]
+            except (ValueError, KeyError) as error:
+                print(f"[WARN] Skipping {path}: {error}")
+    return max(created, key=created.get) if created else None
+
+
+def compare(baseline, current, tolerance=0.2):
+    """
+    Median stage times of `current` against `baseline` (result tables) per
+    model and shape. `regression` is True where a stage got more than
+    `tolerance` (relative) slower.
+    """
+    keys = ["model", "rows", "numeric_columns", "categorical_columns"]
+    stages = [col for col in ("fit_seconds", "sample_seconds", "evaluate_seconds") if col in baseline and col in current]
+    before = baseline.groupby(keys)[stages].median()
+    after = current.groupby(keys)[stages].median()
+    ratio = (after / before).dropna(how="all")
+    table = ratio.add_suffix("_ratio").reset_index()
+    table["regression"] = (ratio > 1 + tolerance).any(axis=1).to_numpy()
+    return table
+
+
+# ============================
+# COMMAND LINE
+# ============================
+def _parse_shapes(text):
+    return tuple(tuple(int(part) for part in shape.lower().split("x")) for shape in text.split(","))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m synthetic_lab.benchmark", description="Time the synthesizers on generated tables.")
+    parser.add_argument("--shapes", type=_parse_shapes, default=DEFAULT_SHAPES,
+                        help="comma-separated ROWSxNUMERICxCATEGORICAL (default: 1000x4x4,10000x4x4,10000x16x16)")
+    parser.add_argument("--models", default=",".join(BENCHMARK_MODELS), help=f"comma-separated, from {', '.join(MODELS)}")
+    parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS, help="epochs for CTGAN/TVAE/CopulaGAN")
+    parser.add_argument("--evaluation", choices=("full", "subsample"), default="full")
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output-dir", default=RESULTS_DIR)
+    parser.add_argument("--compare", help="earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative slowdown counted as a regression")
+    args = parser.parse_args(argv)
+
+    settings = {"shapes": [list(shape) for shape in args.shapes], "models": args.models.split(","), "epochs": args.epochs,
+                "evaluation": args.evaluation, "repeats": args.repeats, "seed": args.seed}
+    results = run_benchmark(args.shapes, settings["models"], args.epochs, args.evaluation, args.repeats, args.seed)
+    path = write_results(results, settings, args.output_dir)
+    print(f"[✔] Results written to {path}")
+    print(results[["model", "rows", "numeric_columns", "categorical_columns",
+                   "fit_seconds", "sample_seconds", "evaluate_seconds"]].to_string(index=False))
+
+    if args.compare:
+        _, baseline = load_results(args.compare)
+        comparison = compare(baseline, results, args.tolerance)
+        print(comparison.to_string(index=False))
+        if comparison["regression"].any():
+            print(f"[✘] Slower than {args.compare} by more than {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
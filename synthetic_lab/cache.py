@@ -0,0 +1,121 @@
+# Content-addressed cache of fitted synthesizers
+# A fitted model is stored under a hash of everything that determines it: the
+# dataset content, the metadata, the synthesizer class and its constructor
+# arguments. Re-running a job with the same inputs loads the model from disk
+# instead of refitting it.
+
+import hashlib
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+DEFAULT_CACHE_DIR = os.environ.get("SYNTHETIC_LAB_CACHE", os.path.expanduser("~/.cache/synthetic_lab"))
+
+
+def dataset_fingerprint(df):
+    """Hash of the DataFrame content, column names and dtypes."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def cache_key(data_fingerprint, metadata, SynthesizerClass, synthesizer_kwargs):
+    """Key for one fitted model; any change to its inputs gives a different key."""
+    payload = json.dumps(
+        {
+            "data": data_fingerprint,
+            "metadata": metadata.to_dict(),
+            "synthesizer": f"{SynthesizerClass.__module__}.{SynthesizerClass.__qualname__}",
+            "kwargs": synthesizer_kwargs,
+        },
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ModelCache:
+    """
+    On-disk store of pickled synthesizers, bounded to `max_bytes`.
+
+    Entries are evicted least-recently-used first: a hit refreshes the file's
+    modification time, and the oldest files go when a new entry pushes the
+    cache over its size limit. Safe to share between worker processes.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=2 * 1024**3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key, SynthesizerClass):
+        """Return the cached synthesizer, or None on a miss."""
+        path = self._path(key)
+        try:
+            synthesizer = SynthesizerClass.load(path)
+        except FileNotFoundError:
+            return None
+        except Exception as error:
+            # A truncated or incompatible pickle (e.g. after an SDV upgrade) is a miss
+            print(f"[WARN] Dropping unreadable cache entry {key[:12]}: {error!r}")
+            self.invalidate(key)
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return synthesizer
+
+    def put(self, key, synthesizer):
+        """Store a fitted synthesizer, then evict old entries over the size limit."""
+        # Write to a temporary file first so other workers never read a partial pickle
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            synthesizer.save(tmp_path)
+            os.replace(tmp_path, self._path(key))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+
+    def evict(self):
+        """Remove least-recently-used entries until the cache fits in `max_bytes`."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pkl"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def invalidate(self, key=None):
+        """Remove one entry, or every entry when `key` is None."""
+        keys = [key] if key is not None else [name[:-4] for name in os.listdir(self.cache_dir) if name.endswith(".pkl")]
+        for k in keys:
+            try:
+                os.remove(self._path(k))
+            except FileNotFoundError:
+                pass
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
@@ -0,0 +1,24 @@
+# Column encoding shared by the scorers
+# The evaluation engine, the DCR privacy scorer and the utility scorer all
+# split columns by SDV sdtype and turn numeric and datetime columns into
+# plain floats the same way.
+
+import numpy as np
+import pandas as pd
+
+NUMERIC_SDTYPES = ("numerical", "datetime")
+CATEGORICAL_SDTYPES = ("categorical", "boolean")
+
+
+def numeric_values(values, datetime_format=None, is_datetime=False):
+    """
+    A numeric or datetime column as float64, with NaN for missing or
+    unparseable values. Datetimes (datetime dtypes, `is_datetime`, or any
+    column with a `datetime_format`) become nanoseconds since the epoch.
+    """
+    if is_datetime or datetime_format is not None or pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, format=datetime_format, errors="coerce")
+        numbers = values.to_numpy(dtype="datetime64[ns]").astype("int64").astype(float)
+        numbers[values.isna().to_numpy()] = np.nan
+        return numbers
+    return pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
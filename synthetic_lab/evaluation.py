@@ -0,0 +1,317 @@
+# Subsampled, incremental evaluation engine
+# A faster stand-in for SDV's run_diagnostic / evaluate_quality on large tables.
+# The real-data side of every metric (ECDFs, category frequencies, correlations,
+# contingency tables, bounds) is computed once per job from a stratified
+# subsample, then reused to score each synthesizer's output on a subsample of
+# the same size. The subsample size follows from the requested precision, and
+# every score is reported with a confidence interval.
+
+import math
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from synthetic_lab.encoding import CATEGORICAL_SDTYPES, NUMERIC_SDTYPES, numeric_values
+
+# Same defaults as SDMetrics' ContingencySimilarity
+NUM_DISCRETE_BINS = 10
+# Rarer categories share one "other" code in the column-pair tables
+MAX_PAIR_CATEGORIES = 50
+DETAIL_COLUMNS = ["Column", "Metric", "Score", "Score Lower", "Score Upper"]
+
+
+# ============================
+# SAMPLING
+# ============================
+def subsample_size(epsilon=0.02, confidence=0.95):
+    """
+    Rows needed so an empirical CDF is within `epsilon` of the true CDF
+    everywhere with probability `confidence` (Dvoretzky–Kiefer–Wolfowitz).
+    """
+    return math.ceil(math.log(2 / (1 - confidence)) / (2 * epsilon**2))
+
+
+def stratified_sample(df, num_rows, stratify_by=None, seed=0):
+    """
+    Draw at most `num_rows` rows, keeping the class balance of `stratify_by`
+    (every class keeps at least one row while there are rows to spare). One
+    shuffle plus a group rank: O(n).
+    """
+    if num_rows >= len(df):
+        return df
+    rng = np.random.default_rng(seed)
+    shuffled = df.iloc[rng.permutation(len(df))]
+    if stratify_by is None:
+        return shuffled.iloc[:num_rows]
+
+    groups = shuffled[stratify_by]
+    counts = groups.value_counts(dropna=False)
+    quota = np.maximum(1, np.round(counts * num_rows / len(df))).astype(int)
+    rank = shuffled.groupby(stratify_by, dropna=False, observed=True).cumcount().to_numpy()
+    limit = np.nan_to_num(quota.reindex(groups).to_numpy(dtype=float), nan=1)
+    selected = np.flatnonzero(rank < limit)
+    if len(selected) > num_rows:
+        # Rounding the small classes up to one row overshoots: drop the rows ranked
+        # last within their class, which come from the biggest classes
+        selected = np.sort(selected[np.argsort(rank[selected], kind="stable")[:num_rows]])
+    return shuffled.iloc[selected]
+
+
+# ============================
+# CONFIDENCE MARGINS
+# ============================
+def _ecdf_margin(n, alpha):
+    # DKW bound on the sup-distance between an ECDF and the true CDF
+    return math.sqrt(math.log(2 / alpha) / (2 * max(n, 1)))
+
+
+def _tv_margin(n, k, alpha):
+    # Bretagnolle–Huber–Carol bound on the L1 error of k empirical frequencies, halved for TV distance
+    return math.sqrt(2 * (k * math.log(2) + math.log(1 / alpha)) / max(n, 1)) / 2
+
+
+def _correlation_margin(r, n, alpha):
+    # Fisher z-transform interval half-width for a Pearson correlation
+    if n <= 3 or not np.isfinite(r):
+        return 1.0
+    z, half = np.arctanh(np.clip(r, -0.999999, 0.999999)), norm.ppf(1 - alpha / 2) / math.sqrt(n - 3)
+    return float(max(r - np.tanh(z - half), np.tanh(z + half) - r))
+
+
+def _proportion_margin(n, alpha):
+    # Hoeffding bound for a proportion
+    return math.sqrt(math.log(2 / alpha) / (2 * max(n, 1)))
+
+
+# ============================
+# REPORT
+# ============================
+class SubsampleReport:
+    """
+    Same read interface as SDV's reports: get_score, get_properties, get_details.
+    A property with no detail rows (e.g. no numeric or categorical columns)
+    scores NaN and is left out of the overall score.
+    """
+
+    def __init__(self, details):
+        self._details = details
+
+    def get_properties(self):
+        rows = []
+        for name, details in self._details.items():
+            rows.append({
+                "Property": name,
+                "Score": details["Score"].mean(),
+                "Score Lower": details["Score Lower"].mean(),
+                "Score Upper": details["Score Upper"].mean(),
+            })
+        return pd.DataFrame(rows)
+
+    def get_score(self):
+        return self.get_properties()["Score"].mean()
+
+    def get_details(self, property_name):
+        return self._details[property_name]
+
+
+def _detail(column, metric, score, margin, **extra):
+    return {
+        "Column": column,
+        "Metric": metric,
+        "Score": score,
+        "Score Lower": max(0.0, score - margin),
+        "Score Upper": min(1.0, score + margin),
+        **extra,
+    }
+
+
+# ============================
+# ENGINE
+# ============================
+class EvaluationEngine:
+    """
+    Precomputed real-data profile that scores any number of synthetic tables.
+
+    `epsilon` and `confidence` set the subsample size (see `subsample_size`)
+    and the confidence level of the reported intervals. Build it once per job
+    and pass it to every model; each score then costs one pass over a
+    synthetic subsample instead of another pass over the real data.
+    """
+
+    def __init__(self, real_data, metadata, epsilon=0.02, confidence=0.95, stratify_by=None, seed=0):
+        self.confidence = confidence
+        self.seed = seed
+        self.alpha = 1 - confidence
+        self.num_rows = subsample_size(epsilon, confidence)
+
+        columns = metadata.to_dict()["columns"]
+        self.sdtypes = {col: spec["sdtype"] for col, spec in columns.items() if col in real_data.columns}
+        self.datetime_formats = {col: spec.get("datetime_format") for col, spec in columns.items()}
+        self.primary_key = metadata.to_dict().get("primary_key")
+        self.numeric = [col for col, sdtype in self.sdtypes.items() if sdtype in NUMERIC_SDTYPES]
+        self.categorical = [col for col, sdtype in self.sdtypes.items() if sdtype in CATEGORICAL_SDTYPES]
+        self.real_columns = list(real_data.columns)
+
+        # Bounds and category sets come from the full real data: one cheap pass per column
+        self.bounds, self.categories = {}, {}
+        for col in self.numeric:
+            values = self._numeric(real_data, col)
+            self.bounds[col] = (np.nanmin(values), np.nanmax(values))
+        for col in self.categorical:
+            self.categories[col] = set(real_data[col].dropna().unique())
+
+        sample = stratified_sample(real_data, self.num_rows, stratify_by, seed)
+        self.real_rows = len(sample)
+
+        # Column shapes
+        self.real_sorted, self.real_freqs = {}, {}
+        for col in self.numeric:
+            values = self._numeric(sample, col)
+            self.real_sorted[col] = np.sort(values[~np.isnan(values)])
+        for col in self.categorical:
+            self.real_freqs[col] = sample[col].value_counts(normalize=True, dropna=False)
+
+        # Column pair trends: correlations between numeric columns...
+        self.real_corr = pd.DataFrame({col: self._numeric(sample, col) for col in self.numeric}).corr()
+
+        # ...and contingency tables over integer codes for every other pair
+        self.bin_edges = {
+            col: np.histogram_bin_edges(self.real_sorted[col], bins=NUM_DISCRETE_BINS)
+            if len(self.real_sorted[col]) else np.array([0.0, 1.0])
+            for col in self.numeric
+        }
+        self.code_maps = {
+            col: {value: code for code, value in enumerate(self.real_freqs[col].index[:MAX_PAIR_CATEGORIES])}
+            for col in self.categorical
+        }
+        real_codes = self._codes(sample)
+        self.pairs = [
+            (a, b)
+            for i, a in enumerate(self.numeric + self.categorical)
+            for b in (self.numeric + self.categorical)[i + 1:]
+            if not (a in self.numeric and b in self.numeric)
+        ]
+        self.real_joint = {pair: self._joint(real_codes, *pair) for pair in self.pairs}
+
+    # ---- encoding helpers ----
+    def _numeric(self, df, col):
+        return numeric_values(df[col], self.datetime_formats.get(col), is_datetime=self.sdtypes[col] == "datetime")
+
+    def _cardinality(self, col):
+        # Numeric bins plus a bin for missing; categories plus "other"
+        if col in self.numeric:
+            return NUM_DISCRETE_BINS + 1
+        return len(self.code_maps[col]) + 1
+
+    def _codes(self, df):
+        codes = {}
+        for col in self.numeric:
+            values = self._numeric(df, col)
+            binned = np.clip(np.digitize(values, self.bin_edges[col][1:-1]), 0, NUM_DISCRETE_BINS - 1)
+            codes[col] = np.where(np.isnan(values), NUM_DISCRETE_BINS, binned)
+        for col in self.categorical:
+            other = len(self.code_maps[col])
+            codes[col] = df[col].astype(object).map(self.code_maps[col]).fillna(other).to_numpy(dtype=np.int64)
+        return codes
+
+    def _joint(self, codes, a, b):
+        kb = self._cardinality(b)
+        counts = np.bincount(codes[a] * kb + codes[b], minlength=self._cardinality(a) * kb)
+        return counts / max(counts.sum(), 1)
+
+    # ---- reports ----
+    def _synthetic_sample(self, synthetic_data):
+        return stratified_sample(synthetic_data, self.num_rows, seed=self.seed)
+
+    def diagnostic(self, synthetic_data):
+        """Data Validity and Data Structure, as in SDV's diagnostic report."""
+        sample = self._synthetic_sample(synthetic_data)
+        n = len(sample)
+
+        validity = []
+        for col in self.numeric:
+            if col not in sample:
+                continue
+            values = self._numeric(sample, col)
+            values = values[~np.isnan(values)]
+            low, high = self.bounds[col]
+            score = float(np.mean((values >= low) & (values <= high))) if len(values) else 1.0
+            validity.append(_detail(col, "BoundaryAdherence", score, _proportion_margin(n, self.alpha)))
+        for col in self.categorical:
+            if col not in sample:
+                continue
+            values = sample[col].dropna()
+            score = float(values.isin(self.categories[col]).mean()) if len(values) else 1.0
+            validity.append(_detail(col, "CategoryAdherence", score, _proportion_margin(n, self.alpha)))
+        if self.primary_key and self.primary_key in synthetic_data:
+            # Uniqueness is checked on the full column, a subsample would hide duplicates
+            keys = synthetic_data[self.primary_key]
+            validity.append(_detail(self.primary_key, "KeyUniqueness", float(keys.nunique() / max(len(keys), 1)), 0.0))
+
+        real, synthetic = set(self.real_columns), set(synthetic_data.columns)
+        structure = [_detail(None, "TableStructure", len(real & synthetic) / len(real | synthetic), 0.0)]
+
+        return SubsampleReport({
+            "Data Validity": pd.DataFrame(validity, columns=DETAIL_COLUMNS),
+            "Data Structure": pd.DataFrame(structure, columns=DETAIL_COLUMNS),
+        })
+
+    def quality(self, synthetic_data):
+        """Column Shapes and Column Pair Trends, as in SDV's quality report."""
+        sample = self._synthetic_sample(synthetic_data)
+        n = len(sample)
+
+        shapes = []
+        for col in self.numeric:
+            real = self.real_sorted[col]
+            values = self._numeric(sample, col)
+            synthetic = np.sort(values[~np.isnan(values)])
+            if not len(real) or not len(synthetic):
+                continue
+            # Two-sample KS statistic: largest gap between the ECDFs over the pooled values
+            pooled = np.concatenate([real, synthetic])
+            gap = np.abs(
+                np.searchsorted(real, pooled, side="right") / len(real)
+                - np.searchsorted(synthetic, pooled, side="right") / len(synthetic)
+            ).max()
+            margin = _ecdf_margin(len(real), self.alpha) + _ecdf_margin(len(synthetic), self.alpha)
+            shapes.append(_detail(col, "KSComplement", 1 - gap, margin))
+        for col in self.categorical:
+            real = self.real_freqs[col]
+            synthetic = sample[col].value_counts(normalize=True, dropna=False)
+            real, synthetic = real.align(synthetic, fill_value=0)
+            k = len(real)
+            margin = _tv_margin(self.real_rows, k, self.alpha) + _tv_margin(n, k, self.alpha)
+            shapes.append(_detail(col, "TVComplement", 1 - 0.5 * np.abs(real - synthetic).sum(), margin))
+
+        trends = []
+        synthetic_corr = pd.DataFrame({col: self._numeric(sample, col) for col in self.numeric}).corr()
+        for i, a in enumerate(self.numeric):
+            for b in self.numeric[i + 1:]:
+                real_r, synthetic_r = self.real_corr.loc[a, b], synthetic_corr.loc[a, b]
+                if not np.isfinite(real_r) or not np.isfinite(synthetic_r):
+                    continue
+                margin = (_correlation_margin(real_r, self.real_rows, self.alpha) + _correlation_margin(synthetic_r, n, self.alpha)) / 2
+                trends.append(_detail(
+                    None, "CorrelationSimilarity", 1 - abs(synthetic_r - real_r) / 2, margin,
+                    **{"Column 1": a, "Column 2": b, "Real Correlation": real_r, "Synthetic Correlation": synthetic_r},
+                ))
+
+        synthetic_codes = self._codes(sample)
+        for a, b in self.pairs:
+            real, synthetic = self.real_joint[(a, b)], self._joint(synthetic_codes, a, b)
+            k = int(np.count_nonzero(real + synthetic))
+            margin = _tv_margin(self.real_rows, k, self.alpha) + _tv_margin(n, k, self.alpha)
+            trends.append(_detail(
+                None, "ContingencySimilarity", 1 - 0.5 * np.abs(real - synthetic).sum(), margin,
+                **{"Column 1": a, "Column 2": b},
+            ))
+
+        return SubsampleReport({
+            "Column Shapes": pd.DataFrame(shapes, columns=DETAIL_COLUMNS),
+            "Column Pair Trends": pd.DataFrame(trends, columns=[
+                "Column 1", "Column 2", "Metric", "Score", "Score Lower", "Score Upper",
+                "Real Correlation", "Synthetic Correlation",
+            ]),
+        })
@@ -0,0 +1,189 @@
+# Demo gallery
+# Trains every synthesizer the course documents on a few small public tables
+# that ship with scikit-learn and stores the results as compact artifacts the
+# course pages read directly, so nothing is trained per visitor:
+#
+#   gallery/manifest.json                   datasets, models, settings, versions
+#   gallery/<dataset>/real.parquet          the real table
+#   gallery/<dataset>/metadata.json         its SDV metadata
+#   gallery/<dataset>/synthetic/<model>.parquet
+#   gallery/<dataset>/models/<model>.pkl.gz fitted synthesizer (gzipped cloudpickle, as SDV saves it)
+#   gallery/<dataset>/scores.json           per-model scores and timings
+#   gallery/<dataset>/metrics.parquet       every metric row, for ModelRanking
+#
+# Only the tables, scores and metrics are committed; the pages never load the
+# fitted models, which stay local (see .gitignore) until the next build.
+#
+#   python -m synthetic_lab.gallery
+#   python -m synthetic_lab.gallery --datasets iris --epochs 50
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import sys
+import time
+
+import cloudpickle
+import torch
+from sdv.evaluation.single_table import evaluate_quality, run_diagnostic
+from sdv.metadata import SingleTableMetadata
+from sklearn import datasets as sklearn_datasets
+
+from synthetic_lab.benchmark import environment
+from synthetic_lab.ingest import release_categoricals
+from synthetic_lab.pipeline import MODELS
+from synthetic_lab.privacy import DCRScorer
+from synthetic_lab.ranking import METRICS_NAME, compact_metrics, details_frame, scores_frame
+from synthetic_lab.runner import evaluation_metadata, report_details
+from synthetic_lab.training import synthesizer_kwargs
+from synthetic_lab.utility import UtilityScorer
+
+GALLERY_DIR = "gallery"
+FORMAT_VERSION = 1
+DEFAULT_EPOCHS = 300
+GALLERY_MODELS = tuple(MODELS)
+
+
+# ============================
+# SAMPLE TABLES
+# ============================
+def _iris():
+    frame = sklearn_datasets.load_iris(as_frame=True)
+    df = frame.frame.rename(columns=lambda col: col.replace(" (cm)", "").replace(" ", "_"))
+    df["target"] = frame.target_names[frame.target]
+    return df.rename(columns={"target": "species"})
+
+
+def _wine():
+    frame = sklearn_datasets.load_wine(as_frame=True)
+    df = frame.frame.rename(columns=lambda col: col.replace("/", "_"))
+    df["target"] = [f"cultivar_{label}" for label in frame.target]
+    return df.rename(columns={"target": "cultivar"})
+
+
+# name -> (loader, target column, description)
+DATASETS = {
+    "iris": (_iris, "species", "Fisher's iris flowers: 150 rows, 4 measurements and the species."),
+    "wine": (_wine, "cultivar", "Chemical analysis of Italian wines: 178 rows, 13 measurements and the cultivar."),
+}
+
+
+# ============================
+# BUILD
+# ============================
+def build_dataset(name, models=GALLERY_MODELS, epochs=DEFAULT_EPOCHS, output_dir=GALLERY_DIR, seed=0):
+    """
+    Fit every model in `models` on the sample table `name` and write its
+    artifacts to `{output_dir}/{name}/`. Returns the dataset's scores.
+    """
+    loader, target_col, description = DATASETS[name]
+    real = loader()
+    dataset_dir = os.path.join(output_dir, name)
+    shutil.rmtree(dataset_dir, ignore_errors=True)
+    os.makedirs(os.path.join(dataset_dir, "synthetic"))
+    os.makedirs(os.path.join(dataset_dir, "models"))
+    real.to_parquet(os.path.join(dataset_dir, "real.parquet"), index=False)
+
+    metadata = SingleTableMetadata()
+    metadata.detect_from_dataframe(real)
+    metadata.update_column(target_col, sdtype="categorical")
+    metadata.save_to_json(os.path.join(dataset_dir, "metadata.json"))
+    eval_metadata = evaluation_metadata(metadata)
+
+    # Scored like a job with a target column: the synthesizers never see the utility test rows
+    utility = UtilityScorer(real, metadata, target_col, seed=seed)
+    train = utility.train_data
+    privacy = DCRScorer(train, metadata)
+
+    scores = {"dataset": name, "description": description, "rows": len(real), "columns": real.shape[1],
+              "target_col": target_col, "models": {}}
+    frames = []
+    for model in models:
+        SynthesizerClass = MODELS[model]
+        print(f"[INFO] {name}: training {model}...")
+        torch.manual_seed(seed)
+        synthesizer = SynthesizerClass(metadata, **synthesizer_kwargs(SynthesizerClass, epochs, verbose=False))
+        started = time.perf_counter()
+        synthesizer.fit(release_categoricals(train, metadata, keep_categorical=False))
+        fit_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        synthetic = synthesizer.sample(num_rows=len(real))
+        sample_seconds = time.perf_counter() - started
+
+        synthetic.to_parquet(os.path.join(dataset_dir, "synthetic", f"{model}.parquet"), index=False)
+        with gzip.open(os.path.join(dataset_dir, "models", f"{model}.pkl.gz"), "wb") as f:
+            cloudpickle.dump(synthesizer, f)
+
+        diagnostic = run_diagnostic(train, synthetic, eval_metadata, verbose=False)
+        quality = evaluate_quality(train, synthetic, eval_metadata, verbose=False)
+        dcr = privacy.score(synthetic)
+        efficacy = utility.score(synthetic)
+        frames += [
+            details_frame(report_details(diagnostic), model, "diagnostic"),
+            details_frame(report_details(quality), model, "quality"),
+            scores_frame(dcr, model, "privacy", "Value"),
+            scores_frame(efficacy, model, "utility", "Ratio"),
+        ]
+        scores["models"][model] = {
+            "epochs": epochs if "epochs" in synthesizer_kwargs(SynthesizerClass) else None,
+            "fit_seconds": fit_seconds,
+            "sample_seconds": sample_seconds,
+            "diagnostic_score": diagnostic.get_score(),
+            "quality_score": quality.get_score(),
+            "privacy_score": dict(zip(dcr["Metric"], dcr["Value"])).get("DCR Score"),
+            "utility_score": efficacy["Ratio"].iloc[-1],
+        }
+
+    compact_metrics(frames).to_parquet(os.path.join(dataset_dir, METRICS_NAME), index=False)
+    with open(os.path.join(dataset_dir, "scores.json"), "w") as f:
+        json.dump(scores, f, indent=2)
+    return scores
+
+
+def build_gallery(names=tuple(DATASETS), models=GALLERY_MODELS, epochs=DEFAULT_EPOCHS, output_dir=GALLERY_DIR, seed=0):
+    """Build every dataset in `names` and write `manifest.json`; returns the manifest."""
+    os.makedirs(output_dir, exist_ok=True)
+    for name in names:
+        build_dataset(name, models, epochs, output_dir, seed)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "created": time.strftime("%Y%m%d-%H%M%S"),
+        "datasets": {name: DATASETS[name][2] for name in names},
+        "models": list(models),
+        "settings": {"epochs": epochs, "seed": seed},
+        "environment": environment(),
+    }
+    with open(os.path.join(output_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_synthesizer(path):
+    """A fitted synthesizer from one of the gallery's `.pkl.gz` files."""
+    with gzip.open(path, "rb") as f:
+        return cloudpickle.load(f)
+
+
+# ============================
+# COMMAND LINE
+# ============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m synthetic_lab.gallery",
+                                     description="Train the documented synthesizers on the bundled sample tables.")
+    parser.add_argument("--datasets", default=",".join(DATASETS), help=f"comma-separated, from {', '.join(DATASETS)}")
+    parser.add_argument("--models", default=",".join(GALLERY_MODELS), help=f"comma-separated, from {', '.join(MODELS)}")
+    parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS, help="epochs for CTGAN/TVAE/CopulaGAN")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output-dir", default=GALLERY_DIR)
+    args = parser.parse_args(argv)
+
+    manifest = build_gallery(args.datasets.split(","), args.models.split(","), args.epochs, args.output_dir, args.seed)
+    print(f"[✔] Gallery of {len(manifest['datasets'])} datasets written to {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+# Typed ingestion of the uploaded dataset
+# Reads CSV with pyarrow's multithreaded block reader, plus Excel and Parquet,
+# then shrinks the frame: numeric columns are downcast and low-cardinality text
+# becomes categorical. The resulting schema is saved, keyed on the file's
+# header, and used as a hint by the next load of a file with the same columns:
+# each saved dtype is kept only where every value fits it, and the other
+# columns are inferred again.
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from synthetic_lab.cache import DEFAULT_CACHE_DIR
+
+SCHEMA_DIR = os.path.join(DEFAULT_CACHE_DIR, "schemas")
+
+# Text columns with at most this many distinct values are dictionary-encoded while reading
+MAX_CATEGORIES = 1_000
+# ...and larger ones still become categorical if they repeat enough
+CATEGORY_RATIO = 0.5
+
+
+# ============================
+# SCHEMA CACHE
+# ============================
+def header_fingerprint(path):
+    """Hash of the file type and column names, cheap to compute without reading the data."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, "rb") as f:
+            header = f.readline()
+    elif extension == ".parquet":
+        header = json.dumps(pq.read_schema(path).names).encode()
+    else:
+        header = json.dumps([str(col) for col in pd.read_excel(path, nrows=0).columns]).encode()
+    return hashlib.sha256(extension.encode() + header).hexdigest()
+
+
+def _type_to_json(arrow_type):
+    if pa.types.is_dictionary(arrow_type):
+        return {"dictionary": str(arrow_type.value_type)}
+    return str(arrow_type)
+
+
+def _type_from_json(value):
+    """Arrow type from its saved form, or None if it can't be rebuilt (it will be inferred)."""
+    try:
+        if isinstance(value, dict):
+            return pa.dictionary(pa.int32(), pa.type_for_alias(value["dictionary"]))
+        return pa.type_for_alias(value)
+    except (KeyError, ValueError):
+        return None
+
+
+def schema_of(df):
+    """Column -> {arrow, pandas} dtype record of a loaded frame."""
+    arrow_schema = pa.Schema.from_pandas(df, preserve_index=False)
+    return {
+        "columns": {
+            str(col): {"arrow": _type_to_json(arrow_schema.field(str(col)).type), "pandas": str(dtype)}
+            for col, dtype in df.dtypes.items()
+        }
+    }
+
+
+def write_schema(schema, path):
+    with open(path, "w") as f:
+        json.dump(schema, f, indent=2)
+
+
+def read_schema(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+# ============================
+# DTYPE OPTIMIZATION
+# ============================
+def optimize_dtypes(df, category_ratio=CATEGORY_RATIO):
+    """Downcast numerics (floats only when lossless) and turn repetitive text into categoricals."""
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_bool_dtype(values) or isinstance(values.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(values):
+            df[col] = pd.to_numeric(values, downcast="integer")
+        elif pd.api.types.is_float_dtype(values):
+            smaller = values.astype(np.float32)
+            if np.array_equal(smaller.to_numpy(dtype=np.float64), values.to_numpy(), equal_nan=True):
+                df[col] = smaller
+        elif pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+            if len(values) and values.nunique(dropna=True) / len(values) <= category_ratio:
+                df[col] = values.astype("category")
+    return df
+
+
+def release_categoricals(df, metadata, keep_categorical=True):
+    """
+    Undo the categorical dtype on columns SDV doesn't model as categories (PII,
+    IDs, ...). SDV casts its output back to the input dtype, which would turn
+    the fake values it generates for those columns into NaN. The ctgan-based
+    synthesizers reject categorical dtypes altogether; pass
+    `keep_categorical=False` to release every column for them.
+    """
+    columns = metadata.to_dict()["columns"]
+    release = [
+        col for col in df.columns
+        if isinstance(df[col].dtype, pd.CategoricalDtype)
+        and not (keep_categorical and columns.get(col, {}).get("sdtype") in ("categorical", "boolean"))
+    ]
+    if not release:
+        return df
+    return df.assign(**{col: df[col].astype(df[col].cat.categories.dtype) for col in release})
+
+
+def training_frames(df, metadata):
+    """
+    `release_categoricals` of `df` for both kinds of synthesizer, keyed by
+    `keep_categorical`. Built once per job and shared by every model, so the
+    released copy isn't made again for each one (a frame with nothing to
+    release is `df` itself).
+    """
+    return {keep: release_categoricals(df, metadata, keep_categorical=keep) for keep in (True, False)}
+
+
+def _fits(values, dtype):
+    """Whether every value of `values` survives a cast to `dtype` unchanged."""
+    if isinstance(dtype, pd.CategoricalDtype):
+        return not pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+    if values.dtype == dtype:
+        return True
+    if not isinstance(dtype, np.dtype) or dtype.kind not in "iuf" or not pd.api.types.is_numeric_dtype(values) \
+            or pd.api.types.is_bool_dtype(values):
+        return False
+    if dtype.kind in "iu":
+        if not pd.api.types.is_integer_dtype(values) or values.isna().any():
+            return False
+        limits = np.iinfo(dtype)
+        return len(values) == 0 or (limits.min <= values.min() and values.max() <= limits.max)
+    numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.array_equal(numbers.astype(dtype).astype(np.float64), numbers, equal_nan=True)
+
+
+def apply_schema(df, schema, category_ratio=CATEGORY_RATIO):
+    """
+    Cast to the saved pandas dtypes where every value fits them (no overflow,
+    no lost precision), skipping the inference in `optimize_dtypes`. Columns
+    that don't fit, or have no saved dtype, are optimized again. Returns the
+    frame and the names of those columns.
+    """
+    saved = schema["columns"]
+    misfits = []
+    for col in df.columns:
+        try:
+            dtype = pd.api.types.pandas_dtype(saved[str(col)]["pandas"])
+        except (KeyError, TypeError):
+            dtype = None
+        if dtype is not None and _fits(df[col], dtype):
+            df[col] = df[col].astype(dtype)
+        else:
+            misfits.append(col)
+    if misfits:
+        optimized = optimize_dtypes(df[misfits].copy(), category_ratio)
+        for col in misfits:
+            df[col] = optimized[col]
+    return df, misfits
+
+
+# ============================
+# READERS
+# ============================
+def _read_csv(path, schema=None, max_categories=MAX_CATEGORIES):
+    column_types = {}
+    if schema is not None:
+        for col, spec in schema["columns"].items():
+            arrow_type = _type_from_json(spec["arrow"])
+            # Numbers are read at full width; `apply_schema` narrows them where they fit
+            if arrow_type is not None and pa.types.is_integer(arrow_type):
+                arrow_type = pa.int64()
+            elif arrow_type is not None and pa.types.is_floating(arrow_type):
+                arrow_type = pa.float64()
+            if arrow_type is not None:
+                column_types[col] = arrow_type
+
+    table = pacsv.read_csv(
+        path,
+        convert_options=pacsv.ConvertOptions(
+            column_types=column_types,
+            auto_dict_encode=True,
+            auto_dict_max_cardinality=max_categories,
+        ),
+    )
+    # Release each Arrow column as soon as it has been converted
+    return table.to_pandas(self_destruct=True, split_blocks=True)
+
+
+def _read_parquet(path):
+    return pq.read_table(path).to_pandas(self_destruct=True, split_blocks=True)
+
+
+def _read_excel(path):
+    return pd.read_excel(path, engine="openpyxl")
+
+
+# openpyxl reads .xlsx only; legacy .xls files need converting first
+READERS = {".csv": _read_csv, ".parquet": _read_parquet, ".xlsx": _read_excel}
+
+
+def load_dataset(path, job_dir=None, schema_dir=SCHEMA_DIR, category_ratio=CATEGORY_RATIO):
+    """
+    Load a .csv, .xlsx or .parquet file into a compact DataFrame.
+
+    If a schema was saved for a file with the same header, its dtypes are
+    used wherever the data still fits them (see `apply_schema`); otherwise
+    dtypes are inferred, optimized and the schema is saved for next time. A
+    copy of the schema goes to `{job_dir}/schema.json` when `job_dir` is given.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in READERS:
+        raise ValueError(f"Unsupported file type '{extension}', expected one of {sorted(READERS)}")
+
+    os.makedirs(schema_dir, exist_ok=True)
+    schema_path = os.path.join(schema_dir, f"{header_fingerprint(path)}.json")
+    schema = read_schema(schema_path)
+
+    df = None
+    if schema is not None:
+        try:
+            df = _read_csv(path, schema) if extension == ".csv" else READERS[extension](path)
+            df, misfits = apply_schema(df, schema, category_ratio)
+        except (pa.ArrowInvalid, ValueError, TypeError) as error:
+            # The file can't even be read with the saved types (e.g. text in a number column): infer again
+            print(f"[WARN] Saved schema no longer fits {path} ({error}), inferring dtypes")
+            df = None
+        else:
+            if misfits:
+                # e.g. a wider integer range or more decimals than last time
+                print(f"[WARN] Saved schema no longer fits {len(misfits)} column(s) of {path} "
+                      f"({', '.join(map(str, misfits))}), inferred their dtypes again")
+                schema = schema_of(df)
+                write_schema(schema, schema_path)
+            else:
+                print(f"[INFO] Loaded {path} with the saved schema")
+
+    if df is None:
+        df = optimize_dtypes(READERS[extension](path), category_ratio)
+        schema = schema_of(df)
+        write_schema(schema, schema_path)
+
+    if job_dir is not None:
+        write_schema(schema, os.path.join(job_dir, "schema.json"))
+
+    print(f"[INFO] Loaded {len(df):,} rows x {df.shape[1]} columns ({df.memory_usage(deep=True).sum() / 1024**2:,.1f} MB)")
+    return df
@@ -0,0 +1,80 @@
+# Persistent job state
+# Every stage a model goes through (fit, sample, evaluate, privacy, plot) is
+# recorded in a SQLite database inside the job directory, next to checkpoints
+# of the fitted synthesizer and the evaluated synthetic rows. Running the same
+# job id again skips whatever already finished.
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+DB_NAME = "job_state.sqlite"
+CHECKPOINT_DIR = "checkpoints"
+
+
+class JobStore:
+    """
+    Stage log of one job, stored in `{job_dir}/job_state.sqlite`.
+
+    Only the path is kept on the object, so it can be sent to worker
+    processes; each call opens its own short-lived connection.
+    """
+
+    def __init__(self, job_dir):
+        self.job_dir = job_dir
+        self.path = os.path.join(job_dir, DB_NAME)
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS stages ("
+                " model TEXT NOT NULL, stage TEXT NOT NULL, status TEXT NOT NULL,"
+                " details TEXT, updated REAL NOT NULL, PRIMARY KEY (model, stage))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # Several workers write to the same job; wait for each other's locks
+        db = sqlite3.connect(self.path, timeout=60)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    @property
+    def checkpoint_dir(self):
+        return os.path.join(self.job_dir, CHECKPOINT_DIR)
+
+    def checkpoint_path(self, model_name, name):
+        return os.path.join(self.checkpoint_dir, f"{model_name}_{name}")
+
+    def mark(self, model_name, stage, status="completed", details=None):
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO stages (model, stage, status, details, updated) VALUES (?, ?, ?, ?, ?)",
+                (model_name, stage, status, json.dumps(details, default=str), time.time()),
+            )
+
+    def completed(self, model_name, stage):
+        """The details recorded when `stage` completed for `model_name`, or None if it hasn't."""
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT details FROM stages WHERE model = ? AND stage = ? AND status = 'completed'",
+                (model_name, stage),
+            ).fetchone()
+        return None if row is None else (json.loads(row[0]) or {})
+
+    def stages(self):
+        """Every recorded stage as (model, stage, status, updated) rows, oldest first."""
+        with self._connect() as db:
+            return db.execute("SELECT model, stage, status, updated FROM stages ORDER BY updated").fetchall()
+
+    def reset(self, model_name=None):
+        """Forget the recorded stages of one model (or all of them) so they run again."""
+        with self._connect() as db:
+            if model_name is None:
+                db.execute("DELETE FROM stages")
+            else:
+                db.execute("DELETE FROM stages WHERE model = ?", (model_name,))
@@ -0,0 +1,122 @@
+# Metadata detection on a sample, with reusable metadata profiles
+# SDV infers column sdtypes from a bounded random sample, then the guesses
+# that a sample can get wrong (ID uniqueness, categorical vs numerical,
+# datetime formats) are checked against the full columns. The result is saved
+# as a profile keyed on the dataset's schema, so recurring extracts with the
+# same columns load it instead of detecting again.
+
+import hashlib
+import json
+import os
+import warnings
+
+import pandas as pd
+from sdv.metadata import SingleTableMetadata
+
+from synthetic_lab.cache import DEFAULT_CACHE_DIR
+
+PROFILE_DIR = os.path.join(DEFAULT_CACHE_DIR, "metadata_profiles")
+DEFAULT_SAMPLE_ROWS = 10_000
+
+# SDV treats whole, non-negative numbers with at most this many values as categorical
+MAX_NUMERIC_CATEGORIES = 10
+
+
+def schema_fingerprint(df):
+    """
+    Hash of the column names and the kind of each dtype. Downcasting (int8 one
+    day, int16 the next) doesn't change it; a new, renamed or retyped column does.
+    """
+    def kind(dtype):
+        return "category" if isinstance(dtype, pd.CategoricalDtype) else dtype.kind
+
+    payload = json.dumps([(str(col), kind(dtype)) for col, dtype in df.dtypes.items()])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _numeric_sdtype(values, nunique):
+    """SDV's rule for numbers, applied to the full column."""
+    present = values.dropna()
+    if present.empty:
+        return "numerical"
+    whole = bool((present == present.round()).all())
+    positive = bool((present >= 0).all())
+    if whole and positive and nunique <= min(round(len(values) / 10), MAX_NUMERIC_CATEGORIES):
+        return "categorical"
+    return "numerical"
+
+
+def validate_metadata(metadata, df):
+    """
+    Check sample-detected sdtypes against the full data and fix the ones that
+    don't hold. Distinct counts are computed for every column in one pass.
+    Returns the list of corrections.
+    """
+    nunique = df.nunique(dropna=True)
+    nulls = df.isna().sum()
+    corrections = []
+
+    def update(col, sdtype, reason, **kwargs):
+        metadata.update_column(col, sdtype=sdtype, **kwargs)
+        corrections.append(f"{col}: {reason}, now {sdtype}")
+
+    for col, spec in metadata.to_dict()["columns"].items():
+        sdtype, values = spec["sdtype"], df[col]
+        is_number = pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+
+        if sdtype == "id" or col == metadata.primary_key:
+            if nunique[col] < len(df) or nulls[col]:
+                if col == metadata.primary_key:
+                    metadata.remove_primary_key()
+                update(col, _numeric_sdtype(values, nunique[col]) if is_number else "categorical", "not unique in the full data")
+
+        elif is_number and sdtype in ("numerical", "categorical"):
+            full_sdtype = _numeric_sdtype(values, nunique[col])
+            if full_sdtype != sdtype:
+                update(col, full_sdtype, f"{nunique[col]} distinct values in the full data")
+
+        elif sdtype == "datetime" and spec.get("datetime_format") and not pd.api.types.is_datetime64_any_dtype(values):
+            parsed = pd.to_datetime(values, format=spec["datetime_format"], errors="coerce")
+            if parsed.isna().sum() > nulls[col]:
+                update(col, "categorical", f"values outside the format {spec['datetime_format']}")
+
+    return corrections
+
+
+def detect_metadata(df, sample_rows=DEFAULT_SAMPLE_ROWS, seed=0, profile_dir=PROFILE_DIR, job_dir=None, use_profile=True):
+    """
+    Metadata for `df`: a saved profile for the same schema if there is one,
+    otherwise detection on `sample_rows` random rows plus a full-data check.
+
+    The profile is saved for next time, and written to `{job_dir}/metadata.json`
+    when `job_dir` is given. Set `use_profile=False` to force detection.
+    """
+    os.makedirs(profile_dir, exist_ok=True)
+    profile_path = os.path.join(profile_dir, f"{schema_fingerprint(df)}.json")
+
+    metadata = None
+    if use_profile and os.path.exists(profile_path):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            metadata = SingleTableMetadata.load_from_json(profile_path)
+        print("[INFO] Loaded the saved metadata profile for this schema")
+
+    if metadata is None:
+        sample = df.sample(n=sample_rows, random_state=seed) if len(df) > sample_rows else df
+        metadata = SingleTableMetadata()
+        metadata.detect_from_dataframe(sample)
+
+        for correction in validate_metadata(metadata, df):
+            print(f"[INFO] Metadata corrected on the full data - {correction}")
+
+        if os.path.exists(profile_path):
+            os.remove(profile_path)
+        metadata.save_to_json(profile_path)
+
+    if job_dir is not None:
+        path = os.path.join(job_dir, "metadata.json")
+        if os.path.exists(path):
+            os.remove(path)
+        metadata.save_to_json(path)
+
+    return metadata
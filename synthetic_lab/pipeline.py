@@ -0,0 +1,282 @@
+# Headless pipeline
+# The notebook's load -> metadata -> train -> evaluate -> package flow as
+# plain functions, so it can run on any machine without Colab's upload and
+# auth prompts. `run_batch` feeds many datasets through a bounded job queue;
+# every job keeps the notebook's layout: {output_dir}/{job_id}/ plus
+# {output_dir}/{job_id}_results.zip.
+
+import csv
+import inspect
+import json
+import os
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from sdv.single_table import CopulaGANSynthesizer, CTGANSynthesizer, GaussianCopulaSynthesizer, TVAESynthesizer
+
+from synthetic_lab.artifacts import ArtifactArchive
+from synthetic_lab.evaluation import EvaluationEngine
+from synthetic_lab.ingest import READERS, load_dataset, training_frames
+from synthetic_lab.jobstore import CHECKPOINT_DIR
+from synthetic_lab.metadata import detect_metadata
+from synthetic_lab.privacy import DCRScorer
+from synthetic_lab.profiling import StageProfiler
+from synthetic_lab.ranking import rank_models
+from synthetic_lab.reports import export_results
+from synthetic_lab.runner import run_models
+from synthetic_lab.selection import successive_halving
+from synthetic_lab.sensitive import protect_columns
+from synthetic_lab.storage import upload
+from synthetic_lab.training import EpochScheduler
+from synthetic_lab.utility import UtilityScorer
+
+MODELS = {
+    "CTGAN": CTGANSynthesizer,
+    "TVAE": TVAESynthesizer,
+    "GaussianCopula": GaussianCopulaSynthesizer,
+    "CopulaGAN": CopulaGANSynthesizer,
+}
+DEFAULT_MODELS = ("CTGAN", "TVAE", "GaussianCopula")
+
+
+def new_job_id():
+    return str(uuid.uuid4())[:8]
+
+
+# ============================
+# ONE JOB
+# ============================
+def run_job(file_path, output_dir=".", job_id=None, models=DEFAULT_MODELS, target_col=None, num_rows=None,
+            sample_options=None, evaluation_mode="full", privacy=True, selection_cpu_hours=None, max_epochs=300,
+            patience=20, budget_seconds=30 * 60, cache=None, backend=None, cpus=None, profile=False,
+            sensitive=None, hash_key=None, utility=True, workbook=False, report=True, weights=None, inline=False):
+    """
+    Run the notebook pipeline on one file and return the job summary.
+
+    `sensitive` maps columns to "remove", "scramble", "hash" or "tokenize",
+    applied before anything else sees the data (`hash_key` keeps hashes and
+    tokens stable across jobs; without it they stay stable when this job is
+    resumed).
+
+    `models` are names from `MODELS` (a list or a comma-separated string).
+    `evaluation_mode` is "full" or "subsample" (stratified on `target_col`),
+    `privacy` adds DCR scores and `selection_cpu_hours` runs successive-halving
+    model selection first. With a `target_col`, `utility` holds out a real
+    test split before anything is fitted and scores each synthesizer by how
+    well a model trained on its output predicts that column there.
+    `max_epochs`, `patience` and `budget_seconds` configure the
+    `EpochScheduler`. Fitted models are reused from `cache` (a `ModelCache`)
+    and the results zip is uploaded through `backend` when one is given.
+    `cpus` caps the cores the job's workers may use (default: all of them);
+    `inline=True` trains the models in this process instead of a worker pool.
+    The models are ranked by a composite of their scores under `weights`
+    ({criterion: weight}, see `ranking.CRITERIA`) into `ranking.csv`.
+    `report` writes the scores and charts to `evaluation_report.docx`, and
+    `workbook=True` also every synthetic table to `synthetic_datasets.xlsx`
+    (off by default: Excel takes a while to write on big tables).
+    Stage timings go to `{job_dir}/timings.json`; `profile=True` also dumps a
+    cProfile file per stage to `{job_dir}/profiles/`.
+    """
+    job_id = job_id or new_job_id()
+    job_dir = os.path.join(output_dir, job_id)
+    os.makedirs(job_dir, exist_ok=True)
+    print(f"[INFO] Job {job_id}: {file_path}")
+    profiler = StageProfiler(job_dir, profile=profile)
+
+    with profiler.stage("load"):
+        df = load_dataset(file_path, job_dir=job_dir)
+    if sensitive:
+        with profiler.stage("sensitive", rows=len(df), columns=len(sensitive)):
+            protect_columns(df, sensitive, key=hash_key, job_dir=job_dir)
+    rows, columns = df.shape
+    with profiler.stage("metadata", rows=rows, columns=columns):
+        metadata = detect_metadata(df, sample_rows=10_000, job_dir=job_dir)
+    with open(f"{job_dir}/metadata.txt", "w") as f:
+        f.write(str(metadata.to_dict()))
+
+    if utility and target_col:
+        with profiler.stage("utility_baseline", rows=rows, columns=columns):
+            utility = UtilityScorer(df, metadata, target_col)
+        # The synthesizers (and every index built from the real data) only see the training rows
+        df = utility.train_data
+        rows = len(df)
+    else:
+        utility = None
+
+    evaluation = None
+    if evaluation_mode == "subsample":
+        with profiler.stage("evaluation_profile", rows=rows, columns=columns):
+            evaluation = EvaluationEngine(df, metadata, epsilon=0.02, confidence=0.95, stratify_by=target_col)
+    elif evaluation_mode != "full":
+        raise ValueError(f"Unknown evaluation mode '{evaluation_mode}', expected 'full' or 'subsample'")
+    if privacy:
+        with profiler.stage("privacy_index", rows=rows, columns=columns):
+            privacy = DCRScorer(df, metadata)
+    else:
+        privacy = None
+
+    if isinstance(models, str):
+        models = [name.strip() for name in models.split(",")]
+    unknown = sorted(set(models) - set(MODELS))
+    if unknown:
+        raise ValueError(f"Unknown models {unknown}, expected some of {sorted(MODELS)}")
+    model_specs = {name: MODELS[name] for name in models}
+    # The real data as the synthesizers train on it, shared by the selection and every model
+    frames = training_frames(df, metadata)
+    if selection_cpu_hours:
+        with profiler.stage("model_selection", rows=rows, columns=columns):
+            selection = successive_halving(df, metadata, cpu_hours=selection_cpu_hours, evaluation=evaluation,
+                                           job_dir=job_dir, frames=frames)
+        model_specs[f"Best_{selection.best_class.__name__.replace('Synthesizer', '')}"] = (selection.best_class, selection.best_kwargs)
+
+    cpus = cpus or os.cpu_count() or 1
+    max_workers = min(len(model_specs), cpus)
+    scheduler = EpochScheduler(max_epochs=max_epochs, patience=patience, budget_seconds=budget_seconds)
+    archive = ArtifactArchive(os.path.join(output_dir, f"{job_id}_results.zip"))
+    try:
+        summary = run_models(
+            model_specs, df, metadata, job_dir, max_workers=max_workers, torch_threads=max(1, cpus // max_workers),
+            cache=cache, num_rows=num_rows, sample_options=sample_options, evaluation=evaluation,
+            privacy=privacy, scheduler=scheduler, archive=archive, profiler=profiler, utility=utility,
+            inline=inline, frames=frames,
+        )
+        summary["input"] = file_path
+        with profiler.stage("ranking"):
+            ranking = rank_models(summary, job_dir, weights)
+        summary["recommended"] = None if ranking.empty else ranking["Model"].iloc[0]
+        summary.update(export_results(summary, job_dir, workbook=workbook, report=report, profiler=profiler,
+                                      ranking=ranking))
+    finally:
+        with profiler.stage("package"):
+            archive.add_directory(job_dir, exclude=(CHECKPOINT_DIR,))
+            zip_path = archive.close()
+
+    summary["zip"] = zip_path
+    if backend is not None:
+        with profiler.stage("upload"):
+            summary["url"] = upload(backend, zip_path)
+    # The zipped copy stops at training; this one adds the export, packaging and upload
+    profiler.write()
+    return summary
+
+
+# ============================
+# BATCH
+# ============================
+def find_inputs(paths):
+    """Expand files and directories (searched recursively) into the supported data files."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found += [os.path.join(root, name) for name in sorted(files)
+                          if os.path.splitext(name)[1].lower() in READERS]
+        else:
+            found.append(path)
+    return found
+
+
+# How the settings a manifest may hold are read from the text of a CSV cell
+MANIFEST_FLAGS = ("privacy", "utility", "workbook", "report", "profile", "inline")
+MANIFEST_NUMBERS = {"num_rows": int, "max_epochs": int, "patience": int, "cpus": int,
+                    "budget_seconds": float, "selection_cpu_hours": float}
+# Nested settings only a JSON manifest can express
+MANIFEST_OBJECTS = ("sample_options", "sensitive", "weights")
+FLAG_VALUES = {"true": True, "yes": True, "1": True, "false": False, "no": False, "0": False}
+
+
+def _manifest_value(key, value):
+    if not isinstance(value, str):
+        return value
+    if key in MANIFEST_FLAGS:
+        if value.strip().lower() not in FLAG_VALUES:
+            raise ValueError(f"Manifest setting {key} must be true or false, not '{value}'")
+        return FLAG_VALUES[value.strip().lower()]
+    if key in MANIFEST_NUMBERS:
+        try:
+            return MANIFEST_NUMBERS[key](value)
+        except ValueError:
+            raise ValueError(f"Manifest setting {key} must be a number, not '{value}'") from None
+    if key in MANIFEST_OBJECTS:
+        raise ValueError(f"Manifest setting {key} needs a JSON manifest")
+    return value
+
+
+def read_manifest(path):
+    """
+    Read a batch manifest: a CSV with a `path` column or a JSON list of objects
+    with a `path` key. Any other columns/keys (e.g. `job_id`, `target_col`,
+    `num_rows`, `privacy`) are `run_job` settings for that file; CSV cells are
+    read as the setting's type (true/false, yes/no or 1/0 for flags) and an
+    unknown column is an error. Relative paths are resolved against the
+    manifest's directory.
+    """
+    with open(path, newline="") as f:
+        if path.lower().endswith(".json"):
+            entries = json.load(f)
+        else:
+            entries = [{key: value for key, value in row.items() if value not in ("", None)} for row in csv.DictReader(f)]
+
+    # The output directory and the cache/backend objects are set for the whole batch
+    known = set(inspect.signature(run_job).parameters) - {"file_path", "output_dir", "cache", "backend"}
+    base = os.path.dirname(os.path.abspath(path))
+    for entry in entries:
+        if "path" not in entry:
+            raise ValueError(f"Manifest entry without a path: {entry}")
+        unknown = sorted(set(entry) - known - {"path"})
+        if unknown:
+            raise ValueError(f"Unknown manifest settings {unknown}, expected some of {sorted(known)}")
+        entry.update({key: _manifest_value(key, value) for key, value in entry.items() if key != "path"})
+        entry["path"] = os.path.join(base, entry["path"])
+    return entries
+
+
+def run_batch(entries, output_dir=".", max_jobs=1, **job_options):
+    """
+    Run `run_job` for every entry, at most `max_jobs` at a time.
+
+    Entries are file paths or dicts with a `path` plus per-file overrides of
+    `job_options`. The cores are split evenly between the concurrent jobs. A
+    failing job is recorded and the rest carry on. The batch summary is
+    written to `{output_dir}/batch_<timestamp>.json` and returned.
+    """
+    entries = [entry if isinstance(entry, dict) else {"path": entry} for entry in entries]
+    os.makedirs(output_dir, exist_ok=True)
+    max_jobs = max(1, min(max_jobs, len(entries)))
+    job_options.setdefault("cpus", max(1, (os.cpu_count() or 1) // max_jobs))
+
+    print(f"[INFO] Running {len(entries)} jobs, {max_jobs} at a time...")
+    started = time.perf_counter()
+    batch = {"jobs": [], "failed": []}
+
+    def run_entry(entry):
+        options = {**job_options, **entry}
+        path = options.pop("path")
+        options.setdefault("job_id", new_job_id())
+        try:
+            summary = run_job(path, output_dir, **options)
+            return {"input": path, "job_id": options["job_id"], "status": "completed",
+                    "failed_models": summary["failed"], "recommended": summary.get("recommended"),
+                    "zip": summary["zip"], "url": summary.get("url")}
+        except Exception as error:
+            return {"input": path, "job_id": options["job_id"], "status": "failed",
+                    "error": repr(error), "traceback": traceback.format_exc()}
+
+    with ThreadPoolExecutor(max_workers=max_jobs) as pool:
+        for future in as_completed([pool.submit(run_entry, entry) for entry in entries]):
+            result = future.result()
+            batch["jobs"].append(result)
+            if result["status"] == "completed":
+                print(f"[✔] Job {result['job_id']} ({result['input']}) finished")
+            else:
+                batch["failed"].append(result["input"])
+                print(f"[✘] Job {result['job_id']} ({result['input']}) failed: {result['error']}")
+
+    batch["seconds"] = time.perf_counter() - started
+    path = os.path.join(output_dir, f"batch_{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w") as f:
+        json.dump(batch, f, indent=2)
+    print(f"[INFO] Batch summary written to {path}")
+    return batch
@@ -0,0 +1,108 @@
+# Real-vs-synthetic column comparison plots
+# The real data's histogram bin edges and counts (and top-category shares)
+# are computed once with NumPy. Each synthetic table is then binned against
+# the same edges and drawn over the real data in a single grid image.
+
+import math
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from synthetic_lab.encoding import numeric_values
+
+BINS = 30
+MAX_CATEGORIES = 15
+MAX_COLUMNS = 48
+NS_PER_DAY = 86_400 * 10**9
+REAL_COLOR, SYNTHETIC_COLOR = "#4C72B0", "#FF9E00"
+
+
+class ComparisonPlotter:
+    """
+    Precomputed real-data distributions for every plottable column.
+
+    Numeric columns get `bins` shared bin edges; categorical columns (fewer
+    distinct values than half the rows) and numbers with at most
+    `max_categories` distinct values get their most common values. Datetime
+    columns are binned like numbers, on a date axis. Other text columns (IDs,
+    free text) are skipped, and so is every column after the first
+    `max_columns`, with a warning.
+    """
+
+    def __init__(self, real_data, bins=BINS, max_categories=MAX_CATEGORIES, max_columns=MAX_COLUMNS):
+        self.numeric, self.categorical, self.datetimes = {}, {}, set()
+        if real_data.shape[1] > max_columns:
+            print(f"[WARN] Comparison plots show the first {max_columns} of {real_data.shape[1]} columns; "
+                  f"not plotted: {', '.join(map(str, real_data.columns[max_columns:]))}")
+        for col in real_data.columns[:max_columns]:
+            values = real_data[col]
+            distinct = values.nunique(dropna=True)
+            if pd.api.types.is_datetime64_any_dtype(values):
+                self.datetimes.add(col)
+            if col in self.datetimes or (pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+                                         and distinct > max_categories):
+                present = self._numbers(values, col)
+                present = present[~np.isnan(present)]
+                if not len(present):
+                    continue
+                counts, edges = np.histogram(present, bins=bins)
+                self.numeric[col] = (edges, counts / counts.sum())
+            elif distinct <= len(values) / 2:
+                shares = values.astype(object).value_counts(normalize=True)
+                self.categorical[col] = shares.iloc[:max_categories]
+
+    @property
+    def columns(self):
+        return list(self.numeric) + list(self.categorical)
+
+    def _numbers(self, values, col):
+        numbers = numeric_values(values, is_datetime=col in self.datetimes)
+        # Datetimes as days since 1970-01-01, matplotlib's date numbers
+        return numbers / NS_PER_DAY if col in self.datetimes else numbers
+
+    def _synthetic_histogram(self, values, col, edges):
+        present = self._numbers(values, col)
+        present = present[~np.isnan(present)]
+        # Out-of-range values land in the outer bins instead of disappearing
+        counts, _ = np.histogram(np.clip(present, edges[0], edges[-1]), bins=edges)
+        return counts / max(counts.sum(), 1)
+
+    def plot(self, synthetic_data, model_name, path, dpi=80):
+        """Draw every column of `synthetic_data` over the real data into one image at `path`."""
+        columns = [col for col in self.columns if col in synthetic_data]
+        if not columns:
+            return None
+
+        ncols = min(4, len(columns))
+        nrows = math.ceil(len(columns) / ncols)
+        fig, axes = plt.subplots(nrows, ncols, figsize=(4 * ncols, 3 * nrows), squeeze=False)
+
+        for ax, col in zip(axes.flat, columns):
+            if col in self.numeric:
+                edges, real = self.numeric[col]
+                ax.stairs(real, edges, fill=True, alpha=0.5, color=REAL_COLOR, label="Real")
+                ax.stairs(self._synthetic_histogram(synthetic_data[col], col, edges), edges,
+                          linewidth=1.5, color=SYNTHETIC_COLOR, label="Synthetic")
+                if col in self.datetimes:
+                    ax.xaxis_date()
+                    ax.tick_params(axis="x", labelrotation=45, labelsize=7)
+            else:
+                real = self.categorical[col]
+                synthetic = synthetic_data[col].astype(object).value_counts(normalize=True).reindex(real.index, fill_value=0)
+                positions = np.arange(len(real))
+                ax.bar(positions - 0.2, real.to_numpy(), width=0.4, color=REAL_COLOR, alpha=0.7, label="Real")
+                ax.bar(positions + 0.2, synthetic.to_numpy(), width=0.4, color=SYNTHETIC_COLOR, label="Synthetic")
+                ax.set_xticks(positions, [str(value)[:12] for value in real.index], rotation=45, ha="right", fontsize=7)
+            ax.set_title(str(col), fontsize=10)
+
+        for ax in axes.flat[len(columns):]:
+            ax.set_visible(False)
+        axes.flat[0].legend(fontsize=8)
+        fig.suptitle(f"{model_name}: Real vs Synthetic Distributions", fontsize=14)
+        fig.tight_layout()
+        fig.savefig(path, dpi=dpi)
+        plt.close(fig)
+        return path
@@ -0,0 +1,93 @@
+# Per-stage timing report
+# Every stage of a job (loading, metadata, fitting, sampling, evaluation,
+# plotting, packaging) is timed for wall time, CPU time and memory. The
+# records end up in {job_dir}/timings.json and timings.csv; with profile=True
+# each stage also gets a cProfile dump under {job_dir}/profiles/.
+
+import cProfile
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; memory columns stay empty there
+    resource = None
+
+PROFILE_DIR = "profiles"
+# ru_maxrss is in bytes on macOS and in kilobytes everywhere else
+RSS_UNIT_BYTES = 1 if sys.platform == "darwin" else 1024
+COLUMNS = ["model", "stage", "started", "wall_seconds", "cpu_seconds", "peak_rss_mb", "rss_growth_mb",
+           "rows", "columns", "pid"]
+
+
+def peak_rss_mb():
+    """High-water mark of this process's resident memory in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT_BYTES / 2**20
+
+
+class StageProfiler:
+    """
+    Collects one record per timed stage.
+
+    The object is sent along to the worker processes; their records come back
+    in the model results and are merged with `extend`, so a single report
+    covers the whole job. `peak_rss_mb` is the process's memory high-water
+    mark after the stage and `rss_growth_mb` how much the stage raised it.
+    """
+
+    def __init__(self, job_dir=None, profile=False):
+        self.job_dir = job_dir
+        self.profile = profile
+        self.records = []
+
+    @contextmanager
+    def stage(self, stage, model=None, rows=None, columns=None):
+        """Time the block as `stage` (of `model`, if it belongs to one) on `rows` x `columns` data."""
+        profiler = cProfile.Profile() if self.profile else None
+        rss_before = peak_rss_mb()
+        started, wall, cpu = time.time(), time.perf_counter(), time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            rss_after = peak_rss_mb()
+            self.records.append({
+                "model": model,
+                "stage": stage,
+                "started": started,
+                "wall_seconds": time.perf_counter() - wall,
+                "cpu_seconds": time.process_time() - cpu,
+                "peak_rss_mb": rss_after,
+                "rss_growth_mb": None if rss_after is None else rss_after - rss_before,
+                "rows": rows,
+                "columns": columns,
+                "pid": os.getpid(),
+            })
+            if profiler and self.job_dir is not None:
+                os.makedirs(os.path.join(self.job_dir, PROFILE_DIR), exist_ok=True)
+                profiler.dump_stats(os.path.join(self.job_dir, PROFILE_DIR, f"{model or 'job'}_{stage}.prof"))
+
+    def extend(self, records):
+        self.records.extend(records)
+
+    def table(self):
+        return pd.DataFrame(self.records, columns=COLUMNS).sort_values("started", ignore_index=True)
+
+    def write(self, job_dir=None):
+        """Write `timings.json` and `timings.csv` to the job directory; returns the JSON path."""
+        job_dir = job_dir or self.job_dir
+        table = self.table()
+        path = os.path.join(job_dir, "timings.json")
+        table.to_json(path, orient="records", indent=2)
+        table.to_csv(os.path.join(job_dir, "timings.csv"), index=False)
+        return path
@@ -0,0 +1,239 @@
+# Composite model ranking
+# Every per-model metric table of a job (diagnostic and quality details,
+# privacy and utility scores) is gathered into one long, columnar frame and
+# cached as {job_dir}/metrics.parquet. The criteria are computed from it once;
+# ranking with a new set of weights is then a weighted average over a table
+# with one row per model, so changing the weights never re-runs an evaluation.
+#
+#   python -m synthetic_lab.ranking results/<job_id> --weights privacy=2,utility=1
+
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+METRICS_NAME = "metrics.parquet"
+METRIC_COLUMNS = ["model", "source", "property", "column", "metric", "score"]
+# Criterion -> label; all are scores where higher is better
+CRITERIA = {
+    "diagnostic": "Accuracy (Diagnostic)",
+    "quality": "Quality",
+    "privacy": "Privacy (DCR)",
+    "utility": "Utility (ML efficacy)",
+}
+DEFAULT_WEIGHTS = {"diagnostic": 1.0, "quality": 1.0, "privacy": 1.0, "utility": 1.0}
+
+
+# ============================
+# METRIC TABLES
+# ============================
+def details_frame(details, model, source):
+    """Metric rows (`METRIC_COLUMNS`) from an SDV report's details (Property, Column, Metric, Score)."""
+    return pd.DataFrame({
+        "model": model,
+        "source": source,
+        "property": details["Property"],
+        "column": details.get("Column"),
+        "metric": details["Metric"],
+        "score": details["Score"],
+    })
+
+
+def scores_frame(scores, model, source, value_col):
+    """Metric rows (`METRIC_COLUMNS`) from a Metric/`value_col` score table (privacy, utility)."""
+    return pd.DataFrame({
+        "model": model,
+        "source": source,
+        "property": None,
+        "column": None,
+        "metric": scores["Metric"],
+        "score": pd.to_numeric(scores[value_col], errors="coerce"),
+    })
+
+
+def compact_metrics(frames):
+    """Concatenate metric frames with categorical labels, the layout cached in metrics.parquet."""
+    metrics = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=METRIC_COLUMNS)
+    for col in ("model", "source", "property", "column", "metric"):
+        metrics[col] = metrics[col].astype("category")
+    metrics["score"] = metrics["score"].astype("float64")
+    return metrics[METRIC_COLUMNS]
+
+
+def collect_metrics(summary, job_dir):
+    """
+    One frame (`METRIC_COLUMNS`) holding every metric row of every completed
+    model in `summary`, read from the model's diagnostic, quality, privacy and
+    utility CSVs in `job_dir`.
+    """
+    frames = []
+    for model, result in summary["models"].items():
+        if result["status"] != "completed":
+            continue
+        files = {
+            "diagnostic": os.path.join(job_dir, f"{model}_diagnostic.csv"),
+            "quality": os.path.join(job_dir, f"{model}_quality.csv"),
+            "privacy": os.path.join(job_dir, f"{model}_privacy.csv"),
+            "utility": os.path.join(job_dir, f"{model}_utility.csv"),
+        }
+        for source in ("diagnostic", "quality"):
+            if os.path.exists(files[source]):
+                details = pd.read_csv(files[source], usecols=lambda col: col in ("Property", "Column", "Metric", "Score"))
+                frames.append(details_frame(details, model, source))
+        if os.path.exists(files["privacy"]):
+            frames.append(scores_frame(pd.read_csv(files["privacy"]), model, "privacy", "Value"))
+        if os.path.exists(files["utility"]):
+            frames.append(scores_frame(pd.read_csv(files["utility"]), model, "utility", "Ratio"))
+    return compact_metrics(frames)
+
+
+def criteria_table(metrics):
+    """
+    One row per model, one column per criterion, every value in [0, 1].
+
+    Diagnostic and quality are the mean of their property scores (how SDV
+    computes its overall scores); privacy is the DCR score and utility the
+    synthetic/real ratio of the primary ML metric, capped at 1 (synthetic data
+    doing better than real data isn't rewarded beyond parity).
+    """
+    columns = {}
+    for source in ("diagnostic", "quality"):
+        rows = metrics[metrics["source"] == source]
+        if len(rows):
+            by_property = rows.groupby(["model", "property"], observed=True)["score"].mean()
+            columns[source] = by_property.groupby(level="model", observed=True).mean()
+    for source, metric in (("privacy", "DCR Score"), ("utility", "Utility Score")):
+        rows = metrics[(metrics["source"] == source) & (metrics["metric"] == metric)]
+        if len(rows):
+            columns[source] = rows.groupby("model", observed=True)["score"].mean()
+
+    table = pd.DataFrame(columns).clip(0, 1)
+    table.index = table.index.astype(str)
+    table.index.name = "model"
+    return table
+
+
+# ============================
+# RANKING
+# ============================
+class ModelRanking:
+    """
+    Criterion scores of a job's models, ready to be ranked with any weights.
+
+    Build it with `from_job` (which reuses the cached `metrics.parquet`) or
+    from a metrics frame; `rank` only touches the small criteria table.
+    """
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.criteria = criteria_table(metrics)
+
+    @classmethod
+    def from_job(cls, job_dir, summary=None, refresh=False):
+        """
+        Load the job's metrics from `{job_dir}/metrics.parquet`, or collect
+        them from the score files of `summary` (read from job_summary.json if
+        not given) and cache them there. `refresh=True` always re-collects.
+        """
+        path = os.path.join(job_dir, METRICS_NAME)
+        if os.path.exists(path) and not refresh:
+            return cls(pd.read_parquet(path))
+        if summary is None:
+            with open(os.path.join(job_dir, "job_summary.json")) as f:
+                summary = json.load(f)
+        metrics = collect_metrics(summary, job_dir)
+        metrics.to_parquet(path, index=False)
+        return cls(metrics)
+
+    def rank(self, weights=None):
+        """
+        Models ordered by their weighted composite score, best first.
+
+        `weights` maps criteria (`CRITERIA`) to non-negative weights; missing
+        criteria get 0 and the weights are normalized to sum to 1. A criterion
+        no model has (e.g. utility without a target column) is left out; a
+        model missing a criterion the others have scores 0 on it.
+        """
+        weights = {**dict.fromkeys(CRITERIA, 0.0), **(DEFAULT_WEIGHTS if weights is None else weights)}
+        unknown = sorted(set(weights) - set(CRITERIA))
+        if unknown:
+            raise ValueError(f"Unknown criteria {unknown}, expected some of {list(CRITERIA)}")
+        if any(weight < 0 for weight in weights.values()):
+            raise ValueError("Weights must not be negative")
+        if self.criteria.empty:
+            ranking = pd.DataFrame(columns=["Rank", "Model", "Composite Score"])
+            ranking.attrs["weights"] = {}
+            return ranking
+
+        present = [criterion for criterion in CRITERIA if criterion in self.criteria and weights[criterion] > 0]
+        if not present:
+            raise ValueError("No weighted criterion has scores for this job")
+        total = sum(weights[criterion] for criterion in present)
+        normalized = pd.Series({criterion: weights[criterion] / total for criterion in present})
+
+        table = self.criteria[present].fillna(0)
+        ranking = table.rename(columns=CRITERIA)
+        ranking["Composite Score"] = table.to_numpy() @ normalized.to_numpy()
+        ranking = ranking.sort_values("Composite Score", ascending=False).reset_index().rename(columns={"model": "Model"})
+        ranking.insert(0, "Rank", range(1, len(ranking) + 1))
+        ranking.attrs["weights"] = normalized.to_dict()
+        return ranking
+
+    def recommend(self, weights=None):
+        """Name of the best model under `weights`."""
+        return self.rank(weights)["Model"].iloc[0]
+
+
+def describe_recommendation(ranking):
+    """One sentence naming the top model and its composite score."""
+    if ranking.empty:
+        return "No model completed, so there is nothing to recommend."
+    best = ranking.iloc[0]
+    weights = ", ".join(f"{CRITERIA[criterion]} {weight:.0%}" for criterion, weight in ranking.attrs["weights"].items())
+    return f"Recommended model: {best['Model']} (composite score {best['Composite Score']:.3f}; weights: {weights})."
+
+
+def rank_models(summary, job_dir, weights=None):
+    """
+    Ranking stage of a job: collect the metrics of the models in `summary`
+    (refreshing `metrics.parquet`), write the ranking to `{job_dir}/ranking.csv`
+    and return it.
+    """
+    ranking = ModelRanking.from_job(job_dir, summary, refresh=True).rank(weights)
+    ranking.to_csv(os.path.join(job_dir, "ranking.csv"), index=False)
+    print(f"[INFO] {describe_recommendation(ranking)}")
+    return ranking
+
+
+# ============================
+# COMMAND LINE
+# ============================
+def parse_weights(text):
+    """"privacy=2,utility=1" -> {"privacy": 2.0, "utility": 1.0}"""
+    weights = {}
+    for part in text.split(","):
+        if part:
+            criterion, _, weight = part.partition("=")
+            weights[criterion.strip()] = float(weight)
+    return weights
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m synthetic_lab.ranking",
+                                     description="Re-rank a finished job's models with new weights.")
+    parser.add_argument("job_dir")
+    parser.add_argument("--weights", type=parse_weights, default=DEFAULT_WEIGHTS,
+                        help=f"comma-separated CRITERION=WEIGHT, criteria: {', '.join(CRITERIA)}")
+    parser.add_argument("--refresh", action="store_true", help="re-read the score files instead of metrics.parquet")
+    args = parser.parse_args(argv)
+
+    ranking = ModelRanking.from_job(args.job_dir, refresh=args.refresh).rank(args.weights)
+    print(ranking.to_string(index=False))
+    print(describe_recommendation(ranking))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
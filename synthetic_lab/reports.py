@@ -0,0 +1,240 @@
+# Excel workbook and Word report
+# The synthetic tables are streamed from their files into one workbook (a tab
+# per model) with xlsxwriter's constant-memory mode, which flushes each row to
+# disk as soon as it is written. Tables longer than an Excel sheet continue on
+# "<model> (2)", "<model> (3)", ... The Word report is built from the job
+# summary and the small per-model score files, so no synthetic table is
+# loaded again to write it.
+
+import os
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pandas as pd
+import pyarrow.parquet as pq
+import xlsxwriter
+from docx import Document
+from docx.shared import Inches
+
+from synthetic_lab.profiling import StageProfiler
+from synthetic_lab.ranking import describe_recommendation
+
+# Rows per sheet, including the header row
+EXCEL_MAX_ROWS = 1_048_576
+SHEET_NAME_CHARS = 31
+READ_BATCH_SIZE = 50_000
+SCORES = {
+    "diagnostic_score": "Diagnostic",
+    "quality_score": "Quality",
+    "privacy_score": "Privacy (DCR)",
+    "utility_score": "Utility",
+}
+
+
+# ============================
+# EXCEL WORKBOOK
+# ============================
+def iter_table(path, batch_size=READ_BATCH_SIZE):
+    """Yield the rows of a synthetic CSV or Parquet file as DataFrames of at most `batch_size` rows."""
+    if path.endswith(".parquet"):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=batch_size)
+
+
+def _sheet_name(name, part, taken):
+    suffix = f" ({part})" if part > 1 else ""
+    # Excel forbids these characters in sheet names
+    base = "".join("_" if char in "[]:*?/\\" else char for char in str(name))
+    sheet = base[:SHEET_NAME_CHARS - len(suffix)] + suffix
+    counter = 2
+    while sheet.lower() in taken:
+        extra = f"~{counter}"
+        sheet = base[:SHEET_NAME_CHARS - len(suffix) - len(extra)] + extra + suffix
+        counter += 1
+    taken.add(sheet.lower())
+    return sheet
+
+
+def write_workbook(tables, path, max_rows=EXCEL_MAX_ROWS, batch_size=READ_BATCH_SIZE):
+    """
+    Write every table in `tables` ({name: path to a CSV/Parquet file}) to the
+    workbook at `path`, one sheet per table, in a single pass over each file.
+
+    A sheet holds at most `max_rows` rows (header included); the rest of the
+    table spills into continuation sheets, each with its own header row.
+    Returns {sheet name: rows of data on it}.
+    """
+    workbook = xlsxwriter.Workbook(path, {
+        "constant_memory": True,
+        # NaN/inf can't be stored as Excel numbers; write them as errors instead of failing
+        "nan_inf_to_errors": True,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",
+    })
+    header_format = workbook.add_format({"bold": True})
+    sheets, taken = {}, set()
+    try:
+        for name, table_path in tables.items():
+            worksheet, row, part = None, max_rows, 0
+            for batch in iter_table(table_path, batch_size):
+                values = batch.astype(object).where(batch.notna(), None)
+                for record in values.itertuples(index=False, name=None):
+                    if row == max_rows:
+                        part += 1
+                        sheet = _sheet_name(name, part, taken)
+                        worksheet = workbook.add_worksheet(sheet)
+                        worksheet.write_row(0, 0, [str(col) for col in batch.columns], header_format)
+                        worksheet.freeze_panes(1, 0)
+                        sheets[sheet] = 0
+                        row = 1
+                    worksheet.write_row(row, 0, record)
+                    row += 1
+                    sheets[sheet] += 1
+            if worksheet is None:
+                # An empty table still gets its tab
+                sheet = _sheet_name(name, 1, taken)
+                workbook.add_worksheet(sheet)
+                sheets[sheet] = 0
+            if part > 1:
+                print(f"[INFO] {name} continues over {part} sheets (Excel allows {max_rows:,} rows per sheet)")
+    finally:
+        workbook.close()
+    print(f"[INFO] Wrote {len(tables)} tables to {path}")
+    return sheets
+
+
+# ============================
+# WORD REPORT
+# ============================
+def score_chart(summary, path, dpi=100):
+    """One bar chart per score across the completed models, saved to `path` (None if there are none)."""
+    completed = {name: result for name, result in summary["models"].items() if result["status"] == "completed"}
+    scores = [key for key in SCORES if any(result.get(key) is not None for result in completed.values())]
+    if not scores:
+        return None
+
+    fig, axes = plt.subplots(1, len(scores), figsize=(3.5 * len(scores), 3.5), squeeze=False)
+    names = list(completed)
+    for ax, key in zip(axes.flat, scores):
+        values = [completed[name].get(key) or 0 for name in names]
+        ax.bar(range(len(names)), values, color="#4C72B0")
+        ax.set_xticks(range(len(names)), names, rotation=30, ha="right", fontsize=8)
+        ax.set_title(SCORES[key], fontsize=10)
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+    plt.close(fig)
+    return path
+
+
+def _add_table(document, df):
+    table = document.add_table(rows=1, cols=len(df.columns))
+    table.style = "Light Grid Accent 1"
+    for cell, col in zip(table.rows[0].cells, df.columns):
+        cell.text = str(col)
+    for record in df.itertuples(index=False, name=None):
+        for cell, value in zip(table.add_row().cells, record):
+            cell.text = "" if pd.isna(value) else f"{value:.3f}" if isinstance(value, float) else str(value)
+    return table
+
+
+def _model_files(result):
+    # Score files and the comparison plot, by kind, from the model's outputs
+    files = {}
+    for path in result.get("outputs", []):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        files[stem.rsplit("_", 1)[-1]] = path
+    return files
+
+
+def write_report(summary, job_dir, path, ranking=None):
+    """
+    Write the evaluation report for the job described by `summary` (as
+    returned by `run_models`) to the .docx file at `path`, opening with the
+    recommendation when a `ranking` (from `ModelRanking.rank`) is given.
+    """
+    document = Document()
+    document.add_heading("Synthetic Data Evaluation Report", level=0)
+    document.add_paragraph(f"Job {summary['job_id']}, generated {time.strftime('%Y-%m-%d %H:%M')}")
+    if summary.get("input"):
+        document.add_paragraph(f"Input: {os.path.basename(summary['input'])}")
+
+    if ranking is not None and not ranking.empty:
+        document.add_heading("Recommendation", level=1)
+        document.add_paragraph(describe_recommendation(ranking))
+        _add_table(document, ranking)
+
+    # Scores of every model side by side
+    document.add_heading("Summary", level=1)
+    rows = []
+    for name, result in summary["models"].items():
+        row = {"Model": name, "Status": result["status"]}
+        row.update({label: result.get(key) for key, label in SCORES.items()})
+        row["Epochs"] = result.get("epochs_run")
+        row["Seconds"] = result.get("seconds")
+        rows.append(row)
+    overview = pd.DataFrame(rows).astype({"Epochs": "Int64"}).dropna(axis=1, how="all")
+    _add_table(document, overview)
+    document.add_paragraph(
+        "Diagnostic: structural validity (ranges, categories, keys). Quality: how closely column "
+        "distributions and pairwise trends match. Privacy (DCR): distance from synthetic rows to the "
+        "closest real rows (higher is safer). Utility: how a model trained on the synthetic data "
+        "performs on held-out real rows, relative to one trained on real data."
+    )
+    chart = score_chart(summary, os.path.join(job_dir, "report_scores.png"))
+    if chart:
+        document.add_picture(chart, width=Inches(6.5))
+
+    # One section per model
+    for name, result in summary["models"].items():
+        document.add_heading(name, level=1)
+        if result["status"] != "completed":
+            document.add_paragraph(f"Failed: {result.get('error')}")
+            continue
+        files = _model_files(result)
+        if "quality" in files and os.path.exists(files["quality"]):
+            quality = pd.read_csv(files["quality"], usecols=["Property", "Score"])
+            document.add_heading("Quality by property", level=2)
+            _add_table(document, quality.groupby("Property", sort=False)["Score"].mean().reset_index())
+        if "privacy" in files and os.path.exists(files["privacy"]):
+            document.add_heading("Privacy", level=2)
+            _add_table(document, pd.read_csv(files["privacy"]))
+        if "utility" in files and os.path.exists(files["utility"]):
+            document.add_heading("Utility (train on synthetic, test on real)", level=2)
+            _add_table(document, pd.read_csv(files["utility"]))
+        if "sampling" in files and os.path.exists(files["sampling"]):
+            document.add_heading("Conditional sampling", level=2)
+            _add_table(document, pd.read_csv(files["sampling"]))
+        if "comparison" in files and os.path.exists(files["comparison"]):
+            document.add_picture(files["comparison"], width=Inches(6.5))
+
+    document.save(path)
+    print(f"[INFO] Wrote the evaluation report to {path}")
+    return path
+
+
+# ============================
+# STAGE
+# ============================
+def export_results(summary, job_dir, workbook=False, report=True, profiler=None, ranking=None):
+    """
+    Write `{job_dir}/evaluation_report.docx` for the completed models in
+    `summary` (the report leads with `ranking`, if given) and, with
+    `workbook=True`, `{job_dir}/synthetic_datasets.xlsx`; returns the paths
+    written.
+    """
+    profiler = profiler or StageProfiler(job_dir)
+    written = {}
+    if workbook:
+        tables = {name: result["outputs"][0] for name, result in summary["models"].items()
+                  if result["status"] == "completed" and result.get("outputs")}
+        written["workbook"] = os.path.join(job_dir, "synthetic_datasets.xlsx")
+        with profiler.stage("workbook"):
+            write_workbook(tables, written["workbook"])
+    if report:
+        written["report"] = os.path.join(job_dir, "evaluation_report.docx")
+        with profiler.stage("report"):
+            write_report(summary, job_dir, written["report"], ranking)
+    return written
@@ -0,0 +1,431 @@
+# Parallel job runner for the synthesizers
+# Every synthesizer is fitted in its own worker process, so one slow CTGAN fit
+# no longer holds back the result of a fast model like GaussianCopula.
+
+import json
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+from sdv.evaluation.single_table import evaluate_quality, run_diagnostic
+from sdv.metadata import Metadata, SingleTableMetadata
+
+from synthetic_lab.cache import cache_key, dataset_fingerprint
+from synthetic_lab.ingest import release_categoricals, training_frames
+from synthetic_lab.jobstore import JobStore
+from synthetic_lab.plots import ComparisonPlotter
+from synthetic_lab.profiling import StageProfiler
+from synthetic_lab.sampling import ConditionalSampler, sample_to_file
+from synthetic_lab.training import DEFAULT_MAX_EPOCHS, fit_with_schedule, synthesizer_kwargs
+
+
+# ============================
+# TRAIN + EVALUATE ONE MODEL
+# ============================
+def report_details(report):
+    """Stack the details of every property of an SDV report into one table."""
+    frames = []
+    for property_name in report.get_properties()["Property"]:
+        details = report.get_details(property_name=property_name).copy()
+        details.insert(0, "Property", property_name)
+        frames.append(details)
+    return pd.concat(frames, ignore_index=True)
+
+
+def evaluation_metadata(metadata):
+    """SDV's evaluators expect a `Metadata`; wrap a `SingleTableMetadata` into one."""
+    if isinstance(metadata, SingleTableMetadata):
+        return Metadata.load_from_dict({"tables": {"table": metadata.to_dict()}})
+    return metadata
+
+
+def fit_synthesizer(SynthesizerClass, kwargs, df, metadata, cache=None, data_fingerprint=None, scheduler=None,
+                    checkpoint_path=None, frames=None):
+    """
+    Fit a synthesizer, or load it from `cache` when the same fit was done before.
+    Epoch-based synthesizers are trained under `scheduler` when one is given,
+    saving epoch checkpoints to `checkpoint_path` if set. `frames` are the
+    job's `training_frames` of `df` (released here if not given).
+    Returns the synthesizer and a dict with `cached` plus the scheduler's report.
+    """
+    scheduled = scheduler is not None and "epochs" in kwargs
+    if cache is not None:
+        key_kwargs = {**kwargs, "schedule": scheduler.settings()} if scheduled else kwargs
+        key = cache_key(data_fingerprint or dataset_fingerprint(df), metadata, SynthesizerClass, key_kwargs)
+        synthesizer = cache.get(key, SynthesizerClass)
+        if synthesizer is not None:
+            return synthesizer, {"cached": True}
+
+    synthesizer = SynthesizerClass(metadata, **kwargs)
+    keep_categorical = "epochs" not in kwargs
+    if frames is not None:
+        data = frames[keep_categorical]
+    else:
+        data = release_categoricals(df, metadata, keep_categorical=keep_categorical)
+    training = {}
+    if scheduled:
+        training = fit_with_schedule(synthesizer, data, scheduler, checkpoint_path)
+    else:
+        synthesizer.fit(data)
+
+    if cache is not None:
+        cache.put(key, synthesizer)
+    return synthesizer, {"cached": False, **training}
+
+
+def train_and_evaluate_model(model_name, SynthesizerClass, df, metadata, job_dir, cache=None, data_fingerprint=None,
+                             num_rows=None, sample_options=None, evaluation=None, privacy=None, scheduler=None,
+                             model_kwargs=None, plotter=None, store=None, profiler=None, utility=None, frames=None):
+    """
+    Fit one synthesizer, stream `num_rows` synthetic rows (default: as many as the
+    real data) to `{job_dir}/{model_name}_synthetic.<output_format>` and evaluate
+    the first `len(df)` of them against the real data.
+
+    `sample_options` holds `output_format` ("csv" or "parquet") plus the
+    `batch_size` and `max_memory_bytes` knobs of `sample_to_file`, and
+    optionally the `conditions` (rows per category, which then set the row
+    count) and `constraints` of a `ConditionalSampler`; its acceptance rates
+    go to `{model_name}_sampling.csv`. Pass an
+    `EvaluationEngine` as `evaluation` to score on subsamples instead of
+    running SDV's full reports, a `DCRScorer` as `privacy` to add
+    `{model_name}_privacy.csv`, and an `EpochScheduler` as `scheduler` to
+    stop CTGAN/TVAE training early. `model_kwargs` are extra constructor
+    arguments for the synthesizer (e.g. the winner of a model selection).
+    A `UtilityScorer` as `utility` adds `{model_name}_utility.csv`
+    (train on synthetic, test on the held-out real rows).
+    `plotter` is the job's `ComparisonPlotter` (built from `df` if not given)
+    and `frames` its `training_frames` of `df`.
+    With a `JobStore` as `store`, every finished stage is recorded and
+    checkpointed, and stages that finished in an earlier run are skipped.
+    Each stage that runs is timed into `profiler` (a `StageProfiler`).
+    The returned scores list the files written under `outputs`.
+    """
+    def done(stage):
+        return store.completed(model_name, stage) if store is not None else None
+
+    profiler = profiler or StageProfiler(job_dir)
+    frames = frames or training_frames(df, metadata)
+    rows, columns = df.shape
+
+    def finish(stage, details):
+        if store is not None:
+            store.mark(model_name, stage, details=details)
+        return details
+
+    synthesizer_path = store.checkpoint_path(model_name, "synthesizer.pkl") if store is not None else None
+    fit_details = done("fit")
+    if fit_details is not None and os.path.exists(synthesizer_path):
+        print(f"\n[INFO] Loaded fitted {model_name} from the job checkpoint")
+        synthesizer = SynthesizerClass.load(synthesizer_path)
+    else:
+        print(f"\n[INFO] Training {model_name}...")
+        kwargs = synthesizer_kwargs(SynthesizerClass, epochs=scheduler.max_epochs if scheduler else DEFAULT_MAX_EPOCHS)
+        kwargs.update(model_kwargs or {})
+        epochs_path = store.checkpoint_path(model_name, "epochs.pt") if store is not None else None
+        with profiler.stage("fit", model_name, rows, columns):
+            synthesizer, fit_details = fit_synthesizer(SynthesizerClass, kwargs, df, metadata, cache, data_fingerprint,
+                                                       scheduler, epochs_path, frames)
+        if fit_details["cached"]:
+            print(f"[INFO] Loaded fitted {model_name} from cache")
+        if store is not None:
+            synthesizer.save(synthesizer_path)
+            if os.path.exists(epochs_path):
+                os.remove(epochs_path)
+        finish("fit", fit_details)
+
+    sample_options = dict(sample_options or {})
+    output_format = sample_options.pop("output_format", "csv")
+    conditions, constraints = sample_options.pop("conditions", None), sample_options.pop("constraints", None)
+    sampler = ConditionalSampler(conditions, constraints, real_data=df) if conditions or constraints else None
+    if sampler is not None and sampler.num_rows is not None:
+        num_rows = sampler.num_rows
+    outputs = [f"{job_dir}/{model_name}_synthetic.{output_format}"]
+    # The rows that get evaluated are kept as a checkpoint, so a resumed job scores the same table
+    kept_path = store.checkpoint_path(model_name, "evaluated_rows.pkl") if store is not None else None
+    sample_details = done("sample")
+    if sample_details is not None and os.path.exists(outputs[0]) and os.path.exists(kept_path):
+        synthetic = pd.read_pickle(kept_path)
+    else:
+        with profiler.stage("sample", model_name, num_rows or len(df), columns):
+            synthetic = sample_to_file(
+                synthesizer,
+                num_rows or len(df),
+                outputs[0],
+                keep_rows=len(df),
+                sampler=sampler,
+                **sample_options,
+            )
+        sample_details = {"path": outputs[0], "rows": num_rows or len(df)}
+        if sampler is not None:
+            report = sampler.report()
+            report.to_csv(f"{job_dir}/{model_name}_sampling.csv", index=False)
+            # Rare or impossible targets may have been given up on
+            sample_details["rows"] = int(report["Accepted"].iloc[-1])
+            sample_details["acceptance_rate"] = sampler.acceptance_rate()
+        if synthetic is None or synthetic.empty:
+            raise RuntimeError(f"{model_name} produced no rows that meet the sampling conditions and constraints "
+                               f"(see {model_name}_sampling.csv)")
+        if store is not None:
+            synthetic.to_pickle(kept_path)
+        sample_details = finish("sample", sample_details)
+    if sampler is not None:
+        outputs.append(f"{job_dir}/{model_name}_sampling.csv")
+
+    diagnostic_path, quality_path = f"{job_dir}/{model_name}_diagnostic.csv", f"{job_dir}/{model_name}_quality.csv"
+    outputs += [diagnostic_path, quality_path]
+    scores = done("evaluate")
+    if scores is None:
+        print("[INFO] Running diagnostics and evaluation...")
+        eval_rows = evaluation.num_rows if evaluation is not None else len(synthetic)
+        if evaluation is None:
+            # SDV's TableStructure compares dtypes, and text comes back from the ctgan-based
+            # synthesizers as object: compare it as plain values on both sides, not as category
+            real_eval = frames[False]
+            synthetic_eval = release_categoricals(synthetic, metadata, keep_categorical=False)
+        with profiler.stage("diagnostic", model_name, eval_rows, columns):
+            if evaluation is not None:
+                diagnostic = evaluation.diagnostic(synthetic)
+            else:
+                diagnostic = run_diagnostic(real_data=real_eval, synthetic_data=synthetic_eval,
+                                            metadata=evaluation_metadata(metadata))
+        with profiler.stage("quality", model_name, eval_rows, columns):
+            if evaluation is not None:
+                quality = evaluation.quality(synthetic)
+            else:
+                quality = evaluate_quality(real_data=real_eval, synthetic_data=synthetic_eval,
+                                           metadata=evaluation_metadata(metadata))
+
+        # Save outputs
+        report_details(diagnostic).to_csv(diagnostic_path)
+        report_details(quality).to_csv(quality_path)
+        scores = finish("evaluate", {"diagnostic_score": diagnostic.get_score(), "quality_score": quality.get_score()})
+
+    if privacy is not None:
+        outputs.append(f"{job_dir}/{model_name}_privacy.csv")
+        privacy_scores = done("privacy")
+        if privacy_scores is None:
+            print("[INFO] Scoring privacy (DCR)...")
+            with profiler.stage("privacy", model_name, len(synthetic), columns):
+                dcr = privacy.score(synthetic)
+            dcr.to_csv(outputs[-1], index=False)
+            # No DCR Score without a holdout (tiny tables)
+            privacy_scores = finish("privacy", {"privacy_score": dict(zip(dcr["Metric"], dcr["Value"])).get("DCR Score")})
+        scores = {**scores, **privacy_scores}
+
+    if utility is not None:
+        outputs.append(f"{job_dir}/{model_name}_utility.csv")
+        utility_scores = done("utility")
+        if utility_scores is None:
+            print("[INFO] Scoring utility (train on synthetic, test on real)...")
+            with profiler.stage("utility", model_name, len(synthetic), columns):
+                efficacy = utility.score(synthetic)
+            efficacy.to_csv(outputs[-1], index=False)
+            utility_score = efficacy["Ratio"].iloc[-1]
+            utility_scores = finish("utility", {"utility_score": None if pd.isna(utility_score) else utility_score})
+        scores = {**scores, **utility_scores}
+
+    # Real vs synthetic distribution of every column, drawn against the real data's precomputed bins
+    plot = done("plot")
+    if plot is None:
+        with profiler.stage("plot", model_name, len(synthetic), columns):
+            plotter = plotter or ComparisonPlotter(df)
+            path = plotter.plot(synthetic, model_name, f"{job_dir}/{model_name}_comparison.png")
+        plot = finish("plot", {"path": path})
+    if plot["path"]:
+        outputs.append(plot["path"])
+
+    return {
+        **fit_details,
+        "diagnostic_score": scores["diagnostic_score"],
+        "quality_score": scores["quality_score"],
+        "privacy_score": scores.get("privacy_score"),
+        "utility_score": scores.get("utility_score"),
+        "acceptance_rate": sample_details.get("acceptance_rate"),
+        "outputs": outputs,
+    }
+
+
+# ============================
+# WORKER POOL
+# ============================
+# Job-wide arguments of a pool worker, set once by `_init_worker`
+_WORKER_STATE = {}
+
+
+def _init_worker(torch_threads, state=None):
+    """
+    Cap the threads each worker may use so the workers don't oversubscribe the
+    cores, and keep the job-wide `state` (real data and its training frames,
+    scorers, plotter, store, profiler) that every model of the job shares. It is pickled once per worker
+    process rather than once per model.
+    """
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(torch_threads)
+
+    import torch
+    torch.set_num_threads(torch_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Already set once in this process
+        pass
+    _WORKER_STATE.clear()
+    _WORKER_STATE.update(state or {})
+
+
+def _run_model(model_name, SynthesizerClass, model_kwargs, df, metadata, job_dir, cache, data_fingerprint, num_rows,
+               sample_options, evaluation, privacy, scheduler, plotter, store, profiler, utility=None, frames=None):
+    """
+    Worker entry point: never raises, so one failure can't take the pool down.
+    The model is recorded as running in the job store before it starts, so a
+    worker that dies mid-fit leaves that record behind. The stage timings
+    recorded here travel back under `timings`.
+    """
+    store.mark(model_name, "model", status="running")
+    started = time.perf_counter()
+    first_record = len(profiler.records)
+    try:
+        scores = train_and_evaluate_model(
+            model_name, SynthesizerClass, df, metadata, job_dir, cache, data_fingerprint, num_rows, sample_options,
+            evaluation, privacy, scheduler, model_kwargs, plotter, store, profiler, utility, frames,
+        )
+        result = {"status": "completed", "seconds": time.perf_counter() - started, **scores}
+    except Exception as error:
+        result = {
+            "status": "failed",
+            "seconds": time.perf_counter() - started,
+            "error": repr(error),
+            "traceback": traceback.format_exc(),
+        }
+    result["timings"] = profiler.records[first_record:]
+    return result
+
+
+def _run_pooled_model(model_name, SynthesizerClass, model_kwargs):
+    """`_run_model` with the job-wide arguments the pool initializer left in this worker."""
+    return _run_model(model_name, SynthesizerClass, model_kwargs, **_WORKER_STATE)
+
+
+def run_models(models, df, metadata, job_dir, max_workers=None, torch_threads=None, mp_context="spawn", cache=None,
+               num_rows=None, sample_options=None, evaluation=None, privacy=None, scheduler=None, archive=None,
+               resume=True, profiler=None, utility=None, inline=False, frames=None):
+    """
+    Fit and evaluate every synthesizer in `models` in parallel. Values are a
+    SynthesizerClass or a (SynthesizerClass, constructor arguments) tuple.
+
+    `max_workers` defaults to one worker per model (bounded by the CPU count) and
+    `torch_threads` to an even share of the cores per worker. Pass a `ModelCache`
+    as `cache` to reuse earlier fits. `num_rows`, `sample_options`, `evaluation`,
+    `privacy`, `utility` and `scheduler` are passed on to `train_and_evaluate_model`. With an
+    `ArtifactArchive` as `archive`, each model's files are compressed into the
+    results zip as soon as that model finishes. `frames` are the job's
+    `training_frames` of `df`, when the caller already built them.
+
+    Progress is recorded in the job's `JobStore`: running the same `job_dir`
+    again skips the models that completed and resumes the others at their last
+    finished stage (or epoch checkpoint). `resume=False` starts over.
+    `inline=True` skips the pool and runs the models one after another in
+    this process, for callers that already are a worker with SDV and torch
+    loaded.
+
+    Stage timings from every worker are collected in `profiler` (a new
+    `StageProfiler` if not given) and written to `{job_dir}/timings.json` and
+    `timings.csv`. Returns the job summary, which is also written to
+    `{job_dir}/job_summary.json` after every model that finishes (and added
+    to the archive at the end).
+    """
+    # Hash, release and bin the real data once here rather than once per model
+    data_fingerprint = dataset_fingerprint(df) if cache is not None else None
+    frames = frames or training_frames(df, metadata)
+    plotter = ComparisonPlotter(df)
+    store = JobStore(job_dir)
+    profiler = profiler or StageProfiler(job_dir)
+    if not resume:
+        store.reset()
+
+    cpus = os.cpu_count() or 1
+    max_workers = max_workers or min(len(models), cpus)
+    torch_threads = torch_threads or max(1, cpus // max_workers)
+
+    if inline:
+        print(f"[INFO] Training {len(models)} models in this process...")
+    else:
+        print(f"[INFO] Training {len(models)} models on {max_workers} workers ({torch_threads} threads each)...")
+    started = time.perf_counter()
+    summary = {"job_id": os.path.basename(os.path.normpath(job_dir)), "models": {}}
+
+    def write_summary():
+        summary["seconds"] = time.perf_counter() - started
+        summary["failed"] = sorted(name for name, result in summary["models"].items() if result["status"] == "failed")
+        with open(os.path.join(job_dir, "job_summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+
+    def record(name, result):
+        summary["models"][name] = result
+        write_summary()
+        if result["status"] == "completed":
+            print(f"[✔] {name} finished in {result['seconds']:.1f}s")
+            if archive is not None:
+                for path in result["outputs"]:
+                    archive.add(path, os.path.join(summary["job_id"], os.path.basename(path)))
+        else:
+            print(f"[✘] {name} failed: {result['error']}")
+
+    pending = {}
+    for name, spec in models.items():
+        finished = store.completed(name, "model")
+        if finished is not None:
+            print(f"[INFO] {name} already completed in an earlier run of this job")
+            record(name, {**finished, "resumed": True})
+        else:
+            pending[name] = spec
+
+    def collect(name, result):
+        store.mark(name, "model", status=result["status"], details=result)
+        record(name, result)
+
+    state = {
+        "df": df, "metadata": metadata, "job_dir": job_dir, "cache": cache,
+        "data_fingerprint": data_fingerprint, "num_rows": num_rows, "sample_options": sample_options,
+        "evaluation": evaluation, "privacy": privacy, "scheduler": scheduler, "plotter": plotter, "store": store,
+        "profiler": profiler, "utility": utility, "frames": frames,
+    }
+    if inline:
+        # Already in a worker with the libraries loaded: run here, one model at a time
+        for name, spec in pending.items():
+            SynthesizerClass, model_kwargs = spec if isinstance(spec, tuple) else (spec, {})
+            result = _run_model(name, SynthesizerClass, model_kwargs, **state)
+            # The stages were timed straight into `profiler`
+            result.pop("timings")
+            collect(name, result)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context(mp_context),
+            initializer=_init_worker,
+            initargs=(torch_threads, state),
+        ) as pool:
+            futures = {}
+            for name, spec in pending.items():
+                SynthesizerClass, model_kwargs = spec if isinstance(spec, tuple) else (spec, {})
+                futures[pool.submit(_run_pooled_model, name, SynthesizerClass, model_kwargs)] = name
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as error:
+                    # The worker process itself died (e.g. killed for running out of memory)
+                    result = {"status": "failed", "error": repr(error)}
+                profiler.extend(result.pop("timings", []))
+                collect(name, result)
+
+    write_summary()
+    profiler.write(job_dir)
+    if archive is not None:
+        for name in ("job_summary.json", "timings.json", "timings.csv"):
+            archive.add(os.path.join(job_dir, name), os.path.join(summary["job_id"], name))
+
+    return summary
@@ -0,0 +1,356 @@
+# Streaming, chunked sampling
+# Draws synthetic rows in fixed-size batches and writes each batch straight to
+# a Parquet or CSV file, so the output can be far larger than memory.
+# `ConditionalSampler` adds row targets per category and allowed values, drawn
+# with the synthesizer's conditional sampling, plus ranges on any column.
+
+import itertools
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DEFAULT_BATCH_SIZE = 50_000
+
+# Sampling a batch briefly needs a few times the memory of the finished rows
+# (the model's raw output plus the reverse-transformed frame)
+SAMPLING_OVERHEAD = 4
+
+
+def iter_samples(synthesizer, num_rows, batch_size=DEFAULT_BATCH_SIZE, max_memory_bytes=None):
+    """
+    Yield `num_rows` synthetic rows as DataFrames of at most `batch_size` rows.
+
+    With `max_memory_bytes`, the first batch is used to measure the size of a
+    row and later batches are shrunk so one batch stays under the ceiling.
+    """
+    remaining = num_rows
+    if max_memory_bytes is not None:
+        # Probe with a small batch before committing to a batch size
+        probe = synthesizer.sample(num_rows=min(batch_size, remaining, 1_000))
+        remaining -= len(probe)
+        row_bytes = max(1, probe.memory_usage(index=False, deep=True).sum() / max(1, len(probe)))
+        batch_size = max(1, min(batch_size, int(max_memory_bytes // (row_bytes * SAMPLING_OVERHEAD))))
+        yield probe
+
+    while remaining > 0:
+        batch = synthesizer.sample(num_rows=min(batch_size, remaining))
+        if batch.empty:
+            raise RuntimeError(f"Synthesizer returned no rows with {remaining} still to sample")
+        remaining -= len(batch)
+        yield batch
+
+
+# ============================
+# CONDITIONAL SAMPLING
+# ============================
+# SDV re-samples a batch up to this many times to find rows matching the condition
+# (models that can't condition their generator, like TVAE, rely on this); a low cap
+# bounds the cost of one batch, and the next batch is sized by what came back
+MAX_TRIES_PER_BATCH = 10
+# Batches in a row that add no accepted rows before a target is abandoned
+MAX_STALLED_BATCHES = 5
+# ...and a target is also abandoned once this many times its rows were requested
+MAX_OVERSAMPLING = 20
+# Floor of the acceptance estimate, so one bad batch can't ask for a huge next one
+MIN_ACCEPTANCE = 0.01
+
+
+class ConditionalSampler:
+    """
+    Synthetic rows with fixed counts per category and values within constraints.
+
+    `conditions` maps a column to {value: rows}, e.g. {"default": {1: 5000,
+    0: 5000}}. `constraints` maps a column to a list of allowed values or a
+    (low, high) range (either side None).
+
+    Conditions and allowed values are drawn with the synthesizer's
+    conditional sampling (CTGAN/CopulaGAN condition their generator on them,
+    GaussianCopula its distribution), not by oversampling and filtering: a
+    list of allowed values becomes one condition per value (per combination,
+    with several lists), and each target's rows are split between them in
+    the proportions the real data has. Ranges are enforced by rejection:
+    rows outside them are dropped and more are drawn. Each target is sampled
+    in batches sized by its acceptance rate so far, round-robin across
+    targets, and gets at most `max_oversampling` times its rows from the
+    synthesizer, which bounds the cost of a rare or impossible target.
+    `report()` lists the rows requested and accepted per target. Pass
+    `real_data` to cast the condition and constraint values to the columns'
+    types and to split rows like the real data (evenly without it).
+    """
+
+    def __init__(self, conditions=None, constraints=None, real_data=None,
+                 max_tries_per_batch=MAX_TRIES_PER_BATCH, max_stalled_batches=MAX_STALLED_BATCHES,
+                 max_oversampling=MAX_OVERSAMPLING):
+        constraints = {col: self._typed_constraint(real_data, col, rule) for col, rule in (constraints or {}).items()}
+        self.ranges = {col: rule for col, rule in constraints.items() if isinstance(rule, tuple)}
+        self.allowed = {col: rule for col, rule in constraints.items() if not isinstance(rule, tuple)}
+        self.conditional = bool(conditions)
+        self.max_tries_per_batch = max_tries_per_batch
+        self.max_stalled_batches = max_stalled_batches
+        self.max_oversampling = max_oversampling
+        self.stats = []
+
+        # Counts of every combination of the conditioned and allowed columns' values in the real data
+        columns = list(dict.fromkeys([*(conditions or {}), *self.allowed]))
+        self._real_counts = None
+        if self.allowed and real_data is not None and set(columns) <= set(real_data.columns):
+            self._real_counts = real_data[columns].value_counts(dropna=True).reset_index(name="rows")
+        self.targets = [
+            split
+            for col, counts in (conditions or {}).items() for value, rows in counts.items()
+            for split in self._split({"values": {col: self._typed(real_data, col, value)}, "rows": int(rows)})
+        ]
+
+    @property
+    def num_rows(self):
+        """Rows the conditions ask for in total, or None without conditions."""
+        return sum(target["rows"] for target in self.targets) if self.conditional else None
+
+    @staticmethod
+    def _typed(real_data, col, value):
+        if real_data is None or value is None or col not in real_data.columns:
+            return value
+        values = real_data[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Match the category by its text, e.g. "1" from the command line against a category 1
+            categories = values.cat.categories
+            return next((category for category in categories if str(category) == str(value)), value)
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return pd.Timestamp(value)
+        if pd.api.types.is_bool_dtype(values) and isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "yes")
+        if pd.api.types.is_numeric_dtype(values):
+            number = float(value)
+            return int(number) if pd.api.types.is_integer_dtype(values) and number.is_integer() else number
+        return value
+
+    def _typed_constraint(self, real_data, col, rule):
+        if isinstance(rule, tuple):
+            low, high = rule
+            return tuple(self._typed(real_data, col, bound) for bound in (low, high))
+        return [self._typed(real_data, col, value) for value in rule]
+
+    def _split(self, target):
+        """`target` as one target per combination of the allowed values its condition leaves open."""
+        if any(col in self.allowed and value not in self.allowed[col] for col, value in target["values"].items()):
+            print(f"[WARN] Skipping {self._label(target)}: outside the allowed values")
+            return []
+        free = [col for col in self.allowed if col not in target["values"]]
+        if not free:
+            return [target]
+
+        combinations = list(itertools.product(*(self.allowed[col] for col in free)))
+        weights = np.ones(len(combinations))
+        if self._real_counts is not None:
+            real = self._real_counts
+            for col, value in target["values"].items():
+                real = real[real[col] == value]
+            counts = real.groupby(free, observed=True)["rows"].sum()
+            shares = np.array([counts.get(combination if len(free) > 1 else combination[0], 0)
+                               for combination in combinations], dtype=float)
+            if shares.sum() > 0:
+                weights = shares
+
+        # Largest remainders, so the split adds up to exactly the target's rows
+        exact = target["rows"] * weights / weights.sum()
+        rows = np.floor(exact).astype(int)
+        rows[np.argsort(rows - exact, kind="stable")[:target["rows"] - rows.sum()]] += 1
+        return [{"values": {**target["values"], **dict(zip(free, combination))}, "rows": int(count)}
+                for combination, count in zip(combinations, rows) if count > 0]
+
+    def accepts(self, batch):
+        """Boolean mask of the rows of `batch` that meet every constraint."""
+        mask = np.ones(len(batch), dtype=bool)
+        for col, (low, high) in self.ranges.items():
+            values = batch[col]
+            if low is not None:
+                mask &= (values >= low).to_numpy(dtype=bool, na_value=False)
+            if high is not None:
+                mask &= (values <= high).to_numpy(dtype=bool, na_value=False)
+        for col, allowed in self.allowed.items():
+            mask &= batch[col].isin(allowed).to_numpy(dtype=bool)
+        return mask
+
+    def _draw(self, synthesizer, target, rows):
+        from sdv.sampling import Condition
+
+        if not target["values"]:
+            return synthesizer.sample(num_rows=rows)
+        condition = Condition(num_rows=rows, column_values=target["values"])
+        try:
+            return synthesizer.sample_from_conditions([condition], max_tries_per_batch=self.max_tries_per_batch,
+                                                      batch_size=rows)
+        except ValueError:
+            # SDV found no row for the condition within its tries
+            return None
+
+    def iter_batches(self, synthesizer, num_rows=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Yield accepted rows until every target is met. Without conditions, the
+        target is `num_rows` rows, split across the allowed values if any.
+        """
+        targets = self.targets if self.conditional else self._split({"values": {}, "rows": num_rows})
+        self.stats = [{**target, "requested": 0, "generated": 0, "accepted": 0, "stalled": 0} for target in targets]
+
+        active = [stats for stats in self.stats if stats["rows"] > 0]
+        while active:
+            for stats in list(active):
+                remaining = stats["rows"] - stats["accepted"]
+                budget = stats["rows"] * self.max_oversampling - stats["requested"]
+                # Expected acceptance from the batches so far (1 before the first one)
+                acceptance = stats["accepted"] / stats["requested"] if stats["requested"] else 1.0
+                request = min(batch_size, budget, math.ceil(remaining / max(acceptance, MIN_ACCEPTANCE)))
+                batch = self._draw(synthesizer, stats, request)
+                stats["requested"] += request
+                generated = 0 if batch is None else len(batch)
+                stats["generated"] += generated
+                accepted = batch[self.accepts(batch)].iloc[:remaining] if generated else None
+
+                stats["stalled"] = 0 if accepted is not None and len(accepted) else stats["stalled"] + 1
+                if accepted is not None and len(accepted):
+                    stats["accepted"] += len(accepted)
+                    yield accepted.reset_index(drop=True)
+
+                if stats["accepted"] >= stats["rows"]:
+                    active.remove(stats)
+                elif stats["stalled"] >= self.max_stalled_batches or stats["requested"] >= stats["rows"] * self.max_oversampling:
+                    print(f"[WARN] Gave up on {self._label(stats)} after {stats['accepted']:,} of {stats['rows']:,} rows "
+                          f"({stats['requested']:,} requested)")
+                    active.remove(stats)
+
+        for stats in self.stats:
+            print(f"[INFO] {self._label(stats)}: {stats['accepted']:,} of {stats['rows']:,} rows, "
+                  f"acceptance {self._acceptance(stats):.1%}")
+
+    @staticmethod
+    def _label(target):
+        if not target["values"]:
+            return "Unconditional rows"
+        return ", ".join(f"{col} = {value}" for col, value in target["values"].items())
+
+    @staticmethod
+    def _acceptance(stats):
+        return stats["accepted"] / stats["requested"] if stats["requested"] else 0.0
+
+    def report(self):
+        """Rows targeted, requested from the synthesizer and accepted, per target, plus a total row."""
+        rows = [{"Condition": self._label(stats), "Target": stats["rows"], "Requested": stats["requested"],
+                 "Generated": stats["generated"], "Accepted": stats["accepted"],
+                 "Acceptance": self._acceptance(stats)} for stats in self.stats]
+        requested = sum(stats["requested"] for stats in self.stats)
+        accepted = sum(stats["accepted"] for stats in self.stats)
+        rows.append({"Condition": "Total", "Target": sum(stats["rows"] for stats in self.stats),
+                     "Requested": requested, "Generated": sum(stats["generated"] for stats in self.stats),
+                     "Accepted": accepted, "Acceptance": accepted / requested if requested else 0.0})
+        return pd.DataFrame(rows)
+
+    def acceptance_rate(self):
+        """Accepted rows over rows requested from the synthesizer, across every target."""
+        return self.report()["Acceptance"].iloc[-1]
+
+
+def parse_conditions(texts):
+    """["default=1:5000", "default=0:5000"] -> {"default": {"1": 5000, "0": 5000}}"""
+    conditions = {}
+    for text in texts:
+        column, _, target = text.partition("=")
+        value, _, rows = target.rpartition(":")
+        if not column or not rows:
+            raise ValueError(f"Expected COLUMN=VALUE:ROWS, got '{text}'")
+        conditions.setdefault(column.strip(), {})[value] = int(rows)
+    return conditions
+
+
+def parse_constraints(texts):
+    """["age=18..65", "income=..90000", "state=CA,NY"] -> {"age": ("18", "65"), "income": (None, "90000"), "state": ["CA", "NY"]}"""
+    constraints = {}
+    for text in texts:
+        column, _, rule = text.partition("=")
+        if not column or not rule:
+            raise ValueError(f"Expected COLUMN=LOW..HIGH or COLUMN=VALUE,VALUE,..., got '{text}'")
+        if ".." in rule:
+            low, _, high = rule.partition("..")
+            constraints[column.strip()] = (low or None, high or None)
+        else:
+            constraints[column.strip()] = rule.split(",")
+    return constraints
+
+
+# ============================
+# FILE SINKS
+# ============================
+class CSVSink:
+    """Appends batches to one CSV file, writing the header once."""
+
+    def __init__(self, path):
+        self.path = path
+        self._header = True
+
+    def write(self, batch):
+        batch.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+        self._header = False
+
+    def close(self):
+        pass
+
+
+class ParquetSink:
+    """Appends batches as row groups of one Parquet file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._writer = None
+
+    def write(self, batch):
+        if self._writer is None:
+            table = pa.Table.from_pandas(batch, preserve_index=False)
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            # Cast to the first batch's schema, e.g. when a batch has an all-null column
+            table = pa.Table.from_pandas(batch, schema=self._writer.schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+SINKS = {".csv": CSVSink, ".parquet": ParquetSink}
+
+
+def sample_to_file(synthesizer, num_rows, path, batch_size=DEFAULT_BATCH_SIZE, max_memory_bytes=None, keep_rows=0,
+                   sampler=None):
+    """
+    Sample `num_rows` rows into a CSV or Parquet file (chosen by the extension of `path`).
+
+    Only one batch is held in memory at a time. The first `keep_rows` rows are
+    also returned as a DataFrame (e.g. for evaluation), otherwise None. With a
+    `ConditionalSampler` as `sampler`, its conditions and constraints decide
+    the rows instead (`max_memory_bytes` is then not used).
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"Unsupported output format '{extension}', expected one of {sorted(SINKS)}")
+
+    sink = SINKS[extension](path)
+    kept, kept_count, written = [], 0, 0
+    try:
+        if sampler is not None:
+            batches = sampler.iter_batches(synthesizer, num_rows, batch_size)
+        else:
+            batches = iter_samples(synthesizer, num_rows, batch_size, max_memory_bytes)
+        for batch in batches:
+            sink.write(batch)
+            written += len(batch)
+            if kept_count < keep_rows:
+                kept.append(batch.iloc[:keep_rows - kept_count])
+                kept_count += len(kept[-1])
+    finally:
+        sink.close()
+
+    print(f"[INFO] Wrote {written:,} synthetic rows to {path}")
+    return pd.concat(kept, ignore_index=True) if kept else None
@@ -0,0 +1,126 @@
+# Successive-halving model selection
+# Starts many synthesizer configurations on small row and epoch budgets,
+# scores them with the fast subsampled quality score, keeps the best 1/eta of
+# them and gives the survivors eta times more rows and epochs, until one is
+# left or the CPU budget runs out.
+
+import time
+
+import pandas as pd
+from sdv.single_table import CopulaGANSynthesizer, CTGANSynthesizer, GaussianCopulaSynthesizer, TVAESynthesizer
+
+from synthetic_lab.evaluation import EvaluationEngine, stratified_sample
+from synthetic_lab.ingest import training_frames
+from synthetic_lab.training import synthesizer_kwargs
+
+
+def default_search_space():
+    """(name, SynthesizerClass, constructor arguments) for every candidate configuration."""
+    space = []
+    for distribution in ("norm", "beta", "truncnorm"):
+        space.append((f"GaussianCopula[{distribution}]", GaussianCopulaSynthesizer, {"default_distribution": distribution}))
+    for dims in ((256, 256), (128, 128)):
+        for batch_size in (500, 200):
+            kwargs = {"generator_dim": dims, "discriminator_dim": dims, "batch_size": batch_size}
+            space.append((f"CTGAN[{dims[0]}x2,b{batch_size}]", CTGANSynthesizer, kwargs))
+    for dims in ((128, 128), (64, 64)):
+        for l2scale in (1e-5, 1e-4):
+            kwargs = {"compress_dims": dims, "decompress_dims": dims, "l2scale": l2scale}
+            space.append((f"TVAE[{dims[0]}x2,l2={l2scale:g}]", TVAESynthesizer, kwargs))
+    for dims in ((256, 256), (128, 128)):
+        kwargs = {"generator_dim": dims, "discriminator_dim": dims}
+        space.append((f"CopulaGAN[{dims[0]}x2]", CopulaGANSynthesizer, kwargs))
+    return space
+
+
+class SelectionResult:
+    """Outcome of `successive_halving`: the winning configuration and the full leaderboard."""
+
+    def __init__(self, best_name, best_class, best_kwargs, best_synthesizer, leaderboard):
+        self.best_name = best_name
+        self.best_class = best_class
+        self.best_kwargs = best_kwargs
+        self.best_synthesizer = best_synthesizer
+        self.leaderboard = leaderboard
+
+
+def successive_halving(df, metadata, search_space=None, cpu_hours=1.0, eta=3, min_rows=1_000, min_epochs=10,
+                       max_epochs=300, evaluation=None, job_dir=None, seed=0, frames=None):
+    """
+    Pick the best synthesizer configuration within `cpu_hours` of CPU time.
+
+    Rung r trains every surviving configuration on `min_rows * eta**r` rows for
+    `min_epochs * eta**r` epochs (capped at the data size and `max_epochs`) and
+    keeps the top 1/eta by quality score. A configuration is skipped when its
+    estimated cost no longer fits in the remaining budget: its own cost on the
+    previous rung times eta**2, or on rung 0 the cost of the last configuration
+    of the same class (of any class for the first one of its class), so the
+    very first fit is the probe that always runs. The leaderboard is
+    written to `{job_dir}/model_selection.csv` when `job_dir` is given.
+    `frames` are the job's `training_frames` of `df`, when already built.
+    """
+    search_space = search_space or default_search_space()
+    evaluation = evaluation or EvaluationEngine(df, metadata, seed=seed)
+    budget = cpu_hours * 3600
+    spent = 0.0
+    # Shared by every candidate, so in the form the ctgan-based ones accept too
+    data = (frames or training_frames(df, metadata))[False]
+
+    survivors = list(search_space)
+    last_cost, class_cost, fitted, records = {}, {}, {}, []
+    rung = 0
+    while survivors:
+        rows = min(len(df), min_rows * eta**rung)
+        epochs = min(max_epochs, min_epochs * eta**rung)
+        sample = stratified_sample(data, rows, seed=seed + rung)
+        print(f"[INFO] Rung {rung}: {len(survivors)} configurations on {rows:,} rows / {epochs} epochs")
+
+        scored = []
+        for name, SynthesizerClass, kwargs in survivors:
+            # Cost grows with rows x epochs; estimate this rung from the previous one
+            if name in last_cost:
+                estimate = last_cost[name] * eta**2
+            else:
+                # Rung 0: the configurations fitted before this one are the probes
+                estimate = class_cost.get(SynthesizerClass, max(class_cost.values(), default=0.0))
+            if spent + estimate > budget:
+                print(f"[INFO] Skipping {name}: estimated {estimate:,.0f} CPU-s left {budget - spent:,.0f}")
+                continue
+
+            started = time.process_time()
+            try:
+                synthesizer = SynthesizerClass(metadata, **{**synthesizer_kwargs(SynthesizerClass, epochs, verbose=False), **kwargs})
+                synthesizer.fit(sample)
+                score = evaluation.quality(synthesizer.sample(num_rows=min(len(df), evaluation.num_rows))).get_score()
+            except Exception as error:
+                print(f"[WARN] {name} failed: {error!r}")
+                score = float("nan")
+            cost = time.process_time() - started
+            spent += cost
+            last_cost[name] = class_cost[SynthesizerClass] = cost
+
+            records.append({"Configuration": name, "Rung": rung, "Rows": rows, "Epochs": epochs,
+                            "Quality": score, "CPU Seconds": cost})
+            if score == score:
+                scored.append((score, name, SynthesizerClass, kwargs))
+                fitted[name] = synthesizer
+
+        if not scored:
+            break
+        scored.sort(key=lambda item: item[0], reverse=True)
+        leader = scored[0]
+        # The last rung is the one with a single survivor, or the one that already used all rows and epochs
+        if len(scored) == 1 or (rows == len(df) and epochs == max_epochs):
+            break
+        survivors = [(name, cls, kwargs) for _, name, cls, kwargs in scored[:max(1, len(scored) // eta)]]
+        rung += 1
+
+    leaderboard = pd.DataFrame(records).sort_values(["Rung", "Quality"], ascending=[False, False], ignore_index=True)
+    if job_dir is not None:
+        leaderboard.to_csv(f"{job_dir}/model_selection.csv", index=False)
+
+    if not records or leaderboard["Quality"].isna().all():
+        raise RuntimeError("No synthesizer configuration could be trained within the budget")
+    _, best_name, best_class, best_kwargs = leader
+    print(f"[✔] Best configuration: {best_name} ({spent / 3600:.2f} of {cpu_hours} CPU-hours used)")
+    return SelectionResult(best_name, best_class, best_kwargs, fitted[best_name], leaderboard)
@@ -0,0 +1,160 @@
+# Sensitive-column handling
+# Runs before metadata detection and fitting, so private values never reach
+# the synthesizers. Each listed column is removed, scrambled (a seeded
+# permutation that breaks its link to the other columns), replaced by a keyed
+# hash, or replaced by a format-preserving token. Columns are changed one at
+# a time in place; the rest of the frame is never copied. A job without a
+# hash key gets a random one, saved with its checkpoints so a resumed job
+# hashes the same way.
+
+import hashlib
+import hmac
+import os
+import string
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from synthetic_lab.jobstore import CHECKPOINT_DIR
+
+ACTIONS = ("remove", "scramble", "hash", "tokenize")
+HASH_CHARS = 16
+KEY_FILE = "sensitive.key"
+
+
+def _rng(seed, column):
+    # Seeded per column name, so a column scrambles the same way whatever its position
+    return np.random.default_rng([seed, zlib.crc32(str(column).encode())])
+
+
+def scramble(df, column, seed=0):
+    """Shuffle one column in place with a seeded permutation (O(n), categoricals shuffle their codes)."""
+    permutation = _rng(seed, column).permutation(len(df))
+    df[column] = df[column].array.take(permutation)
+
+
+# ============================
+# KEYED TOKENS
+# ============================
+def _digest(key, *parts):
+    message = "\x00".join(str(part) for part in parts).encode()
+    return hmac.new(key, message, hashlib.sha256).digest()
+
+
+def job_key(job_dir):
+    """
+    The random key of the job in `job_dir`, created on its first run. It is
+    kept in the checkpoint directory, which never goes into the results zip.
+    """
+    path = os.path.join(job_dir, CHECKPOINT_DIR, KEY_FILE)
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    key = os.urandom(32)
+    # Readable by the owner only, and never half-written
+    fd = os.open(f"{path}.tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    os.replace(f"{path}.tmp", path)
+    return key
+
+
+def hash_value(key, value, counter=0):
+    """Keyed SHA-256 of `value`, as the first `HASH_CHARS` hex characters."""
+    return _digest(key, value, counter).hex()[:HASH_CHARS]
+
+
+def token_value(key, value, counter=0):
+    """
+    Keyed token with the same shape as `value`: every digit becomes a digit,
+    every letter a letter of the same case, and everything else (dashes,
+    dots, @) stays where it is. "AB-1234" might become "QF-8071".
+    """
+    text = str(value)
+    stream = b""
+    block = 0
+    while len(stream) < len(text):
+        stream += _digest(key, text, counter, block)
+        block += 1
+
+    out = []
+    for char, byte in zip(text, stream):
+        if char.isdigit():
+            out.append(string.digits[byte % 10])
+        elif char in string.ascii_lowercase:
+            out.append(string.ascii_lowercase[byte % 26])
+        elif char in string.ascii_uppercase:
+            out.append(string.ascii_uppercase[byte % 26])
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def replace_values(df, column, key, make=hash_value):
+    """
+    Replace every value of `column` with `make(key, value)`, in place.
+
+    Only the distinct values are transformed: the column is factorized once
+    and the replacements are taken back through the codes, so the cost is
+    O(n) plus one keyed hash per distinct value. Missing values stay missing,
+    and equal inputs always map to equal outputs for the same key. The rare
+    collision between two different inputs is resolved by re-deriving one of
+    them, so the column keeps its number of distinct values (and ID columns
+    stay unique).
+    """
+    values = df[column]
+    codes, uniques = pd.factorize(values)
+    replacements, seen = [], set()
+    for value in uniques:
+        counter = 0
+        token = make(key, value)
+        while token in seen:
+            counter += 1
+            token = make(key, value, counter)
+        seen.add(token)
+        replacements.append(token)
+
+    replaced = pd.Categorical.from_codes(codes, categories=replacements)
+    df[column] = replaced if isinstance(values.dtype, pd.CategoricalDtype) else replaced.astype(object)
+
+
+# ============================
+# STAGE
+# ============================
+def protect_columns(df, actions, seed=0, key=None, job_dir=None):
+    """
+    Apply `actions` ({column: "remove" | "scramble" | "hash" | "tokenize"}) to
+    `df` in place and return it.
+
+    `key` (str or bytes) makes hashes and tokens reproducible across jobs;
+    without one a random key is used, so the same ID gets a different token
+    in every job. With a `job_dir` that random key is saved there (see
+    `job_key`) and reused when the job is resumed. `seed` fixes the scramble
+    permutations.
+    """
+    unknown = {column: action for column, action in actions.items() if action not in ACTIONS}
+    if unknown:
+        raise ValueError(f"Unknown actions {unknown}, expected one of {ACTIONS}")
+    missing = sorted(set(actions) - set(df.columns))
+    if missing:
+        raise ValueError(f"Sensitive columns not in the data: {missing}")
+
+    if isinstance(key, str):
+        key = key.encode()
+    elif key is None:
+        key = job_key(job_dir) if job_dir is not None else os.urandom(32)
+    for column, action in actions.items():
+        if action == "remove":
+            df.drop(columns=column, inplace=True)
+        elif action == "scramble":
+            scramble(df, column, seed)
+        elif action == "hash":
+            replace_values(df, column, key, hash_value)
+        else:
+            replace_values(df, column, key, token_value)
+        print(f"[INFO] Sensitive column '{column}': {action}")
+    return df
@@ -0,0 +1,140 @@
+# Resumable artifact upload
+# Results are uploaded in fixed-size chunks to a pluggable storage backend.
+# Progress is saved next to the local file after every chunk, so a dropped
+# connection or a restarted job picks the upload up where it stopped.
+
+import json
+import os
+
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def _state_path(local_path):
+    return f"{local_path}.upload.json"
+
+
+def _source_id(local_path):
+    # An upload only resumes if the local file is unchanged
+    stat = os.stat(local_path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def _load_state(local_path):
+    try:
+        with open(_state_path(local_path)) as f:
+            state = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return state if state.get("source") == _source_id(local_path) else {}
+
+
+def _save_state(local_path, state):
+    state["source"] = _source_id(local_path)
+    with open(_state_path(local_path), "w") as f:
+        json.dump(state, f)
+
+
+class StorageBackend:
+    """
+    Interface of a resumable upload target.
+
+    `upload_chunks` uploads `local_path` as `remote_name`, starting from the
+    saved `state` (empty for a new upload). It calls `save_state(state)` after
+    every chunk and returns a link to the finished file.
+    """
+
+    def upload_chunks(self, local_path, remote_name, state, save_state, chunk_size):
+        raise NotImplementedError
+
+
+class LocalDirectoryBackend(StorageBackend):
+    """Copies files into a local directory, e.g. for offline use or a mounted network share."""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def upload_chunks(self, local_path, remote_name, state, save_state, chunk_size):
+        target = os.path.join(self.root, remote_name)
+        partial = f"{target}.part"
+        # Trust only the bytes that were both written and recorded as done
+        offset = state.get("offset", 0) if os.path.exists(partial) else 0
+        offset = min(offset, os.path.getsize(partial)) if offset else 0
+
+        with open(local_path, "rb") as source, open(partial, "r+b" if offset else "wb") as dest:
+            source.seek(offset)
+            dest.seek(offset)
+            dest.truncate()
+            for chunk in iter(lambda: source.read(chunk_size), b""):
+                dest.write(chunk)
+                dest.flush()
+                os.fsync(dest.fileno())
+                offset += len(chunk)
+                save_state({"offset": offset})
+
+        os.replace(partial, target)
+        return f"file://{os.path.abspath(target)}"
+
+
+class GoogleDriveBackend(StorageBackend):
+    """
+    Uploads to Google Drive with the Drive v3 resumable upload protocol.
+
+    Uploaded files keep Drive's default sharing (only the owner can open the
+    link). The zips hold synthetic data and models fitted on the real data,
+    so `share_with_anyone=True` is an explicit opt-in to make them readable by
+    anyone with the link.
+    """
+
+    def __init__(self, service, folder_id=None, share_with_anyone=False):
+        self.service = service
+        self.folder_id = folder_id
+        self.share_with_anyone = share_with_anyone
+
+    @classmethod
+    def from_colab(cls, folder_id=None, share_with_anyone=False):
+        """Authenticate as the Colab user and build the Drive client."""
+        from google.colab import auth
+        from googleapiclient.discovery import build
+
+        auth.authenticate_user()
+        return cls(build("drive", "v3"), folder_id, share_with_anyone)
+
+    def upload_chunks(self, local_path, remote_name, state, save_state, chunk_size):
+        from googleapiclient.http import MediaFileUpload
+
+        body = {"name": remote_name}
+        if self.folder_id:
+            body["parents"] = [self.folder_id]
+        media = MediaFileUpload(local_path, chunksize=chunk_size, resumable=True)
+        request = self.service.files().create(body=body, media_body=media, fields="id")
+        if state.get("resumable_uri"):
+            # Continue the session Drive already has; it reports the true offset on the next chunk
+            request.resumable_uri = state["resumable_uri"]
+            request.resumable_progress = state.get("offset", 0)
+
+        response = None
+        while response is None:
+            status, response = request.next_chunk(num_retries=5)
+            save_state({"resumable_uri": request.resumable_uri, "offset": request.resumable_progress})
+            if status:
+                print(f"[INFO] Uploaded {status.progress():.0%}")
+
+        file_id = response["id"]
+        if self.share_with_anyone:
+            self.service.permissions().create(fileId=file_id, body={"type": "anyone", "role": "reader"}).execute()
+        return f"https://drive.google.com/uc?id={file_id}"
+
+
+def upload(backend, local_path, remote_name=None, chunk_size=UPLOAD_CHUNK_SIZE):
+    """Upload `local_path` through `backend`, resuming a previous attempt if there is one."""
+    remote_name = remote_name or os.path.basename(local_path)
+    state = _load_state(local_path)
+    if state:
+        print(f"[INFO] Resuming upload of {remote_name} at {state.get('offset', 0):,} bytes")
+
+    url = backend.upload_chunks(local_path, remote_name, state, lambda s: _save_state(local_path, s), chunk_size)
+
+    if os.path.exists(_state_path(local_path)):
+        os.remove(_state_path(local_path))
+    return url
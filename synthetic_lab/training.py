@@ -0,0 +1,208 @@
+# Early-stopping and epoch-budget scheduler for the neural synthesizers
+# CTGAN, TVAE and CopulaGAN train for a fixed number of epochs. The scheduler
+# takes over their epoch loop: after every epoch it looks at the loss the
+# model has logged so far, and ends training once the loss has plateaued or
+# the next epoch would overrun the model's wall-clock budget. It can also
+# checkpoint the networks and optimizers every few epochs, so an interrupted
+# fit continues from its last checkpoint instead of epoch 0.
+
+import inspect
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import ctgan.synthesizers.ctgan as ctgan_module
+import ctgan.synthesizers.tvae as tvae_module
+import torch
+from tqdm import tqdm
+
+DEFAULT_MAX_EPOCHS = 300
+CHECKPOINT_EVERY = 10
+
+# `attach` swaps the tqdm bar of the ctgan modules for every fit in the
+# process, so scheduled fits on different threads (inline jobs of a batch)
+# take turns instead of running each other's epoch loops.
+_PATCH_LOCK = threading.Lock()
+
+
+def synthesizer_kwargs(SynthesizerClass, epochs=DEFAULT_MAX_EPOCHS, verbose=True):
+    """Constructor arguments for `SynthesizerClass`: epochs/verbose only if it trains in epochs."""
+    if "epochs" in inspect.signature(SynthesizerClass.__init__).parameters:
+        return {"epochs": epochs, "verbose": verbose}
+    return {}
+
+
+def training_state(model, fit_locals):
+    """The networks and optimizers of a running ctgan fit, by name (model attributes and fit locals)."""
+    candidates = {**vars(model), **fit_locals}
+    return {name: value for name, value in candidates.items()
+            if isinstance(value, (torch.nn.Module, torch.optim.Optimizer))}
+
+
+def save_checkpoint(path, model, state, epoch):
+    checkpoint = {
+        "epoch": epoch,
+        "state": {name: value.state_dict() for name, value in state.items()},
+        "loss_values": model.loss_values,
+    }
+    torch.save(checkpoint, f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
+
+
+def _fits(checkpoint_state, state):
+    if set(checkpoint_state) != set(state):
+        return False
+    for name, value in state.items():
+        if isinstance(value, torch.nn.Module):
+            current = value.state_dict()
+            saved = checkpoint_state[name]
+            if set(saved) != set(current) or any(saved[key].shape != current[key].shape for key in current):
+                return False
+    return True
+
+
+def load_checkpoint(path, model, state):
+    """Restore `state` and the loss log from `path`; returns the epoch to continue from (0 if it doesn't fit)."""
+    checkpoint = torch.load(path, weights_only=False)
+    # Only restore into networks of the same shape, i.e. the same data and settings
+    if not _fits(checkpoint["state"], state):
+        print(f"[WARN] Checkpoint {path} doesn't match this model, training from scratch")
+        return 0
+    for name, value in state.items():
+        value.load_state_dict(checkpoint["state"][name])
+    model.loss_values = checkpoint["loss_values"]
+    print(f"[INFO] Resuming training from the checkpoint at epoch {checkpoint['epoch']}")
+    return checkpoint["epoch"]
+
+
+class EpochScheduler:
+    """
+    Stops a CTGAN/TVAE/CopulaGAN fit early.
+
+    - `max_epochs`: upper bound, passed to the synthesizer as `epochs`
+    - `patience` / `min_delta`: stop once the loss (a rolling mean over `window`
+      epochs) has moved by less than `min_delta` (relative) in `patience` epochs
+    - `budget_seconds`: stop before an epoch that would end past the budget
+    - `min_epochs`: never stop before this many epochs
+    - `checkpoint_every`: epochs between checkpoints, when `attach` is given a
+      checkpoint path
+
+    The monitored loss is the generator loss for CTGAN/CopulaGAN and the
+    reconstruction loss for TVAE. After the fit, `report` holds the epoch
+    training stopped at and why.
+    """
+
+    def __init__(self, max_epochs=DEFAULT_MAX_EPOCHS, patience=20, min_delta=0.01, window=5,
+                 budget_seconds=None, min_epochs=10, checkpoint_every=CHECKPOINT_EVERY):
+        self.max_epochs = max_epochs
+        self.patience = patience
+        self.min_delta = min_delta
+        self.window = window
+        self.budget_seconds = budget_seconds
+        self.min_epochs = min_epochs
+        self.checkpoint_every = checkpoint_every
+        self.report = None
+        self._first_epoch = 0
+
+    def settings(self):
+        """The parameters that change what gets trained (part of the model cache key)."""
+        return {
+            "max_epochs": self.max_epochs,
+            "patience": self.patience,
+            "min_delta": self.min_delta,
+            "window": self.window,
+            "budget_seconds": self.budget_seconds,
+            "min_epochs": self.min_epochs,
+        }
+
+    def _epoch_losses(self, model):
+        losses = getattr(model, "loss_values", None)
+        if losses is None or losses.empty:
+            return None
+        column = "Generator Loss" if "Generator Loss" in losses else "Loss"
+        return losses.groupby("Epoch")[column].mean()
+
+    def _plateaued(self, model):
+        losses = self._epoch_losses(model)
+        if losses is None or len(losses) < self.window + self.patience:
+            return False
+        smoothed = losses.rolling(self.window).mean()
+        before, now = smoothed.iloc[-1 - self.patience], smoothed.iloc[-1]
+        return abs(now - before) <= self.min_delta * max(abs(before), 1e-8)
+
+    def should_stop(self, model, epoch):
+        """Called before epoch `epoch` (0-based) starts. Returns the reason to stop, or None."""
+        if epoch < self.min_epochs:
+            return None
+        epochs_this_run = epoch - self._first_epoch
+        if self.budget_seconds is not None and epochs_this_run > 0:
+            elapsed = time.perf_counter() - self._started
+            if elapsed + elapsed / epochs_this_run > self.budget_seconds:
+                return "budget"
+        if self._plateaued(model):
+            return "plateau"
+        return None
+
+    @contextmanager
+    def attach(self, synthesizer, checkpoint_path=None):
+        """
+        Run the epoch loops of `synthesizer.fit` under this scheduler. With a
+        `checkpoint_path`, training state is saved there every
+        `checkpoint_every` epochs and a fit finding a checkpoint resumes from it.
+        Only one scheduled fit per process trains at a time; others wait here.
+        """
+        scheduler = self
+        self._first_epoch = 0
+        self.report = {"epochs_run": 0, "max_epochs": self.max_epochs, "stopped_because": "max_epochs"}
+
+        class EpochIterator:
+            # Stands in for the tqdm progress bar the ctgan loops iterate over
+            def __init__(self, iterable, disable=False, **kwargs):
+                self._bar = tqdm(iterable, disable=disable, **kwargs)
+
+            def set_description(self, *args, **kwargs):
+                self._bar.set_description(*args, **kwargs)
+
+            def __iter__(self):
+                model = synthesizer._model
+                # The frame of the ctgan fit loop iterating over this bar, whose
+                # locals hold the networks and optimizers that aren't attributes
+                state = training_state(model, sys._getframe(1).f_locals) if checkpoint_path else {}
+                if checkpoint_path and os.path.exists(checkpoint_path):
+                    scheduler._first_epoch = load_checkpoint(checkpoint_path, model, state)
+                    scheduler.report["resumed_from"] = scheduler._first_epoch
+                    scheduler.report["epochs_run"] = scheduler._first_epoch
+                try:
+                    for epoch in self._bar:
+                        if epoch < scheduler._first_epoch:
+                            continue
+                        reason = scheduler.should_stop(model, epoch)
+                        if reason is not None:
+                            scheduler.report["stopped_because"] = reason
+                            break
+                        yield epoch
+                        scheduler.report["epochs_run"] = epoch + 1
+                        if checkpoint_path and (epoch + 1) % scheduler.checkpoint_every == 0:
+                            save_checkpoint(checkpoint_path, model, state, epoch + 1)
+                finally:
+                    self._bar.close()
+
+        with _PATCH_LOCK:
+            self._started = time.perf_counter()
+            originals = ctgan_module.tqdm, tvae_module.tqdm
+            ctgan_module.tqdm = tvae_module.tqdm = EpochIterator
+            try:
+                yield self
+            finally:
+                ctgan_module.tqdm, tvae_module.tqdm = originals
+                self.report["seconds"] = time.perf_counter() - self._started
+
+
+def fit_with_schedule(synthesizer, data, scheduler, checkpoint_path=None):
+    """Fit `synthesizer` under `scheduler` (checkpointing to `checkpoint_path`) and return the scheduler's report."""
+    with scheduler.attach(synthesizer, checkpoint_path):
+        synthesizer.fit(data)
+    print(f"[INFO] Training stopped after {scheduler.report['epochs_run']} epochs ({scheduler.report['stopped_because']})")
+    return scheduler.report
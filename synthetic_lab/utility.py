@@ -0,0 +1,167 @@
+# Machine-learning efficacy (train on synthetic, test on real)
+# A real test split is held out once per job. Each synthetic table trains a
+# gradient-boosted model (XGBoost, histogram trees) that is scored on that
+# real test split, next to the same model trained on the real training rows.
+# The feature encoding and the encoded test set are built once and shared by
+# every model.
+
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, f1_score, mean_absolute_error, r2_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+from xgboost import XGBClassifier, XGBRegressor
+
+from synthetic_lab.encoding import CATEGORICAL_SDTYPES, NUMERIC_SDTYPES, numeric_values
+
+# Numeric targets with at most this many distinct values are treated as classes
+MAX_CLASSES = 20
+XGB_PARAMS = {"n_estimators": 200, "max_depth": 6, "learning_rate": 0.1, "tree_method": "hist"}
+
+
+class UtilityScorer:
+    """
+    Train-on-synthetic / test-on-real scorer for one prediction target.
+
+    Classification when the target is categorical/boolean (or has at most
+    `MAX_CLASSES` values), regression otherwise. `train_data` holds the real
+    rows outside the test split; fit the synthesizers on it so the test rows
+    stay unseen. `n_jobs` is the XGBoost thread count (default: the worker's
+    thread cap, else every core).
+    """
+
+    def __init__(self, real_data, metadata, target_col, test_size=0.2, max_test_rows=50_000, n_jobs=None, seed=0):
+        self.target_col = target_col
+        self.seed = seed
+        self.n_jobs = n_jobs
+        columns = metadata.to_dict()["columns"]
+        target = real_data[target_col]
+        sdtype = columns.get(target_col, {}).get("sdtype")
+        self.classification = sdtype in CATEGORICAL_SDTYPES or target.nunique(dropna=True) <= MAX_CLASSES
+
+        # Hold out the test rows once (stratified for classification)
+        labelled = np.flatnonzero(target.notna().to_numpy())
+        test_rows = min(int(len(labelled) * test_size), max_test_rows)
+        stratify = target.iloc[labelled].astype(str) if self.classification else None
+        try:
+            train, test = train_test_split(labelled, test_size=test_rows, random_state=seed, stratify=stratify)
+        except ValueError:
+            # A class with a single row can't be stratified
+            train, test = train_test_split(labelled, test_size=test_rows, random_state=seed)
+        train_mask = np.ones(len(real_data), dtype=bool)
+        train_mask[test] = False
+        self.train_data = real_data.iloc[np.flatnonzero(train_mask)].reset_index(drop=True)
+        # Categories only the test rows have would reach the synthesizers as values they
+        # never see while fitting (GaussianCopula fails on them with a KeyError)
+        for col in self.train_data.select_dtypes("category").columns:
+            self.train_data[col] = self.train_data[col].cat.remove_unused_categories()
+        real_train = real_data.iloc[np.sort(train)]
+        real_test = real_data.iloc[np.sort(test)]
+
+        # Feature encoding learned from the real training rows
+        self.numeric, self.categories, self.datetime_formats = [], {}, {}
+        for col, spec in columns.items():
+            if col == target_col or col not in real_data.columns:
+                continue
+            if spec["sdtype"] in NUMERIC_SDTYPES:
+                self.numeric.append(col)
+                self.datetime_formats[col] = spec.get("datetime_format") if spec["sdtype"] == "datetime" else None
+            elif spec["sdtype"] in CATEGORICAL_SDTYPES:
+                self.categories[col] = pd.Index(real_train[col].dropna().astype(object).unique())
+        if self.classification:
+            self.classes = pd.Index(np.sort(self._labels(real_train[target_col]).dropna().unique()))
+
+        self.test_features, self.test_target = self.encode(real_test)
+        print(f"[INFO] Utility test: {'classifying' if self.classification else 'predicting'} '{target_col}' "
+              f"on {len(real_test):,} held-out real rows")
+        self.baseline = self._fit_and_score(*self.encode(real_train))
+
+    def __getstate__(self):
+        # Workers only need the encoded test rows; the training rows reach them with the job's data
+        return {**self.__dict__, "train_data": None}
+
+    def _numeric(self, values, col):
+        return numeric_values(values, self.datetime_formats.get(col))
+
+    def encode(self, df):
+        """Features (float32, NaN for missing/unseen) and target (class index or float) of `df`."""
+        features = np.empty((len(df), len(self.numeric) + len(self.categories)), dtype=np.float32)
+        for position, col in enumerate(self.numeric):
+            features[:, position] = self._numeric(df[col], col)
+        for position, (col, categories) in enumerate(self.categories.items(), start=len(self.numeric)):
+            codes = categories.get_indexer(df[col].astype(object)).astype(np.float32)
+            codes[codes < 0] = np.nan
+            features[:, position] = codes
+
+        if self.classification:
+            target = self.classes.get_indexer(self._labels(df[self.target_col]))
+        else:
+            target = self._numeric(df[self.target_col], self.target_col)
+        # Rows whose target is missing or a class the real data doesn't have can't be used
+        keep = target >= 0 if self.classification else ~np.isnan(target)
+        return features[keep], target[keep]
+
+    @staticmethod
+    def _labels(values):
+        # Numeric labels match by value (1 == 1.0); anything else by its text
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            return values
+        return values.astype(str).where(values.notna())
+
+    def _threads(self):
+        return self.n_jobs or int(os.environ.get("OMP_NUM_THREADS", os.cpu_count() or 1))
+
+    def _fit_and_score(self, features, target):
+        if self.classification:
+            return self._classify(features, target)
+        model = XGBRegressor(**XGB_PARAMS, n_jobs=self._threads(), random_state=self.seed)
+        model.fit(features, target)
+        predicted = model.predict(self.test_features)
+        return {"R2": r2_score(self.test_target, predicted), "MAE": mean_absolute_error(self.test_target, predicted)}
+
+    def _classify(self, features, target):
+        n_classes = len(self.classes)
+        present = np.unique(target)
+        probabilities = np.zeros((len(self.test_features), n_classes))
+        if len(present) < 2:
+            # A synthetic table with a single class can only ever predict that class
+            probabilities[:, present[0] if len(present) else 0] = 1.0
+        else:
+            # XGBoost wants labels 0..k-1, so train on the classes this table has and map back
+            model = XGBClassifier(**XGB_PARAMS, n_jobs=self._threads(), random_state=self.seed)
+            model.fit(features, np.searchsorted(present, target))
+            probabilities[:, present] = model.predict_proba(self.test_features)
+
+        predicted = probabilities.argmax(axis=1)
+        scores = {
+            "Accuracy": accuracy_score(self.test_target, predicted),
+            "F1 (macro)": f1_score(self.test_target, predicted, average="macro", labels=np.arange(n_classes), zero_division=0),
+        }
+        if n_classes == 2 and len(np.unique(self.test_target)) == 2:
+            scores["ROC AUC"] = roc_auc_score(self.test_target, probabilities[:, 1])
+        return scores
+
+    @property
+    def primary_metric(self):
+        if not self.classification:
+            return "R2"
+        return "ROC AUC" if "ROC AUC" in self.baseline else "F1 (macro)"
+
+    def score(self, synthetic_data):
+        """
+        Metric/Synthetic/Real/Ratio rows for one synthetic table. The last row,
+        "Utility Score", is the primary metric of the synthetic-trained model
+        relative to the real-trained one, clipped to [0, 1] (1.0 = just as
+        useful; doing better than real data, which an R2 ratio can, scores no
+        higher). It is NaN when the real-trained model itself has no skill
+        (R2 <= 0). The per-metric rows keep the raw ratios.
+        """
+        synthetic = self._fit_and_score(*self.encode(synthetic_data))
+        rows = [{"Metric": metric, "Synthetic": synthetic[metric], "Real": real,
+                 "Ratio": synthetic[metric] / real if real else np.nan}
+                for metric, real in self.baseline.items()]
+        primary = next(row for row in rows if row["Metric"] == self.primary_metric)
+        ratio = float(np.clip(primary["Ratio"], 0, 1)) if primary["Real"] > 0 else np.nan
+        rows.append({"Metric": "Utility Score", "Synthetic": None, "Real": None, "Ratio": ratio})
+        return pd.DataFrame(rows)
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sdv.metadata import SingleTableMetadata
+
+
+@pytest.fixture
+def real_data():
+    """A small mixed table: numbers, a datetime, a category and a label."""
+    rng = np.random.default_rng(0)
+    rows = 400
+    return pd.DataFrame({
+        "age": rng.integers(18, 90, rows),
+        "income": rng.normal(50_000, 12_000, rows).round(2),
+        "joined": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1000, rows), unit="D"),
+        "state": rng.choice(["NY", "CA", "TX", "WA"], rows),
+        "default": rng.choice([0, 1], rows, p=[0.8, 0.2]),
+    })
+
+
+@pytest.fixture
+def metadata(real_data):
+    metadata = SingleTableMetadata()
+    metadata.detect_from_dataframe(real_data)
+    metadata.update_column("state", sdtype="categorical")
+    metadata.update_column("default", sdtype="categorical")
+    return metadata
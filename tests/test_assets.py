@@ -0,0 +1,35 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from course_app import assets
+
+
+@pytest.fixture
+def image_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "IMAGE_DIR", str(tmp_path))
+    assets.load_image.clear()
+    yield tmp_path
+    assets.load_image.clear()
+
+
+def test_wide_screenshot_is_scaled_to_webp(image_dir):
+    Image.new("RGB", (2800, 100), "white").save(image_dir / "wide.png")
+    with Image.open(io.BytesIO(assets.load_image("wide.png"))) as image:
+        assert image.format == "WEBP" and image.size == (assets.MAX_WIDTH, 50)
+
+
+def test_image_is_read_once(image_dir):
+    Image.new("RGBA", (40, 20)).save(image_dir / "small.png")
+    first = assets.load_image("small.png")
+    # Served from the cache, not from the file
+    os.remove(image_dir / "small.png")
+    assert assets.load_image("small.png") is first
+
+
+def test_bundled_screenshots_load():
+    name = sorted(os.listdir(assets.IMAGE_DIR))[0]
+    with Image.open(io.BytesIO(assets.load_image(name))) as image:
+        assert image.format == "WEBP" and image.width <= assets.MAX_WIDTH
@@ -0,0 +1,21 @@
+import json
+
+import pandas as pd
+
+from synthetic_lab.benchmark import FORMAT_VERSION, latest_results, load_results, write_results
+
+
+def test_latest_results_goes_by_the_recorded_time(tmp_path):
+    results = pd.DataFrame({"model": ["GaussianCopula"], "fit_seconds": [1.0]})
+    older = write_results(results, {"epochs": 1}, str(tmp_path))
+    newer = tmp_path / "a-newer-run.json"
+    document, _ = load_results(older)
+    newer.write_text(json.dumps({**document, "created": "29991231-000000"}))
+    # Another format version is skipped instead of breaking the lookup
+    (tmp_path / "z-old.json").write_text(json.dumps({"format_version": FORMAT_VERSION - 1, "created": "30000101-000000"}))
+    assert latest_results(str(tmp_path)) == str(newer)
+
+
+def test_no_results(tmp_path):
+    assert latest_results(str(tmp_path / "missing")) is None
+    assert latest_results(str(tmp_path)) is None
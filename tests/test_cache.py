@@ -0,0 +1,48 @@
+import os
+import time
+
+from sdv.single_table import GaussianCopulaSynthesizer
+
+from synthetic_lab.cache import ModelCache, cache_key, dataset_fingerprint
+from synthetic_lab.runner import fit_synthesizer
+
+
+def test_key_follows_every_input(real_data, metadata):
+    fingerprint = dataset_fingerprint(real_data)
+    key = cache_key(fingerprint, metadata, GaussianCopulaSynthesizer, {})
+    assert key == cache_key(dataset_fingerprint(real_data.copy()), metadata, GaussianCopulaSynthesizer, {})
+    changed = real_data.copy()
+    changed.loc[0, "age"] += 1
+    assert key != cache_key(dataset_fingerprint(changed), metadata, GaussianCopulaSynthesizer, {})
+    assert key != cache_key(fingerprint, metadata, GaussianCopulaSynthesizer, {"default_distribution": "norm"})
+
+
+def test_second_fit_comes_from_the_cache(tmp_path, real_data, metadata):
+    cache = ModelCache(str(tmp_path))
+    fingerprint = dataset_fingerprint(real_data)
+    first, details = fit_synthesizer(GaussianCopulaSynthesizer, {}, real_data, metadata, cache, fingerprint)
+    assert not details["cached"]
+    second, details = fit_synthesizer(GaussianCopulaSynthesizer, {}, real_data, metadata, cache, fingerprint)
+    assert details["cached"]
+    assert len(second.sample(num_rows=5)) == 5
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = ModelCache(str(tmp_path))
+    (tmp_path / "broken.pkl").write_bytes(b"not a pickle")
+    assert cache.get("broken", GaussianCopulaSynthesizer) is None
+    assert "broken" not in cache
+
+
+def test_least_recently_used_entries_go_first(tmp_path):
+    cache = ModelCache(str(tmp_path), max_bytes=250)
+    for age, key in enumerate(("old", "used", "new")):
+        path = tmp_path / f"{key}.pkl"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (time.time() - 100 + age, time.time() - 100 + age))
+    # A hit refreshes the entry, as get() does
+    os.utime(tmp_path / "used.pkl")
+    cache.evict()
+    assert sorted(os.listdir(tmp_path)) == ["new.pkl", "used.pkl"]
+    cache.invalidate()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+from sdv.metadata import SingleTableMetadata
+
+from synthetic_lab.evaluation import EvaluationEngine, stratified_sample, subsample_size
+
+
+def test_subsample_size_follows_dkw_bound():
+    assert subsample_size(0.02, 0.95) == 4612
+    assert subsample_size(0.05, 0.95) < subsample_size(0.02, 0.95)
+
+
+def test_stratified_sample_keeps_every_class():
+    df = pd.DataFrame({"label": ["a"] * 900 + ["b"] * 90 + ["c"] * 10})
+    sample = stratified_sample(df, 100, "label")
+    counts = sample["label"].value_counts()
+    assert len(sample) == 100
+    assert counts["a"] == 90 and counts["b"] == 9 and counts["c"] == 1
+
+
+def test_stratified_sample_never_exceeds_num_rows():
+    # Eleven classes rounded up to one row each would make 21 rows out of 20
+    df = pd.DataFrame({"label": ["a"] * 90 + list("bcdefghijk")})
+    for num_rows in (5, 10, 20):
+        assert len(stratified_sample(df, num_rows, "label")) == num_rows
+    assert stratified_sample(df, 20, "label")["label"].nunique() == 11
+
+
+def test_stratified_sample_returns_small_tables_whole():
+    df = pd.DataFrame({"x": range(10)})
+    assert stratified_sample(df, 50) is df
+
+
+def test_identical_data_scores_perfectly(real_data, metadata):
+    engine = EvaluationEngine(real_data, metadata)
+    assert engine.diagnostic(real_data).get_score() == 1.0
+    quality = engine.quality(real_data)
+    assert quality.get_score() == 1.0
+    assert set(quality.get_details("Column Shapes")["Column"]) == {"age", "income", "joined", "state", "default"}
+
+
+def test_out_of_range_values_lower_validity(real_data, metadata):
+    engine = EvaluationEngine(real_data, metadata)
+    synthetic = real_data.assign(age=real_data["age"] + 1000)
+    validity = engine.diagnostic(synthetic).get_details("Data Validity").set_index("Column")["Score"]
+    assert validity["age"] == 0.0
+    assert validity["state"] == 1.0
+
+
+def test_properties_without_rows_score_nan():
+    df = pd.DataFrame({"note": [f"free text {i}" for i in range(50)]})
+    metadata = SingleTableMetadata()
+    metadata.detect_from_dataframe(df)
+    metadata.remove_primary_key()
+    metadata.update_column("note", sdtype="text")
+    engine = EvaluationEngine(df, metadata)
+
+    diagnostic = engine.diagnostic(df).get_properties().set_index("Property")["Score"]
+    assert np.isnan(diagnostic["Data Validity"])
+    assert diagnostic["Data Structure"] == 1.0
+    assert engine.diagnostic(df).get_score() == 1.0
+    assert engine.quality(df).get_properties()["Score"].isna().all()
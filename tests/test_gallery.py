@@ -0,0 +1,36 @@
+import pytest
+
+from course_app import gallery as course_gallery
+from synthetic_lab.gallery import build_gallery
+
+LOADERS = (course_gallery.load_manifest, course_gallery.load_scores, course_gallery.load_metrics, course_gallery.load_table)
+
+
+@pytest.fixture
+def built(tmp_path, monkeypatch):
+    """A one-dataset, one-model gallery, served to the course pages' loaders."""
+    build_gallery(["iris"], ["GaussianCopula"], output_dir=str(tmp_path))
+    monkeypatch.setattr(course_gallery, "GALLERY_DIR", str(tmp_path))
+    for loader in LOADERS:
+        loader.clear()
+    yield tmp_path
+    for loader in LOADERS:
+        loader.clear()
+
+
+def test_pages_read_a_fresh_build(built):
+    manifest = course_gallery.load_manifest()
+    assert list(manifest["datasets"]) == ["iris"] and manifest["models"] == ["GaussianCopula"]
+
+    scores, table = course_gallery.load_scores("iris")
+    assert scores["target_col"] == "species"
+    assert table["Model"].tolist() == ["GaussianCopula"]
+    assert {"diagnostic_score", "quality_score", "privacy_score", "utility_score"} <= set(table.columns)
+
+    shapes = course_gallery.column_shapes(course_gallery.load_metrics("iris"))
+    assert list(shapes.columns) == ["GaussianCopula"]
+    assert "sepal_length" in shapes.index
+
+    shares = course_gallery.distribution("iris", "species", ["GaussianCopula"])
+    assert list(shares.columns) == ["Real", "GaussianCopula"]
+    assert shares.sum().round(6).tolist() == [1.0, 1.0]
@@ -0,0 +1,43 @@
+import re
+import zipfile
+
+import pandas as pd
+
+from course_app import generator
+from course_app.generator import peek, started
+
+
+def test_peek_counts_rows_and_columns(tmp_path, real_data):
+    real_data.to_csv(tmp_path / "data.csv", index=False)
+    real_data.to_parquet(tmp_path / "data.parquet", index=False)
+    real_data.to_excel(tmp_path / "data.xlsx", index=False)
+    for name in ("data.csv", "data.parquet", "data.xlsx"):
+        assert peek(str(tmp_path / name)) == (len(real_data), list(real_data.columns))
+
+
+def test_peek_excel_without_a_dimension_record(tmp_path):
+    pd.DataFrame({"a": range(5), "b": list("abcde")}).to_excel(tmp_path / "full.xlsx", index=False)
+    # Rewrite the file without <dimension>, as some exporters do; read-only openpyxl then has no max_row
+    with zipfile.ZipFile(tmp_path / "full.xlsx") as source, zipfile.ZipFile(tmp_path / "bare.xlsx", "w") as target:
+        for item in source.infolist():
+            data = source.read(item)
+            if item.filename.startswith("xl/worksheets/"):
+                data = re.sub(rb"<dimension[^>]*/>", b"", data)
+            target.writestr(item, data)
+    assert peek(str(tmp_path / "bare.xlsx")) == (5, ["a", "b"])
+
+
+def test_peek_counts_csv_records_not_lines(tmp_path):
+    (tmp_path / "quoted.csv").write_text('id,note\n1,"first\nsecond"\n2,plain\n')
+    assert peek(str(tmp_path / "quoted.csv")) == (2, ["id", "note"])
+    (tmp_path / "unterminated.csv").write_text("id,note\n1,plain\n2,last")
+    assert peek(str(tmp_path / "unterminated.csv")) == (2, ["id", "note"])
+
+
+def test_job_counts_as_started_once_its_folder_exists(tmp_path, monkeypatch):
+    monkeypatch.setattr(generator, "JOB_ROOT", str(tmp_path))
+    # The upload is saved before the job is queued; only the worker creates the job folder
+    (tmp_path / "uploads" / "job").mkdir(parents=True)
+    assert not started("job")
+    (tmp_path / "job").mkdir()
+    assert started("job")
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthetic_lab.ingest import (READERS, apply_schema, load_dataset, optimize_dtypes, release_categoricals, schema_of,
+                                  training_frames)
+
+
+@pytest.fixture
+def schema_dir(tmp_path):
+    return str(tmp_path / "schemas")
+
+
+def test_optimize_dtypes_downcasts_without_losing_values():
+    df = optimize_dtypes(pd.DataFrame({
+        "small": np.arange(100, dtype=np.int64),
+        "exact": np.full(100, 0.5),
+        "precise": np.full(100, 2.123456789),
+        "repeated": ["a", "b"] * 50,
+        "unique": [f"id{i}" for i in range(100)],
+    }))
+    assert df["small"].dtype == np.int8
+    assert df["exact"].dtype == np.float32
+    assert df["precise"].dtype == np.float64
+    assert isinstance(df["repeated"].dtype, pd.CategoricalDtype)
+    assert df["unique"].dtype == object
+
+
+def test_csv_reload_infers_columns_the_saved_schema_no_longer_fits(tmp_path, schema_dir):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"count": [1, 2, 3], "ratio": [0.5, 0.25, 1.0], "label": ["a", "b", "a"]}).to_csv(path, index=False)
+    first = load_dataset(str(path), schema_dir=schema_dir)
+    assert first["count"].dtype == np.int8 and first["ratio"].dtype == np.float32
+
+    # Same header, but more decimals than float32 holds...
+    pd.DataFrame({"count": [1, 2, 3], "ratio": [0.5, 2.123456789, 1.0], "label": ["a", "b", "a"]}).to_csv(path, index=False)
+    second = load_dataset(str(path), schema_dir=schema_dir)
+    assert second["ratio"].tolist() == [0.5, 2.123456789, 1.0]
+    assert second["count"].dtype == np.int8
+    assert isinstance(second["label"].dtype, pd.CategoricalDtype)
+
+    # ...and a count int8 can't hold; the refreshed schema is what this load starts from
+    pd.DataFrame({"count": [1, 2, 2000], "ratio": [0.5, 2.123456789, 1.0], "label": ["a", "b", "a"]}).to_csv(path, index=False)
+    third = load_dataset(str(path), schema_dir=schema_dir)
+    assert third["count"].tolist() == [1, 2, 2000]
+    assert third["ratio"].dtype == np.float64
+
+
+def test_parquet_reload_never_overflows_a_saved_integer(tmp_path, schema_dir):
+    path = tmp_path / "data.parquet"
+    pd.DataFrame({"year": np.array([1, 2, 3], dtype=np.int64)}).to_parquet(path)
+    assert load_dataset(str(path), schema_dir=schema_dir)["year"].dtype == np.int8
+
+    pd.DataFrame({"year": np.array([1, 2, 2000], dtype=np.int64)}).to_parquet(path)
+    assert load_dataset(str(path), schema_dir=schema_dir)["year"].tolist() == [1, 2, 2000]
+
+
+def test_apply_schema_keeps_the_saved_dtypes_that_fit():
+    saved = schema_of(pd.DataFrame({"a": np.array([1], dtype=np.int16), "b": pd.Categorical(["x"])}))
+    df, misfits = apply_schema(pd.DataFrame({"a": [5, 6], "b": ["x", "y"]}), saved)
+    assert misfits == []
+    assert df["a"].dtype == np.int16 and isinstance(df["b"].dtype, pd.CategoricalDtype)
+
+    df, misfits = apply_schema(pd.DataFrame({"a": [5.5, np.nan], "b": ["x", "y"]}), saved)
+    assert misfits == ["a"]
+    assert df["a"].iloc[0] == 5.5
+
+
+def test_job_dir_gets_a_copy_of_the_schema(tmp_path, schema_dir):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"x": [1, 2]}).to_csv(path, index=False)
+    load_dataset(str(path), job_dir=str(tmp_path), schema_dir=schema_dir)
+    assert (tmp_path / "schema.json").exists()
+
+
+def test_legacy_excel_is_rejected(tmp_path):
+    assert ".xls" not in READERS
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        load_dataset(str(tmp_path / "old.xls"))
+
+
+def test_release_categoricals(real_data, metadata):
+    df = real_data.assign(state=real_data["state"].astype("category"))
+    assert isinstance(release_categoricals(df, metadata)["state"].dtype, pd.CategoricalDtype)
+    assert release_categoricals(df, metadata, keep_categorical=False)["state"].dtype == object
+
+
+def test_training_frames_only_copy_what_they_release(real_data, metadata):
+    df = real_data.assign(state=real_data["state"].astype("category"))
+    frames = training_frames(df, metadata)
+    assert frames[True] is df
+    assert frames[False] is not df and frames[False]["state"].dtype == object
@@ -0,0 +1,42 @@
+import pickle
+
+from sdv.single_table import GaussianCopulaSynthesizer
+
+from synthetic_lab.jobstore import JobStore
+from synthetic_lab.runner import run_models
+
+
+def test_stages_are_recorded(tmp_path):
+    store = JobStore(str(tmp_path))
+    store.mark("CTGAN", "fit", details={"epochs_run": 12})
+    store.mark("CTGAN", "sample", status="running")
+    assert store.completed("CTGAN", "fit") == {"epochs_run": 12}
+    assert store.completed("CTGAN", "sample") is None
+    assert [row[:3] for row in store.stages()] == [("CTGAN", "fit", "completed"), ("CTGAN", "sample", "running")]
+    # Workers get a copy that reopens the same database
+    assert pickle.loads(pickle.dumps(store)).completed("CTGAN", "fit") == {"epochs_run": 12}
+    store.reset("CTGAN")
+    assert store.stages() == []
+
+
+def test_finished_models_are_skipped(tmp_path, real_data, metadata):
+    models = {"GaussianCopula": GaussianCopulaSynthesizer}
+    first = run_models(models, real_data, metadata, str(tmp_path), inline=True)["models"]["GaussianCopula"]
+    again = run_models(models, real_data, metadata, str(tmp_path), inline=True)["models"]["GaussianCopula"]
+    assert again["resumed"] and again["quality_score"] == first["quality_score"]
+
+
+def test_interrupted_model_resumes_after_its_last_stage(tmp_path, real_data, metadata, capsys):
+    models = {"GaussianCopula": GaussianCopulaSynthesizer}
+    first = run_models(models, real_data, metadata, str(tmp_path), inline=True)["models"]["GaussianCopula"]
+    # As if the job stopped during the evaluation
+    store = JobStore(str(tmp_path))
+    for stage in ("model", "evaluate", "privacy", "plot"):
+        store.mark("GaussianCopula", stage, status="running")
+    capsys.readouterr()
+    resumed = run_models(models, real_data, metadata, str(tmp_path), inline=True)["models"]["GaussianCopula"]
+    output = capsys.readouterr().out
+    assert "Loaded fitted GaussianCopula from the job checkpoint" in output
+    assert "Training GaussianCopula" not in output
+    # The same kept rows are evaluated again
+    assert resumed["quality_score"] == first["quality_score"]
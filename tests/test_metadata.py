@@ -0,0 +1,61 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthetic_lab.metadata import detect_metadata, schema_fingerprint
+
+
+@pytest.fixture
+def customers():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"customer_id": np.arange(1000, 1200), "age": rng.integers(18, 90, 200),
+                         "state": rng.choice(["NY", "CA", "TX", "WA"], 200)})
+
+
+def edit_profile(profile_dir, df, column, sdtype):
+    """Change one column of the saved profile, so a later hit is recognisable."""
+    path = os.path.join(profile_dir, f"{schema_fingerprint(df)}.json")
+    with open(path) as f:
+        profile = json.load(f)
+    profile["columns"][column]["sdtype"] = sdtype
+    with open(path, "w") as f:
+        json.dump(profile, f)
+
+
+def test_sample_ids_are_checked_against_the_full_data(tmp_path, customers):
+    # Unique in the 50 sampled rows, not in the full table
+    customers.loc[199, "customer_id"] = 1000
+    assert customers.sample(n=50, random_state=0)["customer_id"].is_unique
+    metadata = detect_metadata(customers, sample_rows=50, profile_dir=str(tmp_path), job_dir=str(tmp_path))
+    assert metadata.primary_key is None
+    assert metadata.columns["customer_id"]["sdtype"] != "id"
+    assert (tmp_path / "metadata.json").exists()
+
+
+def test_profile_hit_skips_detection(tmp_path, customers):
+    detect_metadata(customers, profile_dir=str(tmp_path))
+    edit_profile(str(tmp_path), customers, "age", "categorical")
+    assert detect_metadata(customers, profile_dir=str(tmp_path)).columns["age"]["sdtype"] == "categorical"
+    # Unless detection is forced
+    assert detect_metadata(customers, profile_dir=str(tmp_path), use_profile=False).columns["age"]["sdtype"] == "numerical"
+
+
+def test_profile_misses_after_a_dtype_change(tmp_path, customers):
+    detect_metadata(customers, profile_dir=str(tmp_path))
+    edit_profile(str(tmp_path), customers, "age", "categorical")
+    retyped = customers.assign(age=customers["age"] + 0.5)
+    assert schema_fingerprint(retyped) != schema_fingerprint(customers)
+    assert detect_metadata(retyped, profile_dir=str(tmp_path)).columns["age"]["sdtype"] == "numerical"
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_profile_is_shared_by_files_with_the_same_schema(tmp_path, customers):
+    detect_metadata(customers, profile_dir=str(tmp_path))
+    edit_profile(str(tmp_path), customers, "age", "categorical")
+    # Next month's extract: other rows, same columns; a narrower integer dtype doesn't matter
+    extract = customers.sample(frac=0.5, random_state=1).assign(age=lambda df: df["age"].astype("int16"))
+    assert detect_metadata(extract, profile_dir=str(tmp_path)).columns["age"]["sdtype"] == "categorical"
+    assert len(os.listdir(tmp_path)) == 1
@@ -0,0 +1,57 @@
+import json
+import os
+
+import pytest
+
+from synthetic_lab.__main__ import main
+from synthetic_lab.pipeline import read_manifest, run_job
+
+
+def test_manifest_settings_are_typed(tmp_path):
+    manifest = tmp_path / "batch.csv"
+    manifest.write_text("path,job_id,num_rows,privacy,inline,budget_seconds\n"
+                        "data/a.csv,a,50,False,1,\n"
+                        "b.csv,b,,yes,0,90.5\n")
+    first, second = read_manifest(str(manifest))
+    assert first == {"path": str(tmp_path / "data" / "a.csv"), "job_id": "a", "num_rows": 50, "privacy": False,
+                     "inline": True}
+    assert second["privacy"] is True and second["inline"] is False and second["budget_seconds"] == 90.5
+
+
+@pytest.mark.parametrize("content, error", [
+    ("path,rows\na.csv,5\n", "Unknown manifest settings"),
+    ("path,privacy\na.csv,maybe\n", "true or false"),
+    ("path,num_rows\na.csv,many\n", "must be a number"),
+    ("path,sensitive\na.csv,email\n", "JSON manifest"),
+])
+def test_bad_manifest_settings_are_rejected(tmp_path, content, error):
+    manifest = tmp_path / "batch.csv"
+    manifest.write_text(content)
+    with pytest.raises(ValueError, match=error):
+        read_manifest(str(manifest))
+
+
+def test_run_job_end_to_end(tmp_path, real_data):
+    path = tmp_path / "data.csv"
+    real_data.to_csv(path, index=False)
+    summary = run_job(str(path), str(tmp_path / "out"), job_id="job", models="GaussianCopula", target_col="default",
+                      report=False, inline=True)
+    result = summary["models"]["GaussianCopula"]
+    assert result["status"] == "completed", result.get("traceback")
+    assert result["utility_score"] is not None and result["privacy_score"] is not None
+    assert summary["recommended"] == "GaussianCopula"
+    assert os.path.exists(tmp_path / "out" / "job" / "ranking.csv")
+    assert summary["zip"] == str(tmp_path / "out" / "job_results.zip") and os.path.exists(summary["zip"])
+
+
+def test_cli_runs_a_manifest_batch(tmp_path, real_data):
+    real_data.to_csv(tmp_path / "data.csv", index=False)
+    (tmp_path / "batch.csv").write_text("path,job_id,privacy,inline\ndata.csv,cli,false,true\n")
+    status = main(["--manifest", str(tmp_path / "batch.csv"), "--output-dir", str(tmp_path / "out"),
+                   "--models", "GaussianCopula", "--no-cache", "--no-report"])
+    assert status == 0
+    [batch] = (tmp_path / "out").glob("batch_*.json")
+    [job] = json.loads(batch.read_text())["jobs"]
+    assert job["job_id"] == "cli" and job["status"] == "completed" and job["failed_models"] == []
+    with open(tmp_path / "out" / "cli" / "job_summary.json") as f:
+        assert json.load(f)["models"]["GaussianCopula"]["privacy_score"] is None
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from synthetic_lab.plots import ComparisonPlotter
+
+
+def test_columns_are_binned_by_kind(real_data):
+    plotter = ComparisonPlotter(real_data)
+    assert set(plotter.numeric) == {"age", "income", "joined"}
+    assert set(plotter.categorical) == {"state", "default"}
+    assert plotter.datetimes == {"joined"}
+    edges, shares = plotter.numeric["income"]
+    assert len(edges) == len(shares) + 1 and np.isclose(shares.sum(), 1)
+
+
+def test_datetimes_are_binned_on_a_date_axis(tmp_path, real_data):
+    plotter = ComparisonPlotter(real_data)
+    edges, _ = plotter.numeric["joined"]
+    # Matplotlib date numbers: days since 1970-01-01
+    assert edges[0] == (real_data["joined"].min() - pd.Timestamp("1970-01-01")).days
+    # Synthetic datetimes may come back as text
+    synthetic = real_data.assign(joined=real_data["joined"].dt.strftime("%Y-%m-%d"))
+    assert np.isclose(plotter._synthetic_histogram(synthetic["joined"], "joined", edges).sum(), 1)
+    assert plotter.plot(synthetic, "Model", str(tmp_path / "plot.png")) == str(tmp_path / "plot.png")
+
+
+def test_columns_past_the_limit_are_reported(capsys, real_data):
+    plotter = ComparisonPlotter(real_data, max_columns=2)
+    assert plotter.columns == ["age", "income"]
+    assert "not plotted: joined, state, default" in capsys.readouterr().out
+
+
+def test_nothing_to_plot_returns_none(tmp_path):
+    plotter = ComparisonPlotter(pd.DataFrame({"id": [f"row{i}" for i in range(10)]}))
+    assert plotter.plot(pd.DataFrame({"id": ["x"]}), "Model", str(tmp_path / "plot.png")) is None
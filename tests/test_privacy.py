@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from synthetic_lab.encoding import numeric_values
+from synthetic_lab.privacy import DCRScorer
+
+
+def scores(frame):
+    return dict(zip(frame["Metric"], frame["Value"]))
+
+
+def test_copies_of_real_rows_have_zero_distance(real_data, metadata):
+    scorer = DCRScorer(real_data, metadata, holdout_rows=0)
+    assert np.allclose(scorer.distances(real_data), 0)
+    assert scores(scorer.score(real_data))["Exact match rate"] == 1.0
+
+
+def test_new_rows_score_against_the_holdout(real_data, metadata):
+    scorer = DCRScorer(real_data, metadata)
+    assert len(scorer.baseline) == len(real_data) // 5
+    far = real_data.assign(age=real_data["age"] * 10, income=real_data["income"] * 10)
+    copied = scores(scorer.score(real_data))
+    shifted = scores(scorer.score(far))
+    assert copied["DCR Score"] < shifted["DCR Score"] == 1.0
+    assert copied["Privacy Risk"] == 1.0 - copied["DCR Score"]
+
+
+def test_chunked_queries_match_a_single_query(real_data, metadata):
+    whole = DCRScorer(real_data, metadata, chunk_size=10_000).distances(real_data.iloc[::-1])
+    chunked = DCRScorer(real_data, metadata, chunk_size=7).distances(real_data.iloc[::-1])
+    assert np.array_equal(whole, chunked)
+
+
+def test_tiny_tables_have_no_holdout_and_no_dcr_score(real_data, metadata):
+    # Fewer than 5 rows leave nothing to hold out
+    scorer = DCRScorer(real_data.head(4), metadata)
+    assert len(scorer.baseline) == 0
+    result = scores(scorer.score(real_data.head(10)))
+    assert "DCR Score" not in result
+    assert "DCR p50" in result
+
+
+def test_numeric_values_turns_datetimes_into_nanoseconds():
+    values = pd.Series(["2020-01-01", None, "not a date"])
+    numbers = numeric_values(values, datetime_format="%Y-%m-%d")
+    assert numbers[0] == pd.Timestamp("2020-01-01").value
+    assert np.isnan(numbers[1:]).all()
+    assert np.isnan(numeric_values(pd.Series(["1.5", "x"])))[1]
@@ -0,0 +1,42 @@
+import sys
+
+import numpy as np
+import pytest
+
+from synthetic_lab.profiling import COLUMNS, StageProfiler, peak_rss_mb
+
+
+def memory_kb(field):
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith(f"{field}:"))
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads the memory figures from /proc")
+def test_memory_is_in_megabytes():
+    assert peak_rss_mb() == pytest.approx(memory_kb("VmHWM") / 1024, rel=0.05)
+    profiler = StageProfiler()
+    # Go 200 MB past the high-water mark that earlier work in this process left
+    extra_mb = (memory_kb("VmHWM") - memory_kb("VmRSS")) / 1024 + 200
+    with profiler.stage("allocate"):
+        block = np.ones(int(extra_mb * 2**20 / 8))
+        del block
+    assert profiler.records[0]["rss_growth_mb"] == pytest.approx(200, abs=50)
+
+
+def test_stage_records(tmp_path):
+    profiler = StageProfiler(str(tmp_path), profile=True)
+    with profiler.stage("fit", "Model", rows=10, columns=2):
+        pass
+    with pytest.raises(ValueError):
+        with profiler.stage("sample", "Model"):
+            raise ValueError("failed stage")
+
+    fit, sample = profiler.records
+    assert (fit["model"], fit["stage"], fit["rows"], fit["columns"]) == ("Model", "fit", 10, 2)
+    # A failing stage is still recorded
+    assert sample["stage"] == "sample" and sample["wall_seconds"] >= 0
+    assert (tmp_path / "profiles" / "Model_fit.prof").exists()
+
+    profiler.write()
+    assert list(profiler.table().columns) == COLUMNS
+    assert (tmp_path / "timings.json").exists() and (tmp_path / "timings.csv").exists()
@@ -0,0 +1,67 @@
+import json
+
+import pandas as pd
+import pytest
+
+from synthetic_lab.ranking import METRICS_NAME, ModelRanking, compact_metrics, details_frame, parse_weights, rank_models, scores_frame
+
+
+def quality(score):
+    return pd.DataFrame({"Property": ["Column Shapes", "Column Pair Trends"], "Column": ["age", None],
+                         "Metric": ["KSComplement", "CorrelationSimilarity"], "Score": [score, score]})
+
+
+def metrics():
+    return compact_metrics([
+        details_frame(quality(0.9), "CTGAN", "quality"),
+        scores_frame(pd.DataFrame({"Metric": ["DCR Score"], "Value": [0.2]}), "CTGAN", "privacy", "Value"),
+        details_frame(quality(0.7), "GaussianCopula", "quality"),
+        scores_frame(pd.DataFrame({"Metric": ["DCR Score"], "Value": [0.8]}), "GaussianCopula", "privacy", "Value"),
+        # An R2 ratio above 1 counts as parity
+        scores_frame(pd.DataFrame({"Metric": ["Utility Score"], "Ratio": [1.15]}), "GaussianCopula", "utility", "Ratio"),
+    ])
+
+
+def test_weights_decide_the_winner():
+    ranking = ModelRanking(metrics())
+    assert ranking.recommend({"quality": 1}) == "CTGAN"
+    assert ranking.recommend({"privacy": 1}) == "GaussianCopula"
+    ranked = ranking.rank({"quality": 3, "privacy": 1})
+    assert ranked.attrs["weights"] == {"quality": 0.75, "privacy": 0.25}
+    assert ranked["Composite Score"].tolist() == pytest.approx([0.725, 0.725])
+
+
+def test_missing_criteria():
+    ranked = ModelRanking(metrics()).rank().set_index("Model")
+    # Nobody has a diagnostic score, so it is left out; CTGAN has no utility score, so it gets 0 there
+    assert "Diagnostic" not in " ".join(ranked.columns)
+    assert ranked.loc["CTGAN", "Composite Score"] == pytest.approx((0.9 + 0.2 + 0) / 3)
+    assert ranked.loc["GaussianCopula", "Composite Score"] == pytest.approx((0.7 + 0.8 + 1.0) / 3)
+
+
+def test_bad_weights():
+    ranking = ModelRanking(metrics())
+    with pytest.raises(ValueError, match="Unknown criteria"):
+        ranking.rank({"speed": 1})
+    with pytest.raises(ValueError, match="negative"):
+        ranking.rank({"quality": -1})
+    with pytest.raises(ValueError, match="No weighted criterion"):
+        ranking.rank({"diagnostic": 1})
+    assert parse_weights("privacy=2, utility=1") == {"privacy": 2.0, "utility": 1.0}
+
+
+def test_rerank_a_finished_job(tmp_path):
+    summary = {"job_id": "job", "models": {"CTGAN": {"status": "completed"}, "TVAE": {"status": "failed"},
+                                           "GaussianCopula": {"status": "completed"}}}
+    for model, score, dcr in (("CTGAN", 0.9, 0.2), ("GaussianCopula", 0.7, 0.8)):
+        quality(score).to_csv(tmp_path / f"{model}_quality.csv", index=False)
+        pd.DataFrame({"Metric": ["DCR Score"], "Value": [dcr]}).to_csv(tmp_path / f"{model}_privacy.csv", index=False)
+    (tmp_path / "job_summary.json").write_text(json.dumps(summary))
+
+    ranking = rank_models(summary, str(tmp_path), {"quality": 1})
+    assert ranking["Model"].tolist() == ["CTGAN", "GaussianCopula"]
+    assert (tmp_path / "ranking.csv").exists() and (tmp_path / METRICS_NAME).exists()
+    # Re-ranked from the cached metrics, without the score files
+    for path in tmp_path.glob("*_quality.csv"):
+        path.unlink()
+    assert ModelRanking.from_job(str(tmp_path)).recommend({"privacy": 1}) == "GaussianCopula"
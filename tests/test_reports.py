@@ -0,0 +1,25 @@
+import os
+
+from openpyxl import load_workbook
+
+from synthetic_lab.reports import export_results, write_workbook
+
+
+def test_long_tables_continue_on_more_sheets(tmp_path, real_data):
+    table = tmp_path / "model.csv"
+    real_data.head(25).to_csv(table, index=False)
+    sheets = write_workbook({"Model": str(table)}, str(tmp_path / "out.xlsx"), max_rows=11)
+    assert sheets == {"Model": 10, "Model (2)": 10, "Model (3)": 5}
+    workbook = load_workbook(tmp_path / "out.xlsx", read_only=True)
+    assert [cell.value for cell in next(workbook["Model (3)"].iter_rows(max_row=1))] == list(real_data.columns)
+    workbook.close()
+
+
+def test_workbook_is_opt_in(tmp_path, real_data):
+    table = tmp_path / "model.csv"
+    real_data.to_csv(table, index=False)
+    summary = {"job_id": "job", "models": {"Model": {"status": "completed", "outputs": [str(table)]}}}
+    written = export_results(summary, str(tmp_path), report=False)
+    assert written == {} and not os.path.exists(tmp_path / "synthetic_datasets.xlsx")
+    written = export_results(summary, str(tmp_path), workbook=True, report=False)
+    assert os.path.exists(written["workbook"])
@@ -0,0 +1,61 @@
+import json
+import os
+
+import pandas as pd
+from sdv.single_table import CTGANSynthesizer, GaussianCopulaSynthesizer
+
+from synthetic_lab.ingest import optimize_dtypes
+from synthetic_lab.jobstore import JobStore
+from synthetic_lab.privacy import DCRScorer
+from synthetic_lab.runner import run_models
+
+
+def test_tiny_table_runs_without_a_privacy_score(tmp_path, real_data, metadata):
+    real = real_data.head(4)
+    summary = run_models({"GaussianCopula": GaussianCopulaSynthesizer}, real, metadata, str(tmp_path),
+                         privacy=DCRScorer(real, metadata), inline=True)
+    result = summary["models"]["GaussianCopula"]
+    assert result["status"] == "completed", result.get("traceback")
+    assert result["privacy_score"] is None
+    assert os.path.exists(tmp_path / "GaussianCopula_privacy.csv")
+
+
+def test_summary_lists_every_model(tmp_path, real_data, metadata):
+    summary = run_models({"GaussianCopula": GaussianCopulaSynthesizer}, real_data, metadata, str(tmp_path), inline=True)
+    with open(tmp_path / "job_summary.json") as f:
+        assert json.load(f)["models"].keys() == summary["models"].keys() == {"GaussianCopula"}
+    assert summary["failed"] == []
+
+
+def test_categorical_columns_keep_the_table_structure(tmp_path, real_data, metadata):
+    # load_dataset makes repetitive text categorical; CTGAN returns it as object
+    real = optimize_dtypes(real_data.copy())
+    assert isinstance(real["state"].dtype, pd.CategoricalDtype)
+    summary = run_models({"CTGAN": (CTGANSynthesizer, {"epochs": 1})}, real, metadata, str(tmp_path), inline=True)
+    assert summary["models"]["CTGAN"]["status"] == "completed", summary["models"]["CTGAN"].get("traceback")
+    diagnostic = pd.read_csv(tmp_path / "CTGAN_diagnostic.csv")
+    assert diagnostic.loc[diagnostic["Metric"] == "TableStructure", "Score"].item() == 1.0
+
+
+class StatusProbe(GaussianCopulaSynthesizer):
+    """GaussianCopula that writes down the job store's record of its model while it fits."""
+
+    def __init__(self, metadata, job_dir=None, **kwargs):
+        super().__init__(metadata, **kwargs)
+        self.job_dir = job_dir
+
+    def fit(self, data):
+        statuses = {(model, stage): status for model, stage, status, _ in JobStore(self.job_dir).stages()}
+        with open(os.path.join(self.job_dir, f"{os.getpid()}.status"), "w") as f:
+            f.write(statuses[("Probe", "model")])
+        super().fit(data)
+
+
+def test_pool_runs_are_recorded_as_running(tmp_path, real_data, metadata):
+    models = {"GaussianCopula": GaussianCopulaSynthesizer, "Probe": (StatusProbe, {"job_dir": str(tmp_path)})}
+    summary = run_models(models, real_data, metadata, str(tmp_path), max_workers=2)
+    for name, result in summary["models"].items():
+        assert result["status"] == "completed", result.get("traceback")
+    assert [path.read_text() for path in tmp_path.glob("*.status")] == ["running"]
+    assert {(model, status) for model, stage, status, _ in JobStore(str(tmp_path)).stages() if stage == "model"} == \
+        {("GaussianCopula", "completed"), ("Probe", "completed")}
@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+from sdv.single_table import GaussianCopulaSynthesizer
+
+from synthetic_lab.jobstore import JobStore
+from synthetic_lab.runner import run_models
+from synthetic_lab.sampling import ConditionalSampler, parse_conditions, parse_constraints, sample_to_file
+
+
+@pytest.fixture
+def synthesizer(real_data, metadata):
+    synthesizer = GaussianCopulaSynthesizer(metadata)
+    synthesizer.fit(real_data)
+    return synthesizer
+
+
+def test_parse_command_line_rules():
+    assert parse_conditions(["default=1:50", "default=0:20"]) == {"default": {"1": 50, "0": 20}}
+    assert parse_constraints(["age=18..65", "income=..90000", "state=CA,NY"]) == {
+        "age": ("18", "65"), "income": (None, "90000"), "state": ["CA", "NY"]}
+
+
+def test_batches_stream_to_file(tmp_path, synthesizer):
+    kept = sample_to_file(synthesizer, 250, str(tmp_path / "out.parquet"), batch_size=100, keep_rows=120)
+    assert len(kept) == 120
+    assert len(pd.read_parquet(tmp_path / "out.parquet")) == 250
+
+
+def test_allowed_values_are_drawn_as_conditions(tmp_path, real_data, synthesizer):
+    sampler = ConditionalSampler(constraints={"state": ["CA", "NY"]}, real_data=real_data)
+    synthetic = sample_to_file(synthesizer, 200, str(tmp_path / "out.csv"), keep_rows=200, sampler=sampler)
+    assert len(synthetic) == 200 and set(synthetic["state"]) == {"CA", "NY"}
+    report = sampler.report().set_index("Condition")
+    # One condition per allowed value, split like the real data, and nothing filtered away
+    assert list(report.index) == ["state = CA", "state = NY", "Total"]
+    shares = real_data["state"].value_counts()
+    assert report.loc["state = CA", "Target"] == round(200 * shares["CA"] / (shares["CA"] + shares["NY"]))
+    assert report.loc["Total", "Accepted"] == report.loc["Total", "Requested"] == 200
+
+
+def test_conditions_are_split_over_allowed_values(real_data):
+    sampler = ConditionalSampler(conditions={"default": {"1": 30, "0": 10}}, constraints={"state": ["TX"], "age": (20, 40)},
+                                 real_data=real_data)
+    assert sampler.targets == [{"values": {"default": 1, "state": "TX"}, "rows": 30},
+                               {"values": {"default": 0, "state": "TX"}, "rows": 10}]
+    assert sampler.ranges == {"age": (20, 40)}
+    assert sampler.num_rows == 40
+
+
+def test_conditions_outside_the_allowed_values_are_skipped(real_data):
+    sampler = ConditionalSampler(conditions={"state": {"CA": 10, "NY": 5}}, constraints={"state": ["NY"]}, real_data=real_data)
+    assert sampler.targets == [{"values": {"state": "NY"}, "rows": 5}]
+
+
+def test_ranges_are_enforced_by_rejection(tmp_path, real_data, synthesizer):
+    sampler = ConditionalSampler(constraints={"age": ("30", "50")}, real_data=real_data)
+    synthetic = sample_to_file(synthesizer, 100, str(tmp_path / "out.csv"), keep_rows=100, sampler=sampler)
+    assert len(synthetic) == 100 and synthetic["age"].between(30, 50).all()
+    assert sampler.acceptance_rate() < 1
+
+
+def test_summary_counts_the_rows_actually_sampled(tmp_path, real_data, metadata):
+    # No real row has state ZZ, so that target is given up on
+    options = {"conditions": {"state": {"CA": 40, "ZZ": 10}}}
+    summary = run_models({"GaussianCopula": GaussianCopulaSynthesizer}, real_data, metadata, str(tmp_path),
+                         sample_options=options, inline=True)
+    assert summary["models"]["GaussianCopula"]["status"] == "completed"
+    assert JobStore(str(tmp_path)).completed("GaussianCopula", "sample")["rows"] == 40
+
+
+def test_no_accepted_rows_fails_the_model_cleanly(tmp_path, real_data, metadata):
+    options = {"constraints": {"age": (1000, None)}}
+    summary = run_models({"GaussianCopula": GaussianCopulaSynthesizer}, real_data, metadata, str(tmp_path),
+                         sample_options=options, inline=True)
+    result = summary["models"]["GaussianCopula"]
+    assert result["status"] == "failed"
+    assert "no rows that meet" in result["error"]
+    assert (tmp_path / "GaussianCopula_sampling.csv").exists()
@@ -0,0 +1,36 @@
+from sdv.single_table import GaussianCopulaSynthesizer, TVAESynthesizer
+
+from synthetic_lab.selection import successive_halving
+
+SPACE = [
+    ("GaussianCopula[norm]", GaussianCopulaSynthesizer, {"default_distribution": "norm"}),
+    ("GaussianCopula[uniform]", GaussianCopulaSynthesizer, {"default_distribution": "uniform"}),
+]
+
+
+def test_prunes_to_the_leader(tmp_path, real_data, metadata):
+    result = successive_halving(real_data, metadata, SPACE, cpu_hours=1.0, eta=2, min_rows=100, job_dir=str(tmp_path))
+    leaderboard = result.leaderboard
+    assert list(leaderboard["Rung"].value_counts().sort_index()) == [2, 1]
+    first_rung = leaderboard[leaderboard["Rung"] == 0].sort_values("Quality", ascending=False)
+    final = leaderboard[leaderboard["Rung"] == 1]
+    # Only the best 1/eta of rung 0 goes on, on eta times the rows
+    assert final["Configuration"].tolist() == [first_rung["Configuration"].iloc[0]]
+    assert final["Rows"].iloc[0] == 200
+    assert result.best_name == final["Configuration"].iloc[0]
+    assert result.best_kwargs == {name: kwargs for name, _, kwargs in SPACE}[result.best_name]
+    assert len(result.best_synthesizer.sample(num_rows=5)) == 5
+    assert (tmp_path / "model_selection.csv").exists()
+
+
+def test_budget_stops_the_first_rung(real_data, metadata):
+    space = [(f"TVAE[{batch_size}]", TVAESynthesizer, {"batch_size": batch_size}) for batch_size in (100, 50)]
+    # The first fit in the process also pays for loading torch; time the second
+    for _ in range(2):
+        probe = successive_halving(real_data, metadata, space[:1], eta=2, min_rows=100, min_epochs=20).leaderboard
+    cost = probe["CPU Seconds"].iloc[0]
+    # Room for the probe fit but not for another one like it
+    result = successive_halving(real_data, metadata, space, cpu_hours=1.25 * cost / 3600, eta=2, min_rows=100,
+                                min_epochs=20)
+    assert result.leaderboard["Configuration"].tolist() == ["TVAE[100]"]
+    assert result.best_name == "TVAE[100]"
@@ -0,0 +1,49 @@
+import os
+
+import pandas as pd
+import pytest
+
+from synthetic_lab.jobstore import CHECKPOINT_DIR
+from synthetic_lab import sensitive
+from synthetic_lab.sensitive import KEY_FILE, protect_columns, token_value
+
+
+def people():
+    return pd.DataFrame({"id": ["AB-1234", "CD-5678", "AB-1234"], "name": ["Ann", "Bob", "Cy"], "age": [30, 40, 50]})
+
+
+def test_actions():
+    df = protect_columns(people(), {"id": "tokenize", "name": "remove", "age": "scramble"}, key="secret")
+    assert list(df.columns) == ["id", "age"]
+    assert df["id"].iloc[0] == df["id"].iloc[2] != "AB-1234"
+    assert df["id"].str.fullmatch(r"[A-Z]{2}-\d{4}").all()
+    assert sorted(df["age"]) == [30, 40, 50]
+
+
+def test_a_key_gives_the_same_tokens_in_every_job():
+    first = protect_columns(people(), {"id": "hash"}, key="secret")
+    second = protect_columns(people(), {"id": "hash"}, key=b"secret")
+    assert first["id"].equals(second["id"])
+
+
+def test_tokens_keep_distinct_values_apart(monkeypatch):
+    # Force collisions: every value maps to the same token on its first try
+    monkeypatch.setattr(sensitive, "token_value", lambda key, value, counter=0: token_value(key, "same", counter))
+    df = protect_columns(pd.DataFrame({"id": ["1", "2", "3"]}), {"id": "tokenize"}, key="k")
+    assert df["id"].nunique() == 3
+
+
+def test_resumed_job_reuses_its_random_key(tmp_path):
+    first = protect_columns(people(), {"id": "hash"}, job_dir=str(tmp_path))
+    assert os.path.exists(tmp_path / CHECKPOINT_DIR / KEY_FILE)
+    resumed = protect_columns(people(), {"id": "hash"}, job_dir=str(tmp_path))
+    assert first["id"].equals(resumed["id"])
+    other_job = protect_columns(people(), {"id": "hash"}, job_dir=str(tmp_path / "other"))
+    assert not first["id"].equals(other_job["id"])
+
+
+def test_unknown_action_or_column():
+    with pytest.raises(ValueError, match="Unknown actions"):
+        protect_columns(people(), {"id": "encrypt"})
+    with pytest.raises(ValueError, match="not in the data"):
+        protect_columns(people(), {"ssn": "remove"})
@@ -0,0 +1,70 @@
+import json
+import sys
+import types
+
+import pytest
+
+from synthetic_lab.storage import GoogleDriveBackend, LocalDirectoryBackend, upload
+
+
+class FakeRequest:
+    resumable_uri, resumable_progress = "session", 0
+
+    def next_chunk(self, num_retries):
+        return None, {"id": "file123"}
+
+
+class FakeDrive:
+    def __init__(self):
+        self.shared = []
+
+    def files(self):
+        return types.SimpleNamespace(create=lambda **kwargs: FakeRequest())
+
+    def permissions(self):
+        def create(fileId, body):
+            self.shared.append((fileId, body))
+            return types.SimpleNamespace(execute=lambda: None)
+        return types.SimpleNamespace(create=create)
+
+
+@pytest.fixture
+def fake_googleapiclient(monkeypatch):
+    http = types.ModuleType("googleapiclient.http")
+    http.MediaFileUpload = lambda *args, **kwargs: None
+    monkeypatch.setitem(sys.modules, "googleapiclient", types.ModuleType("googleapiclient"))
+    monkeypatch.setitem(sys.modules, "googleapiclient.http", http)
+
+
+def test_local_upload_copies_the_file_and_clears_its_state(tmp_path):
+    source = tmp_path / "results.zip"
+    source.write_bytes(b"x" * 1000)
+    url = upload(LocalDirectoryBackend(str(tmp_path / "remote")), str(source), chunk_size=64)
+    assert (tmp_path / "remote" / "results.zip").read_bytes() == source.read_bytes()
+    assert url.startswith("file://")
+    assert not (tmp_path / "results.zip.upload.json").exists()
+
+
+def test_local_upload_resumes_at_the_recorded_offset(tmp_path):
+    source = tmp_path / "results.zip"
+    source.write_bytes(bytes(range(200)))
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    # An earlier attempt wrote 100 bytes but only recorded 64 as done
+    (remote / "results.zip.part").write_bytes(bytes(range(100)))
+    stat = source.stat()
+    (tmp_path / "results.zip.upload.json").write_text(
+        json.dumps({"offset": 64, "source": {"size": stat.st_size, "mtime": stat.st_mtime}}))
+    upload(LocalDirectoryBackend(str(remote)), str(source), chunk_size=64)
+    assert (remote / "results.zip").read_bytes() == source.read_bytes()
+
+
+def test_drive_uploads_stay_private_by_default(tmp_path, fake_googleapiclient):
+    source = tmp_path / "results.zip"
+    source.write_bytes(b"zip")
+    service = FakeDrive()
+    assert upload(GoogleDriveBackend(service), str(source)) == "https://drive.google.com/uc?id=file123"
+    assert service.shared == []
+
+    upload(GoogleDriveBackend(service, share_with_anyone=True), str(source))
+    assert service.shared == [("file123", {"type": "anyone", "role": "reader"})]
@@ -0,0 +1,49 @@
+import ctgan.synthesizers.ctgan as ctgan_module
+import ctgan.synthesizers.tvae as tvae_module
+import pytest
+import torch
+from sdv.single_table import TVAESynthesizer
+
+from synthetic_lab.training import EpochScheduler, fit_with_schedule
+
+
+def tvae(metadata, epochs):
+    return TVAESynthesizer(metadata, epochs=epochs, batch_size=100, verbose=False)
+
+
+def test_stops_on_a_plateau(real_data, metadata):
+    # With a huge min_delta every loss counts as flat once there is enough history
+    scheduler = EpochScheduler(max_epochs=20, patience=2, window=1, min_delta=1e6, min_epochs=0)
+    report = fit_with_schedule(tvae(metadata, 20), real_data, scheduler)
+    assert report["stopped_because"] == "plateau"
+    assert report["epochs_run"] == 3
+
+
+def test_stops_on_the_budget(real_data, metadata):
+    scheduler = EpochScheduler(max_epochs=20, budget_seconds=1e-6, min_epochs=0)
+    report = fit_with_schedule(tvae(metadata, 20), real_data, scheduler)
+    assert report["stopped_because"] == "budget"
+    assert report["epochs_run"] == 1
+
+
+def test_resume_from_the_final_checkpoint(tmp_path, real_data, metadata):
+    checkpoint = str(tmp_path / "TVAE.pt")
+    first = EpochScheduler(max_epochs=4, min_epochs=10, checkpoint_every=2)
+    fit_with_schedule(tvae(metadata, 4), real_data, first, checkpoint)
+    # The networks are picked up from the fit loop's locals as well as the model
+    assert {"encoder", "optimizerAE"} <= set(torch.load(checkpoint, weights_only=False)["state"])
+
+    second = EpochScheduler(max_epochs=4, min_epochs=10, checkpoint_every=2)
+    report = fit_with_schedule(tvae(metadata, 4), real_data, second, checkpoint)
+    assert report["resumed_from"] == 4
+    assert report["epochs_run"] == 4
+    assert report["stopped_because"] == "max_epochs"
+
+
+def test_restores_tqdm_after_an_error(real_data, metadata):
+    originals = ctgan_module.tqdm, tvae_module.tqdm
+    with pytest.raises(RuntimeError):
+        with EpochScheduler().attach(tvae(metadata, 2)):
+            assert ctgan_module.tqdm is not originals[0]
+            raise RuntimeError("fit failed")
+    assert (ctgan_module.tqdm, tvae_module.tqdm) == originals
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sdv.metadata import SingleTableMetadata
+
+from synthetic_lab.utility import UtilityScorer
+
+
+@pytest.fixture
+def regression_data():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=600)
+    return pd.DataFrame({"x": x, "noise": rng.normal(size=600), "y": 3 * x + rng.normal(scale=0.5, size=600)})
+
+
+def detected(df):
+    metadata = SingleTableMetadata()
+    metadata.detect_from_dataframe(df)
+    return metadata
+
+
+def test_test_rows_are_held_out(real_data, metadata):
+    scorer = UtilityScorer(real_data, metadata, "default", n_jobs=1)
+    assert scorer.classification
+    assert len(scorer.train_data) + len(scorer.test_target) == len(real_data)
+    scores = scorer.score(scorer.train_data)
+    assert scores["Metric"].tolist() == ["Accuracy", "F1 (macro)", "ROC AUC", "Utility Score"]
+
+
+def test_utility_score_is_capped_at_one(regression_data):
+    scorer = UtilityScorer(regression_data, detected(regression_data), "y", n_jobs=1)
+    assert not scorer.classification
+    # Pretend the real-trained model was worse than it is: the raw R2 ratio goes above 1
+    scorer.baseline = {**scorer.baseline, "R2": scorer.baseline["R2"] / 2}
+    scores = scorer.score(scorer.train_data).set_index("Metric")["Ratio"]
+    assert scores["R2"] > 1
+    assert scores["Utility Score"] == 1.0
+
+
+def test_useless_synthetic_data_scores_zero(regression_data):
+    scorer = UtilityScorer(regression_data, detected(regression_data), "y", n_jobs=1)
+    shuffled = scorer.train_data.assign(y=scorer.train_data["y"].sample(frac=1, random_state=0).to_numpy())
+    scores = scorer.score(shuffled).set_index("Metric")["Ratio"]
+    assert scores["R2"] < 0
+    assert scores["Utility Score"] == 0.0
+
+
+def test_no_utility_score_without_a_real_baseline(regression_data):
+    scorer = UtilityScorer(regression_data, detected(regression_data), "y", n_jobs=1)
+    scorer.baseline = {**scorer.baseline, "R2": -0.1}
+    assert np.isnan(scorer.score(scorer.train_data)["Ratio"].iloc[-1])
+
+
+def test_training_rows_drop_categories_they_do_not_have(real_data, metadata):
+    # e.g. a category that only occurs in the held-out test rows
+    real = real_data.assign(state=real_data["state"].astype("category").cat.add_categories(["ZZ"]))
+    scorer = UtilityScorer(real, metadata, "default", n_jobs=1)
+    assert "ZZ" not in scorer.train_data["state"].cat.categories